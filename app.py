@@ -10,6 +10,7 @@ from ui.tray import SystemTray
 from core.system_monitor import SystemMonitor
 from core.power import AutoPowerPlanManager
 from core.settings import Settings
+from core.profiler import PROFILER
 from ui.theming import apply_theme
 from ui.i18n import install_translator
 
@@ -42,10 +43,21 @@ def main():
     install_translator(app, settings.ui.language)
     apply_theme(app, settings.ui.theme)
 
-    system_monitor = SystemMonitor()
+    PROFILER.enabled = settings.diagnostics.profiling
+    PROFILER.set_budgets(settings.diagnostics.budgets)
+
+    system_monitor = SystemMonitor(
+        nvidia_smi_mode=settings.monitor.nvidia_smi_mode,
+        net_interfaces=settings.monitor.net_interfaces,
+    )
     system_monitor.start()
 
-    power_manager = AutoPowerPlanManager(system_monitor)
+    power_manager = AutoPowerPlanManager(
+        system_monitor,
+        cpu_th=settings.power.cpu_util_threshold,
+        gpu_th=settings.power.gpu_util_threshold,
+        core_th=settings.power.core_util_threshold,
+    )
     if settings.power.auto_switch:
         power_manager.start()
 
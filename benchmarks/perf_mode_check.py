@@ -0,0 +1,138 @@
+"""
+PerformanceMode güvenlik denetimi: sahte süreç tablosu (benchmarks.process_sim) üzerinde maintain()
+döngüsünü boşta penceresinin birkaç katı süre çalıştırır ve korunan süreçlerin hiçbir zaman askıya
+alınmadığını doğrular:
+  - hedef oyun, üst süreçleri (başlatıcı zinciri) ve tüm alt süreçleri
+  - sistem pid'leri (0, 1, 4)
+  - ağ bağlantısı açık boşta süreçler
+Kontrol oturum kayıtlarına değil sahte süreçlerin gerçek durumuna bakar. Sıradan boşta süreçlerin
+askıya alındığı da doğrulanır (denetimin boşuna geçmediğini gösterir).
+--journal ile geçici bir PerfJournal kullanılır ve her süreç değişikliğinin (askıya alma, öncelik,
+affinity) kaydının değişiklikten önce diskte olduğu da denetlenir.
+
+    python -m benchmarks.perf_mode_check --seeds 20     # ihlalde çıkış kodu 1
+    python -m benchmarks.perf_mode_check --journal
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+
+import psutil
+
+from benchmarks.process_sim import SimProcessProvider
+from core.process_table import ProcessTable
+from core.process_manager import PerformanceMode
+from core.perf_journal import PerfJournal
+
+# korunan süreçleri hedefleyen kurallar: koruma kurallardan önce gelmelidir. Açık "always"
+# kuralı ağ denetimini atlar; bu yüzden arka plan süreç adları bu desenlere uymaz
+RULES = [
+    {"name": "yardımcıları dondur", "when": {"name": "*helper*.exe"}, "suspend": "always"},
+    {"name": "başlatıcı", "when": {"name": "launcher.exe"}, "suspend": "always"},
+    # öncelik/affinity eylemleri de günlük sırası denetiminden geçer
+    {"name": "güncelleyiciler", "when": {"name": "updater*"}, "priority": "below_normal", "affinity": [0, 1]},
+]
+
+class World:
+    def __init__(self, rng: random.Random, background: int):
+        self.rng = rng
+        sim = self.sim = SimProcessProvider(cpu_count=8)
+        # sistem süreçleri: boşta görünseler de dokunulmamalı
+        sim.add("System Idle Process", pid=0, ppid=0)
+        sim.add("init", pid=1, ppid=0)
+        sim.add("System", pid=4, ppid=0)
+        launcher = sim.add("launcher.exe", ppid=1)
+        boot = sim.add("gamebootstrap.exe", ppid=launcher.pid)
+        self.target = sim.add("game.exe", ppid=boot.pid, load=95.0, rss=4 << 30).pid
+        self.ancestors = {launcher.pid, boot.pid}
+        self.children = set()
+        parent = self.target
+        for name in ("crashhelper.exe", "shadercompiler.exe", "voicehelper.exe"):
+            # alt süreç zinciri; derin torunlar da korunmalı
+            parent = sim.add(name, ppid=parent).pid
+            self.children.add(parent)
+        self.children.add(sim.add("overlayhelper.exe", ppid=self.target).pid)
+        self.net = set()
+        self.plain = set()
+        for i in range(background):
+            net = rng.random() < 0.2
+            p = sim.add(f"{rng.choice(('svc', 'tray', 'updater', 'agent'))}{i}.exe", ppid=1, net=net)
+            (self.net if net else self.plain).add(p.pid)
+
+    @property
+    def protected(self) -> set[int]:
+        return {0, 1, 4, self.target} | self.ancestors | self.children
+
+    def spawn_child(self):
+        """Oturum sırasında hedefin yeni bir alt süreci açılır."""
+        parent = self.rng.choice(sorted({self.target} | self.children))
+        self.children.add(self.sim.add("workerhelper.exe", ppid=parent).pid)
+
+def journal_order(journal: PerfJournal, problems: list[str], seed: int):
+    """Değişiklikten önce aynı (pid, create_time, işlem) kaydı diskte olmalı."""
+    def on_change(proc, op):
+        if (op, proc.pid, proc.started) not in {(o, pid, ct) for (pid, ct), ops in journal.pending().items() for o in ops}:
+            problems.append(f"seed {seed}: {op} günlüğe yazılmadan uygulandı: {proc.name()} (PID {proc.pid})")
+    return on_change
+
+def run(seed: int, background: int, idle_window: float, step: float, steps: int,
+        journal_dir: str | None = None) -> list[str]:
+    rng = random.Random(seed)
+    w = World(rng, background)
+    table = ProcessTable(provider=w.sim, clock=w.sim.clock)
+    problems = []
+    journal = None
+    if journal_dir is not None:
+        journal = PerfJournal(os.path.join(journal_dir, f"journal-{seed}.jsonl"))
+        w.sim.on_change = journal_order(journal, problems, seed)
+    pm = PerformanceMode([], 1.0, process_table=table, idle_window=idle_window, rules=RULES, journal=journal)
+    pm.start_for_process(w.target)
+    for i in range(steps):
+        w.sim.clock.advance(step)
+        if i == steps // 3:
+            w.spawn_child()
+        if journal is not None:
+            # gerçek maintain() aralığında yazıcı fsync'i çoktan bitirmiş olur
+            journal.flush()
+        pm.maintain()
+        stopped = {pid for pid, p in w.sim.procs.items() if p.status() == psutil.STATUS_STOPPED}
+        for pid in sorted(stopped & w.protected):
+            problems.append(f"seed {seed} adım {i}: korunan süreç askıya alındı: {w.sim.procs[pid].name()} (PID {pid})")
+        for pid in sorted(stopped & w.net):
+            problems.append(f"seed {seed} adım {i}: ağ bağlantılı süreç askıya alındı: {w.sim.procs[pid].name()} (PID {pid})")
+        if problems:
+            break
+    suspended = len(pm.session.suspended_pids & w.plain)
+    pm.stop()
+    if not problems and w.plain and not suspended:
+        problems.append(f"seed {seed}: hiçbir boşta süreç askıya alınmadı; denetim anlamsız")
+    leftover = [pid for pid, p in w.sim.procs.items() if p.status() == psutil.STATUS_STOPPED]
+    if leftover:
+        problems.append(f"seed {seed}: stop() sonrası askıda kalan {len(leftover)} süreç")
+    return problems
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="PerformanceMode korunan süreç denetimi")
+    ap.add_argument("--seeds", type=int, default=10)
+    ap.add_argument("--background", type=int, default=200, help="arka plan süreç sayısı")
+    ap.add_argument("--idle-window", type=float, default=10.0)
+    ap.add_argument("--step", type=float, default=2.0, help="maintain() çağrıları arası sahte saat (sn)")
+    ap.add_argument("--steps", type=int, default=30)
+    ap.add_argument("--journal", action="store_true", help="günlükle çalıştır, değişiklik sırasını denetle")
+    args = ap.parse_args(argv)
+
+    problems = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for seed in range(1, args.seeds + 1):
+            problems += run(seed, args.background, args.idle_window, args.step, args.steps,
+                            tmp if args.journal else None)
+    for p in problems:
+        print("İHLAL:", p)
+    if not problems:
+        print(f"tamam: {args.seeds} senaryo, korunan ve ağ bağlantılı süreçlerin hiçbiri askıya alınmadı")
+    return 1 if problems else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
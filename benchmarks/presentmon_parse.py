@@ -0,0 +1,158 @@
+"""
+PresentMon CSV okuyucusunun (core.presentmon_csv) verim benchmark'ı.
+
+1) toplu: sentetik çok yüz MB'lık bir CSV baştan sona okunur (MB/sn, satır/sn, CPU süresi)
+2) canlı: bir yazıcı iş parçacığı dosyaya N FPS hızında satır ekler (satırları rastgele yerlerden
+   bölerek), okuyucu her 0.5 sn'de bir okur; okuyucunun tek çekirdekten aldığı pay raporlanır
+3) --legacy: eski yöntem (her turda yeniden aç + csv.reader + sondan sayısal sütun) karşılaştırması
+
+    python -m benchmarks.presentmon_parse --mb 300 --fps 1000,5000
+"""
+import argparse
+import csv
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+from core.presentmon_csv import PresentMonCsvReader
+from core.presentmon_fake import HEADER, RowGen
+
+def make_csv(path: str, mb: int, seed: int):
+    gen = RowGen(seed)
+    target = mb << 20
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        f.write(HEADER)
+        size = len(HEADER)
+        while size < target:
+            block = gen.lines(20000)
+            f.write(block)
+            size += len(block)
+
+def bench_bulk(path: str) -> dict:
+    reader = PresentMonCsvReader(path)
+    size = os.path.getsize(path)
+    c0, w0 = time.thread_time(), time.perf_counter()
+    rows = 0
+    while reader.bytes_read < size:
+        rows += len(reader.read())
+    cpu, wall = time.thread_time() - c0, time.perf_counter() - w0
+    reader.close()
+    return {"mb": size / 2**20, "rows": rows, "bad_rows": reader.bad_rows, "wall_s": wall, "cpu_s": cpu,
+            "mb_per_s": size / 2**20 / wall, "rows_per_s": rows / wall, "us_per_row": cpu / max(1, rows) * 1e6}
+
+def legacy_parse(path: str, last_size: int) -> tuple[int, int]:
+    """Eski _tail_once: dosyayı yeniden açar, csv.reader ile satırları sondan sayısal sütunla tarar."""
+    rows = 0
+    size = os.path.getsize(path)
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        f.seek(last_size)
+        for row in csv.reader(f):
+            if not row or "msBetweenPresents" in row[0]:
+                continue
+            for col in row[::-1]:
+                if col.replace(".", "", 1).isdigit():
+                    float(col)
+                    break
+            rows += 1
+    return size, rows
+
+def bench_legacy(path: str, limit_mb: int) -> dict:
+    tmp = path + ".legacy"
+    with open(path, "rb") as src, open(tmp, "wb") as dst:
+        dst.write(src.read(limit_mb << 20))
+    c0, w0 = time.thread_time(), time.perf_counter()
+    _, rows = legacy_parse(tmp, 0)
+    cpu, wall = time.thread_time() - c0, time.perf_counter() - w0
+    os.remove(tmp)
+    return {"mb": limit_mb, "rows": rows, "wall_s": wall, "cpu_s": cpu, "mb_per_s": limit_mb / wall,
+            "us_per_row": cpu / max(1, rows) * 1e6}
+
+def bench_live(path: str, fps: int, seconds: float, seed: int) -> dict:
+    """Yazıcı fps hızında ekler (10 ms'lik partiler, satır ortasından bölünmüş); okuyucu 0.5 sn'de bir okur."""
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        f.write(HEADER)
+    gen = RowGen(seed)
+    rng = random.Random(seed)
+    stop = threading.Event()
+    written = [0]
+
+    def writer():
+        carry = ""
+        with open(path, "a", encoding="utf-8", newline="") as f:
+            next_t = time.perf_counter()
+            while not stop.is_set():
+                n = max(1, int(fps * 0.01))
+                data = carry + gen.lines(n)
+                cut = rng.randint(len(data) // 2, len(data))
+                f.write(data[:cut])
+                f.flush()
+                carry = data[cut:]
+                written[0] += n
+                next_t += 0.01
+                time.sleep(max(0.0, next_t - time.perf_counter()))
+
+    th = threading.Thread(target=writer, daemon=True)
+    th.start()
+    reader = PresentMonCsvReader(path)
+    rows = 0
+    cpu = 0.0
+    lag_max = 0
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        time.sleep(0.5)
+        c0 = time.thread_time()
+        rows += len(reader.read())
+        cpu += time.thread_time() - c0
+        lag_max = max(lag_max, written[0] - rows)
+    stop.set()
+    th.join()
+    reader.close()
+    return {"fps": fps, "rows": rows, "written": written[0], "max_lag_rows": lag_max, "bad_rows": reader.bad_rows,
+            "reader_cpu_percent": cpu / seconds * 100.0}
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="PresentMon CSV okuyucu verim benchmark'ı")
+    ap.add_argument("--mb", type=int, default=300, help="toplu test dosya boyutu (MB)")
+    ap.add_argument("--fps", default="1000,5000", help="canlı test hızları (virgülle)")
+    ap.add_argument("--seconds", type=float, default=5.0, help="canlı test süresi")
+    ap.add_argument("--legacy", type=int, default=0, help="eski yöntemi ilk N MB üzerinde de ölç")
+    ap.add_argument("--dir", default=None, help="geçici dosya klasörü")
+    ap.add_argument("--seed", type=int, default=1)
+    args = ap.parse_args(argv)
+
+    tmpdir = tempfile.mkdtemp(prefix="pmbench_", dir=args.dir)
+    bulk_path = os.path.join(tmpdir, "bulk.csv")
+    live_path = os.path.join(tmpdir, "live.csv")
+    try:
+        if args.mb > 0:
+            t0 = time.perf_counter()
+            make_csv(bulk_path, args.mb, args.seed)
+            print(f"sentetik CSV: {os.path.getsize(bulk_path) / 2**20:.0f} MB ({time.perf_counter() - t0:.1f} sn)")
+            r = bench_bulk(bulk_path)
+            print(f"toplu:  {r['rows']:,} satır, {r['mb_per_s']:.0f} MB/sn, {r['rows_per_s'] / 1e6:.2f} M satır/sn, "
+                  f"{r['us_per_row']:.2f} us/satır CPU, hatalı {r['bad_rows']}")
+            if args.legacy:
+                lr = bench_legacy(bulk_path, min(args.legacy, args.mb))
+                print(f"eski:   {lr['rows']:,} satır, {lr['mb_per_s']:.0f} MB/sn, {lr['us_per_row']:.2f} us/satır CPU")
+            os.remove(bulk_path)
+        for fps in [int(x) for x in args.fps.split(",") if x.strip()]:
+            r = bench_live(live_path, fps, args.seconds, args.seed)
+            print(f"canlı {fps:>5} FPS: okunan {r['rows']:,}/{r['written']:,}, en fazla gecikme {r['max_lag_rows']} satır, "
+                  f"okuyucu CPU %{r['reader_cpu_percent']:.3f} (tek çekirdek), hatalı {r['bad_rows']}")
+    finally:
+        for p in (bulk_path, live_path):
+            try:
+                os.remove(p)
+            except OSError:
+                pass
+        try:
+            os.rmdir(tmpdir)
+        except OSError:
+            pass
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,260 @@
+"""
+Süreç tarama sıcak yolu için sentetik ölçek benchmark'ı.
+
+benchmarks.process_sim ile sahte bir psutil sağlayıcısı kurar (süreç sayısı, CPU/durum dağılımları,
+AccessDenied/NoSuchProcess oranları ayarlanabilir) ve şu yolları ölçer:
+  - proc_list:  _refresh_proc_list'in çekirdeği (refresh(detail=False) + process_choices)
+  - refresh:    ProcessTable.refresh(detail=True)
+  - maintain:   PerformanceMode.maintain (kurallar, boşta penceresi, askıya alma dahil)
+Çağrı başına gecikme yüzdelikleri, süreç sorgusu (sistem çağrısı) sayısı ve tracemalloc ile ayrı bir
+geçişte bellek ayırma raporlanır. Her sahte çağrı --call-us kadar meşgul bekler; süreç başına çağrı
+sayısı SYSCALL_BUDGET'ı aşarsa çıkış kodu 1'dir.
+
+    python -m benchmarks.process_scan --counts 300,1000,5000 --json bench.json
+    python -m benchmarks.process_scan --baseline bench.json --tolerance 0.25   # gerilemede çıkış kodu 1
+"""
+import argparse
+import gc
+import json
+import random
+import sys
+import time
+import tracemalloc
+
+import psutil
+
+from core.profiler import PROFILER
+from benchmarks.process_sim import SimProcessProvider
+from core.process_table import ProcessTable, process_choices
+from core.process_manager import PerformanceMode
+
+# CPU yükü dağılımı: ad -> (olasılık, min %, max %)
+DEFAULT_CPU_DIST = "idle=0.70:0:0.5,low=0.22:0.5:5,busy=0.08:5:60"
+SAMPLE_RULES = [
+    {"name": "tarayıcı", "when": {"name": "browser*.exe"}, "priority": "below_normal", "suspend": "never"},
+    {"name": "güncelleyici", "when": {"name": "re:updater\\d+\\.exe"}, "io_priority": "very_low"},
+    {"name": "sistem süreçleri", "when": {"name": "*system*"}, "suspend": "never"},
+]
+# çağrı başına sistem çağrısı / süreç sayısı üst sınırı (churn/vanish adım başına ~%1.5 yeni süreç getirir).
+# proc_list yalnızca pid farkını ve yeni süreçleri sorgular; refresh/maintain süreç başına 4 ayrıntı okur
+# (cpu_times, memory_info, status, io_counters). Mevcut her süreç için bir çağrı daha (ör. is_running)
+# eklenirse sınır aşılır.
+SYSCALL_BUDGET = {"proc_list": 0.15, "refresh": 4.25, "maintain": 4.25}
+NAMES = ("svc", "browser", "updater", "helper", "agent", "system_host", "tray", "worker")
+
+class RacyProvider(SimProcessProvider):
+    """
+    pids() listesinden sonra bazı süreçleri öldürür: Process()/cpu_times() NoSuchProcess fırlatır.
+    Ölenlerin yerine `respawn` ile yenileri açılır (listede bir sonraki çağrıda görünürler), böylece
+    süreç sayısı ölçüm boyunca sabit kalır. `keep` içindeki pid'lere (hedef) dokunulmaz.
+    """
+    def __init__(self, vanish: float, rng: random.Random, respawn=None, **kw):
+        super().__init__(**kw)
+        self.vanish = vanish
+        self.rng = rng
+        self.respawn = respawn
+        self.keep: set[int] = set()
+
+    def pids(self):
+        pids = super().pids()
+        if self.vanish:
+            victims = [pid for pid in self.rng.sample(pids, int(len(pids) * self.vanish)) if pid not in self.keep]
+            for pid in victims:
+                self.kill(pid)
+            if self.respawn is not None:
+                for _ in victims:
+                    self.respawn()
+        return pids
+
+def parse_cpu_dist(text: str) -> list[tuple[float, float, float]]:
+    out = []
+    for part in text.split(","):
+        _, spec = part.split("=", 1)
+        p, lo, hi = (float(x) for x in spec.split(":"))
+        out.append((p, lo, hi))
+    total = sum(p for p, _, _ in out) or 1.0
+    return [(p / total, lo, hi) for p, lo, hi in out]
+
+class Scenario:
+    def __init__(self, count: int, args, seed: int):
+        self.rng = random.Random(seed)
+        self.args = args
+        self.dist = parse_cpu_dist(args.cpu_dist)
+        self.sim = RacyProvider(0.0, self.rng, cpu_count=16, call_cost_us=args.call_us)
+        self.next_name = 0
+        for _ in range(count):
+            self.spawn()
+        self.target = self.sim.add("game.exe", load=95.0, rss=4 << 30).pid
+        self.sim.keep.add(self.target)
+        self.sim.respawn = self.spawn
+
+    def spawn(self):
+        r, acc = self.rng.random(), 0.0
+        lo, hi = 0.0, 0.0
+        for p, lo, hi in self.dist:
+            acc += p
+            if r <= acc:
+                break
+        deny = ()
+        if self.rng.random() < self.args.denied:
+            deny = self.rng.choice((("cpu_times",), ("exe", "username"), ("io_counters",), ("suspend", "nice")))
+        status = psutil.STATUS_SLEEPING if self.rng.random() < self.args.sleeping else psutil.STATUS_RUNNING
+        base = self.rng.choice(NAMES)
+        self.next_name += 1
+        self.sim.add(
+            f"{base}{self.next_name}.exe", load=self.rng.uniform(lo, hi), status=status,
+            io_rate=self.rng.choice((0.0, 0.0, 0.0, 4096.0)), rss=self.rng.randint(4, 800) << 20,
+            exe=f"C:\\Program Files\\{base}\\{base}{self.next_name}.exe",
+            net=self.rng.random() < 0.05, deny=deny,
+        )
+
+    def churn(self):
+        """Her adımda süreçlerin bir kısmı çıkar, yerine yenileri gelir."""
+        n = int(len(self.sim.procs) * self.args.churn)
+        # sim.pids() değil: yarışçı liste zaten ölmüş pid'ler içerebilir
+        victims = [pid for pid in self.rng.sample(list(self.sim.procs), n) if pid != self.target]
+        for pid in victims:
+            self.sim.kill(pid)
+            self.spawn()
+
+def percentiles(samples: list[float]) -> dict:
+    s = sorted(samples)
+    def q(p):
+        return s[min(len(s) - 1, int(p / 100.0 * len(s)))] * 1000.0
+    return {"p50_ms": q(50), "p90_ms": q(90), "p99_ms": q(99), "max_ms": s[-1] * 1000.0,
+            "mean_ms": sum(s) / len(s) * 1000.0}
+
+def bench_path(name: str, count: int, args, seed: int) -> dict:
+    sc = Scenario(count, args, seed)
+    table = ProcessTable(provider=sc.sim, clock=sc.sim.clock)
+    pm = PerformanceMode(["explorer.exe"], 1.0, process_table=table, idle_window=args.idle_window,
+                         rules=SAMPLE_RULES)
+    if name == "maintain":
+        pm.start_for_process(sc.target)
+        call = pm.maintain
+    elif name == "refresh":
+        call = table.refresh
+    else:
+        def call():
+            table.refresh(detail=False)
+            process_choices(table)
+
+    def step():
+        sc.sim.clock.advance(args.step)
+        sc.churn()
+        sc.sim.vanish = args.vanish
+
+    # ısınma: ilk yenileme tüm Process nesnelerini oluşturur, ayrıca raporlanır
+    t0 = time.perf_counter()
+    call()
+    first_ms = (time.perf_counter() - t0) * 1000.0
+    for _ in range(args.warmup):
+        step()
+        call()
+
+    times, calls = [], 0
+    gc.collect()
+    for _ in range(args.iterations):
+        step()
+        before = sc.sim.syscalls
+        t0 = time.perf_counter()
+        call()
+        times.append(time.perf_counter() - t0)
+        calls += sc.sim.syscalls - before
+
+    # bellek ayırma: tracemalloc gecikmeyi bozduğu için ayrı geçiş
+    allocs, peaks = [], []
+    tracemalloc.start()
+    for _ in range(args.alloc_iterations):
+        step()
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+        call()
+        cur, peak = tracemalloc.get_traced_memory()
+        allocs.append(cur - before)
+        peaks.append(peak - before)
+    tracemalloc.stop()
+    if pm.session.target_pid:
+        pm.stop()
+
+    out = percentiles(times)
+    out.update({
+        "first_call_ms": first_ms,
+        "net_alloc_kib": sum(allocs) / len(allocs) / 1024.0 if allocs else 0.0,
+        "peak_alloc_kib": max(peaks) / 1024.0 if peaks else 0.0,
+        "processes": len(sc.sim.procs),
+        "syscalls": calls / len(times),
+        "syscalls_per_proc": calls / len(times) / len(sc.sim.procs),
+    })
+    return out
+
+def over_budget(results: dict, budgets: dict) -> list[str]:
+    """Çağrı başına süreç sorgusu (süreç sayısına oranla) SYSCALL_BUDGET'ı aşan yollar."""
+    problems = []
+    for key, r in results.items():
+        limit = budgets.get(key.split("@", 1)[0])
+        if limit is not None and r["syscalls_per_proc"] > limit:
+            problems.append(f"{key} süreç başına çağrı: {r['syscalls_per_proc']:.3f} > {limit:.3f}")
+    return problems
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    """p90 ya da tepe ayırma tabandan `tolerance` oranından fazla kötüleşmişse açıklamalar döndürür."""
+    problems = []
+    for key, cur in results.items():
+        base = baseline.get(key)
+        if not base:
+            continue
+        for metric in ("p90_ms", "peak_alloc_kib"):
+            if base.get(metric) and cur[metric] > base[metric] * (1.0 + tolerance):
+                problems.append(f"{key} {metric}: {cur[metric]:.3f} > {base[metric]:.3f} (+%{tolerance * 100:.0f})")
+    return problems
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="PerformanceMode.maintain / süreç tarama benchmark'ı")
+    ap.add_argument("--counts", default="300,1000,5000", help="süreç sayıları (virgülle)")
+    ap.add_argument("--paths", default="proc_list,refresh,maintain")
+    ap.add_argument("--iterations", type=int, default=60)
+    ap.add_argument("--warmup", type=int, default=5)
+    ap.add_argument("--alloc-iterations", type=int, default=10)
+    ap.add_argument("--cpu-dist", default=DEFAULT_CPU_DIST, help="ad=olasılık:min%%:max%%,...")
+    ap.add_argument("--sleeping", type=float, default=0.6, help="uyuyan (askıya alınamaz) süreç oranı")
+    ap.add_argument("--denied", type=float, default=0.1, help="bazı çağrılarda AccessDenied fırlatan süreç oranı")
+    ap.add_argument("--vanish", type=float, default=0.005, help="tarama sırasında kaybolan süreç oranı (NoSuchProcess)")
+    ap.add_argument("--churn", type=float, default=0.01, help="her adımda değişen süreç oranı")
+    ap.add_argument("--step", type=float, default=2.0, help="adımlar arası sahte saat ilerlemesi (sn)")
+    ap.add_argument("--idle-window", type=float, default=10.0)
+    ap.add_argument("--call-us", type=float, default=5.0, help="sahte süreç sorgusu başına maliyet (µs)")
+    ap.add_argument("--seed", type=int, default=1)
+    ap.add_argument("--profiler", action="store_true", help="PROFILER ölçümünü açık bırak")
+    ap.add_argument("--json", help="sonuçları bu dosyaya yaz")
+    ap.add_argument("--baseline", help="karşılaştırılacak önceki --json çıktısı")
+    ap.add_argument("--tolerance", type=float, default=0.25)
+    args = ap.parse_args(argv)
+
+    PROFILER.enabled = args.profiler
+    counts = [int(c) for c in args.counts.split(",") if c.strip()]
+    paths = [p.strip() for p in args.paths.split(",") if p.strip()]
+    results = {}
+    print(f"{'yol':<10} {'süreç':>6} {'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9} {'max ms':>9} "
+          f"{'ilk ms':>9} {'çağrı':>8} {'net KiB':>9} {'tepe KiB':>9}")
+    for count in counts:
+        for path in paths:
+            r = bench_path(path, count, args, args.seed)
+            results[f"{path}@{count}"] = r
+            print(f"{path:<10} {count:>6} {r['p50_ms']:>9.3f} {r['p90_ms']:>9.3f} {r['p99_ms']:>9.3f} "
+                  f"{r['max_ms']:>9.3f} {r['first_call_ms']:>9.2f} {r['syscalls']:>8.0f} {r['net_alloc_kib']:>9.1f} "
+                  f"{r['peak_alloc_kib']:>9.1f}")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"ts": int(time.time()), "python": sys.version.split()[0], "results": results}, f, indent=2)
+    problems = over_budget(results, SYSCALL_BUDGET)
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            base = json.load(f).get("results", {})
+        problems += compare(results, base, args.tolerance)
+    for p in problems:
+        print("GERİLEME:", p)
+    return 1 if problems else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
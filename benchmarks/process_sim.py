@@ -0,0 +1,214 @@
+import contextlib
+import itertools
+import socket
+import time
+from collections import namedtuple
+
+import psutil
+
+_CpuTimes = namedtuple("_CpuTimes", "user system")
+_MemInfo = namedtuple("_MemInfo", "rss vms")
+_IOCounters = namedtuple("_IOCounters", "read_count write_count read_bytes write_bytes")
+_Conn = namedtuple("_Conn", "fd family type laddr raddr status pid")
+
+class SimClock:
+    """Elle ilerletilen saat; ProcessTable(clock=...) ile kullanılır."""
+    def __init__(self, start: float = 1000.0):
+        self.now = start
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float):
+        self.now += seconds
+
+class SimProcess:
+    """
+    psutil.Process'in PulseBoost'un kullandığı alt kümesini taklit eder. CPU süresi ve G/Ç
+    sayaçları saatle birlikte `load` (% tek çekirdek) ve `io_rate` (B/sn) oranında artar.
+    `deny` içindeki metotlar AccessDenied fırlatır; öldürülmüş süreç NoSuchProcess fırlatır.
+    Her metot (is_running dahil) sağlayıcıda bir sistem çağrısı sayılır.
+    """
+    def __init__(self, sim, pid: int, name: str, ppid: int = 1, load: float = 0.0,
+                 status: str = psutil.STATUS_RUNNING, io_rate: float = 0.0, rss: int = 50 << 20,
+                 exe: str = "", username: str = "user", net: bool = False, deny=()):
+        self._sim = sim
+        self.pid = pid
+        self._name = name
+        self._ppid = ppid
+        self.load = load
+        self._status = status
+        self.io_rate = io_rate
+        self._rss = rss
+        self._exe = exe
+        self._username = username
+        self.net = net
+        self.deny = set(deny)
+        self.alive = True
+        self.started = sim.clock()
+        self._cpu = 0.0
+        self._io = 0.0
+        self._last = self.started
+        self.priority = psutil.NORMAL_PRIORITY_CLASS if hasattr(psutil, "NORMAL_PRIORITY_CLASS") else 0
+        self.affinity = list(range(sim.cpu_count))
+        self.calls = 0
+
+    def _check(self, method: str):
+        self.calls += 1
+        self._sim.syscall()
+        if not self.alive:
+            raise psutil.NoSuchProcess(self.pid)
+        if method in self.deny:
+            raise psutil.AccessDenied(self.pid)
+
+    def _advance(self):
+        now = self._sim.clock()
+        dt = now - self._last
+        self._last = now
+        if self._status == psutil.STATUS_RUNNING:
+            self._cpu += dt * self.load / 100.0
+            self._io += dt * self.io_rate
+
+    def oneshot(self):
+        return contextlib.nullcontext()
+
+    def create_time(self) -> float:
+        self._check("create_time")
+        return self.started
+
+    def name(self) -> str:
+        self._check("name")
+        return self._name
+
+    def ppid(self) -> int:
+        self._check("ppid")
+        return self._ppid
+
+    def exe(self) -> str:
+        self._check("exe")
+        return self._exe
+
+    def username(self) -> str:
+        self._check("username")
+        return self._username
+
+    def status(self) -> str:
+        self._check("status")
+        return self._status
+
+    def cpu_times(self):
+        self._check("cpu_times")
+        self._advance()
+        return _CpuTimes(self._cpu * 0.8, self._cpu * 0.2)
+
+    def memory_info(self):
+        self._check("memory_info")
+        return _MemInfo(self._rss, self._rss * 2)
+
+    def io_counters(self):
+        self._check("io_counters")
+        self._advance()
+        half = int(self._io / 2)
+        return _IOCounters(0, 0, half, half)
+
+    def suspend(self):
+        self._check("suspend")
+        self._sim.changed(self, "suspend")
+        self._advance()
+        self._status = psutil.STATUS_STOPPED
+
+    def resume(self):
+        self._check("resume")
+        self._advance()
+        self._status = psutil.STATUS_RUNNING
+
+    def nice(self, value=None):
+        self._check("nice")
+        if value is None:
+            return self.priority
+        self._sim.changed(self, "priority")
+        self.priority = value
+
+    def cpu_affinity(self, cpus=None):
+        self._check("cpu_affinity")
+        if cpus is None:
+            return list(self.affinity)
+        self._sim.changed(self, "affinity")
+        self.affinity = list(cpus)
+
+    def is_running(self) -> bool:
+        # psutil kimliği create_time ile yeniden okuyarak denetler: gerçek bir süreç sorgusu
+        self.calls += 1
+        self._sim.syscall()
+        return self.alive
+
+class SimProcessProvider:
+    """
+    psutil modülünün yerine ProcessTable/PerformanceMode'a verilen sahte süreç tablosu.
+    Ör.:
+        sim = SimProcessProvider()
+        sim.add("game.exe", load=90)
+        table = ProcessTable(provider=sim, clock=sim.clock)
+    Süreç başına sorgular (Process(), create_time, cpu_times, is_running, ...) ile pids() birer
+    sistem çağrısı sayılır (`syscalls`); call_cost_us > 0 ise her biri o kadar meşgul bekler, böylece
+    süreç başına çağrı eklenen bir değişiklik gecikmede de görünür.
+    """
+    NoSuchProcess = psutil.NoSuchProcess
+    AccessDenied = psutil.AccessDenied
+    STATUS_RUNNING = psutil.STATUS_RUNNING
+
+    def __init__(self, clock: SimClock | None = None, cpu_count: int = 8, call_cost_us: float = 0.0):
+        self.clock = clock or SimClock()
+        self.cpu_count = cpu_count
+        self.call_cost_s = call_cost_us / 1e6
+        self.syscalls = 0
+        self.procs: dict[int, SimProcess] = {}
+        self._pids = itertools.count(1000, 4)
+        # süreci değiştiren her çağrıdan önce on_change(süreç, işlem) çağrılır (ör. günlük sırası denetimi)
+        self.on_change = None
+
+    def syscall(self):
+        self.syscalls += 1
+        if self.call_cost_s:
+            end = time.perf_counter() + self.call_cost_s
+            while time.perf_counter() < end:
+                pass
+
+    def changed(self, proc: SimProcess, op: str):
+        if self.on_change is not None:
+            self.on_change(proc, op)
+
+    def add(self, name: str, pid: int | None = None, **kw) -> SimProcess:
+        pid = pid if pid is not None else next(self._pids)
+        p = SimProcess(self, pid, name, **kw)
+        self.procs[pid] = p
+        return p
+
+    def kill(self, pid: int):
+        p = self.procs.pop(pid, None)
+        if p:
+            p.alive = False
+
+    def pids(self) -> list[int]:
+        self.syscall()
+        return list(self.procs)
+
+    def pid_exists(self, pid: int) -> bool:
+        self.syscall()
+        return pid in self.procs
+
+    def Process(self, pid: int) -> SimProcess:
+        # psutil.Process() kimlik için create_time'ı hemen okur
+        self.syscall()
+        p = self.procs.get(pid)
+        if p is None:
+            raise psutil.NoSuchProcess(pid)
+        return p
+
+    def net_connections(self, kind: str = "inet"):
+        self.syscall()
+        return [
+            _Conn(-1, socket.AF_INET, socket.SOCK_STREAM, ("127.0.0.1", 50000 + i), ("1.1.1.1", 443),
+                  psutil.CONN_ESTABLISHED, p.pid)
+            for i, p in enumerate(self.procs.values()) if p.net and p.alive
+        ]
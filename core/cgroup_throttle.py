@@ -0,0 +1,117 @@
+import os
+
+import psutil
+
+CGROUP_ROOT = "/sys/fs/cgroup"
+CPU_PERIOD_US = 100000
+
+class CgroupThrottler:
+    """
+    Linux cgroup v2 ile yumuşak kısma: süreçler `root/name/t<yüzde>` alt grubuna taşınır; grubun
+    cpu.max'i toplam CPU kapasitesinin yüzdesiyle sınırlanır, cpu.weight (ve istenirse io.weight)
+    düşürülür. release() süreci özgün grubuna geri taşır. Askıya almadan farklı olarak süreç çalışmaya
+    devam eder (başlatıcılar, sesli sohbet, overlay'ler bozulmaz).
+    `root` ve `proc_root` testlerde cgroupfs/procfs'i taklit eden geçici dizinler olabilir.
+    """
+    def __init__(self, root: str = CGROUP_ROOT, name: str = "pulseboost-background",
+                 cpu_weight: int = 10, io_weight: int | None = None, proc_root: str = "/proc",
+                 cpu_count: int | None = None):
+        self.root = root
+        self.base = os.path.join(root, name)
+        self.cpu_weight = cpu_weight
+        self.io_weight = io_weight
+        self.proc_root = proc_root
+        self.cpu_count = cpu_count or psutil.cpu_count() or 1
+        # pid -> özgün cgroup yolu (kökten göreli, ör. "/user.slice/app.scope")
+        self.moved: dict[int, str] = {}
+        self._groups: set[int] = set()
+        self._ready = False
+
+    def available(self) -> bool:
+        try:
+            with open(os.path.join(self.root, "cgroup.controllers"), "r", encoding="ascii") as f:
+                controllers = f.read().split()
+        except OSError:
+            return False
+        return "cpu" in controllers and os.access(self.root, os.W_OK)
+
+    @staticmethod
+    def _write(path: str, value: str):
+        with open(path, "w", encoding="ascii") as f:
+            f.write(value)
+
+    def _setup(self):
+        if self._ready:
+            return
+        os.makedirs(self.base, exist_ok=True)
+        want = "+cpu +io" if self.io_weight else "+cpu"
+        # denetleyiciler kökten alt gruplara açılmalı; zaten açıksa yazma hatası önemsiz
+        for parent in (self.root, self.base):
+            try:
+                self._write(os.path.join(parent, "cgroup.subtree_control"), want)
+            except OSError as e:
+                if parent == self.base:
+                    raise
+                print("cgroup denetleyicileri etkinleştirilemedi:", e)
+        self._ready = True
+
+    def _group(self, percent: float) -> str:
+        pct = max(1, min(100, int(round(percent))))
+        path = os.path.join(self.base, f"t{pct}")
+        if pct not in self._groups:
+            self._setup()
+            os.makedirs(path, exist_ok=True)
+            quota = max(1000, int(CPU_PERIOD_US * self.cpu_count * pct / 100))
+            self._write(os.path.join(path, "cpu.max"), f"{quota} {CPU_PERIOD_US}")
+            self._write(os.path.join(path, "cpu.weight"), str(self.cpu_weight))
+            if self.io_weight:
+                try:
+                    self._write(os.path.join(path, "io.weight"), f"default {self.io_weight}")
+                except OSError as e:
+                    print("io.weight ayarlanamadı:", e)
+            self._groups.add(pct)
+        return path
+
+    def current_cgroup(self, pid: int) -> str:
+        """Sürecin v2 cgroup yolu ("0::/yol" satırı)."""
+        with open(os.path.join(self.proc_root, str(pid), "cgroup"), "r", encoding="utf-8") as f:
+            for line in f:
+                if line.startswith("0::"):
+                    return line[3:].strip() or "/"
+        return "/"
+
+    def throttle(self, proc, percent: float) -> str:
+        """Süreci kısılmış gruba taşır; özgün cgroup yolunu döndürür."""
+        pid = proc.pid
+        orig = self.moved.get(pid) or self.current_cgroup(pid)
+        self._write(os.path.join(self._group(percent), "cgroup.procs"), str(pid))
+        self.moved[pid] = orig
+        return orig
+
+    def move_back(self, pid: int, path: str):
+        target = os.path.join(self.root, path.lstrip("/"))
+        self._write(os.path.join(target, "cgroup.procs"), str(pid))
+
+    def release(self, pid: int):
+        orig = self.moved.pop(pid, None)
+        if orig is None:
+            return
+        try:
+            self.move_back(pid, orig)
+        except OSError:
+            # süreç çıktı ya da özgün grup artık yok
+            pass
+
+    def release_all(self):
+        for pid in list(self.moved):
+            self.release(pid)
+        self.cleanup()
+
+    def cleanup(self):
+        """Boş kalan alt grupları kaldırır."""
+        for pct in list(self._groups):
+            try:
+                os.rmdir(os.path.join(self.base, f"t{pct}"))
+                self._groups.discard(pct)
+            except OSError:
+                pass
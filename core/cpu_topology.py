@@ -0,0 +1,275 @@
+import os
+import re
+import struct
+
+import psutil
+
+SYSFS_CPU = "/sys/devices/system/cpu"
+# max frekansı en hızlı çekirdeğin bu oranına ulaşan çekirdekler "performans" çekirdeği sayılır
+FAST_CORE_RATIO = 0.9
+# arka plana en az bu kadar fiziksel çekirdek bırakılır; toplam bundan azsa plan yapılmaz
+MIN_BACKGROUND_CORES = 1
+MIN_PHYSICAL_CORES = 4
+
+# GetLogicalProcessorInformationEx (SYSTEM_LOGICAL_PROCESSOR_INFORMATION_EX) ilişki türleri
+RELATION_PROCESSOR_CORE = 0
+RELATION_CACHE = 2
+RELATION_PROCESSOR_PACKAGE = 3
+RELATION_ALL = 0xFFFF
+# GROUP_AFFINITY: KAFFINITY (x64'te 8 bayt) + WORD Group + WORD Reserved[3]
+GROUP_AFFINITY_SIZE = 16
+CPUS_PER_GROUP = 64
+
+def parse_cpu_list(text: str) -> list[int]:
+    """"0-3,8,10-11" -> [0, 1, 2, 3, 8, 10, 11]"""
+    out = []
+    for part in (text or "").strip().split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if "-" in part:
+            a, b = part.split("-", 1)
+            out.extend(range(int(a), int(b) + 1))
+        else:
+            out.append(int(part))
+    return out
+
+def _read(path: str) -> str | None:
+    try:
+        with open(path, "r", encoding="ascii") as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+class LogicalCpu:
+    __slots__ = ("cpu", "package", "core", "siblings", "llc", "max_freq", "efficiency", "fast")
+
+    def __init__(self, cpu: int, package: int = 0, core: int | None = None, siblings: tuple = (),
+                 llc: int = 0, max_freq: int = 0, efficiency: int | None = None):
+        self.cpu = cpu
+        self.package = package
+        self.core = cpu if core is None else core
+        self.siblings = siblings or (cpu,)
+        self.llc = llc
+        self.max_freq = max_freq
+        # Windows EfficiencyClass: büyük = performans çekirdeği (hibritte P > E)
+        self.efficiency = efficiency
+        self.fast = True
+
+    @property
+    def core_key(self) -> tuple:
+        return (self.package, self.core)
+
+class CpuTopology:
+    """
+    Mantıksal işlemciler; çekirdek (SMT kardeşleri), LLC grubu ve max frekans bilgisiyle.
+    read() Linux'ta sysfs'ten (`root` sahte bir ağaç olabilir), Windows'ta
+    GetLogicalProcessorInformationEx'ten (çekirdek, EfficiencyClass, önbellek ilişkileri) okur.
+    İkisi de yoksa topoloji bilinmez (source "unknown"): psutil sayıları hibrit işlemcide
+    (ör. 8P+16E, 32 mantıksal / 24 fiziksel) SMT kardeşlerini ve çekirdek türünü gösteremez, bu
+    yüzden plan_affinity sabitleme yapmaz.
+    """
+    def __init__(self, cpus: list[LogicalCpu], source: str = "sysfs"):
+        self.cpus = sorted(cpus, key=lambda c: c.cpu)
+        self.source = source
+        top = max((c.max_freq for c in self.cpus), default=0)
+        top_eff = max((c.efficiency for c in self.cpus if c.efficiency is not None), default=None)
+        for c in self.cpus:
+            c.fast = not top or not c.max_freq or c.max_freq >= top * FAST_CORE_RATIO
+            if top_eff is not None and c.efficiency is not None:
+                c.fast = c.fast and c.efficiency == top_eff
+
+    @classmethod
+    def read(cls, root: str = SYSFS_CPU) -> "CpuTopology":
+        cpus = cls._read_sysfs(root)
+        if cpus:
+            return cls(cpus, "sysfs")
+        if os.name == "nt":
+            cpus = parse_processor_info(_query_processor_info())
+            if cpus:
+                return cls(cpus, "windows")
+        return cls.fallback()
+
+    @classmethod
+    def fallback(cls) -> "CpuTopology":
+        # yalnızca mantıksal işlemci listesi; çekirdek/SMT eşlemesi tahmin edilmez
+        logical = psutil.cpu_count() or 1
+        return cls([LogicalCpu(i) for i in range(logical)], "unknown")
+
+    @property
+    def known(self) -> bool:
+        return self.source != "unknown"
+
+    @staticmethod
+    def _read_sysfs(root: str) -> list[LogicalCpu]:
+        try:
+            names = os.listdir(root)
+        except OSError:
+            return []
+        online = _read(os.path.join(root, "online"))
+        online_set = set(parse_cpu_list(online)) if online else None
+        cpus = []
+        for name in names:
+            m = re.fullmatch(r"cpu(\d+)", name)
+            if not m:
+                continue
+            n = int(m.group(1))
+            if online_set is not None and n not in online_set:
+                continue
+            base = os.path.join(root, name)
+            topo = os.path.join(base, "topology")
+            package = int(_read(os.path.join(topo, "physical_package_id")) or 0)
+            core = _read(os.path.join(topo, "core_id"))
+            sib = _read(os.path.join(topo, "thread_siblings_list"))
+            freq = (_read(os.path.join(base, "cpufreq", "cpuinfo_max_freq"))
+                    or _read(os.path.join(base, "cpu_capacity")) or "0")
+            cpus.append(LogicalCpu(
+                n, package, int(core) if core is not None else None,
+                tuple(parse_cpu_list(sib)) if sib else (), CpuTopology._llc_id(base, n), int(freq),
+            ))
+        return cpus
+
+    @staticmethod
+    def _llc_id(base: str, cpu: int) -> int:
+        """En yüksek seviyeli önbelleği paylaşan işlemcilerin en küçüğü = LLC grup kimliği."""
+        cache = os.path.join(base, "cache")
+        best_level, ident = -1, cpu
+        try:
+            indexes = [d for d in os.listdir(cache) if d.startswith("index")]
+        except OSError:
+            return 0
+        for d in indexes:
+            level = _read(os.path.join(cache, d, "level"))
+            shared = _read(os.path.join(cache, d, "shared_cpu_list"))
+            if level is None or not shared:
+                continue
+            if int(level) > best_level:
+                best_level = int(level)
+                ident = min(parse_cpu_list(shared))
+        return ident
+
+    def physical_cores(self) -> dict[tuple, list[int]]:
+        cores: dict[tuple, list[int]] = {}
+        for c in self.cpus:
+            cores.setdefault(c.core_key, []).append(c.cpu)
+        return cores
+
+    def groups(self) -> dict[tuple, list[int]]:
+        """(paket, LLC, hızlı mı) -> mantıksal işlemciler."""
+        out: dict[tuple, list[int]] = {}
+        for c in self.cpus:
+            out.setdefault((c.package, c.llc, c.fast), []).append(c.cpu)
+        return out
+
+def _query_processor_info() -> bytes:
+    """GetLogicalProcessorInformationEx(RelationAll) ham tamponu; okunamazsa boş."""
+    try:
+        import ctypes
+        from ctypes import wintypes
+        k32 = ctypes.WinDLL("kernel32", use_last_error=True)
+        fn = k32.GetLogicalProcessorInformationEx
+        fn.argtypes = [ctypes.c_int, ctypes.c_void_p, ctypes.POINTER(wintypes.DWORD)]
+        fn.restype = wintypes.BOOL
+        size = wintypes.DWORD(0)
+        fn(RELATION_ALL, None, ctypes.byref(size))
+        for _ in range(3):
+            # ilk çağrı gereken boyutu verir; arada işlemci eklenirse (ERROR_INSUFFICIENT_BUFFER) yeniden denenir
+            buf = ctypes.create_string_buffer(size.value)
+            if fn(RELATION_ALL, buf, ctypes.byref(size)):
+                return buf.raw[:size.value]
+            if ctypes.get_last_error() != 122:
+                break
+    except Exception as e:
+        print("İşlemci topolojisi okunamadı:", e)
+    return b""
+
+def _group_masks(buf: bytes, off: int, count: int) -> list[int]:
+    """GROUP_AFFINITY dizisi -> mantıksal işlemci numaraları (grup * 64 + bit)."""
+    cpus = []
+    for i in range(count):
+        mask, group = struct.unpack_from("<QH", buf, off + i * GROUP_AFFINITY_SIZE)
+        base = group * CPUS_PER_GROUP
+        cpus.extend(base + b for b in range(CPUS_PER_GROUP) if mask >> b & 1)
+    return cpus
+
+def parse_processor_info(buf: bytes) -> list[LogicalCpu]:
+    """
+    SYSTEM_LOGICAL_PROCESSOR_INFORMATION_EX kayıtlarını LogicalCpu listesine çevirir: çekirdek
+    kayıtları SMT kardeşlerini ve EfficiencyClass'ı, paket kayıtları paketi, en yüksek seviyeli
+    önbellek kayıtları LLC grubunu verir (grup kimliği = gruptaki en küçük işlemci).
+    """
+    cores, packages, caches = [], [], []
+    off = 0
+    while off + 8 <= len(buf):
+        rel, size = struct.unpack_from("<II", buf, off)
+        if size < 8 or off + size > len(buf):
+            break
+        if rel in (RELATION_PROCESSOR_CORE, RELATION_PROCESSOR_PACKAGE):
+            # PROCESSOR_RELATIONSHIP: Flags, EfficiencyClass, Reserved[20], GroupCount, GroupMask[]
+            eff, count = buf[off + 9], struct.unpack_from("<H", buf, off + 30)[0]
+            cpus = _group_masks(buf, off + 32, min(count, (size - 32) // GROUP_AFFINITY_SIZE))
+            (cores if rel == RELATION_PROCESSOR_CORE else packages).append((cpus, eff))
+        elif rel == RELATION_CACHE:
+            # CACHE_RELATIONSHIP: Level, ..., GroupCount (eski Windows'ta 0 = tek maske), GroupMask[]
+            level, count = buf[off + 8], struct.unpack_from("<H", buf, off + 38)[0]
+            caches.append((level, _group_masks(buf, off + 40, min(max(1, count), (size - 40) // GROUP_AFFINITY_SIZE))))
+        off += size
+    package_of = {c: i for i, (cpus, _) in enumerate(packages) for c in cpus}
+    llc_of: dict[int, tuple] = {}
+    for level, cpus in caches:
+        ident = (level, min(cpus, default=0))
+        for c in cpus:
+            if c not in llc_of or level > llc_of[c][0]:
+                llc_of[c] = ident
+    out = []
+    for core, (cpus, eff) in enumerate(cores):
+        for c in cpus:
+            out.append(LogicalCpu(c, package_of.get(c, 0), core, tuple(cpus), llc_of.get(c, (0, 0))[1],
+                                  efficiency=eff))
+    return out
+
+class AffinityPlan:
+    __slots__ = ("game", "background", "reason")
+
+    def __init__(self, game: list[int], background: list[int], reason: str):
+        self.game = game
+        self.background = background
+        self.reason = reason
+
+    def __bool__(self):
+        return bool(self.game and self.background)
+
+    def __repr__(self):
+        return f"AffinityPlan(game={self.game}, background={self.background}, reason={self.reason!r})"
+
+def plan_affinity(topo: CpuTopology) -> AffinityPlan:
+    """
+    Oyuna en iyi çekirdek grubunu (hızlı çekirdekli, en çok fiziksel çekirdeği olan LLC grubu)
+    ayırır, kalanları arka plana bırakır. Tek gruplu (homojen, tek LLC) işlemcide oyuna ilk
+    fiziksel çekirdek dışındaki her şey verilir; kesmeler ve sistem işleri çoğunlukla cpu0'dadır.
+    """
+    if not topo.known:
+        return AffinityPlan([], [], "işlemci topolojisi okunamadı; plan yok")
+    cores = topo.physical_cores()
+    all_cpus = [c.cpu for c in topo.cpus]
+    if len(cores) < MIN_PHYSICAL_CORES:
+        return AffinityPlan([], [], f"{len(cores)} fiziksel çekirdek; plan yok")
+    by_cpu = {c.cpu: c for c in topo.cpus}
+
+    def score(item):
+        (_, _, fast), cpus = item
+        ncores = len({by_cpu[c].core_key for c in cpus})
+        return (fast, ncores, sum(by_cpu[c].max_freq for c in cpus), -min(cpus))
+
+    groups = topo.groups()
+    key, best = max(groups.items(), key=score)
+    best_cores = len({by_cpu[c].core_key for c in best})
+    if len(groups) > 1 and len(cores) - best_cores >= MIN_BACKGROUND_CORES:
+        game = sorted(best)
+        reason = f"LLC grubu {key[1]} ({'hızlı' if key[2] else 'verimli'} çekirdekler, {best_cores} fiziksel)"
+    else:
+        first = min(cores.items(), key=lambda kv: min(kv[1]))
+        game = sorted(set(all_cpus) - set(first[1]))
+        reason = f"tek grup; çekirdek {first[0][1]} arka plana ayrıldı"
+    background = sorted(set(all_cpus) - set(game))
+    return AffinityPlan(game, background, reason)
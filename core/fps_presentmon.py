@@ -2,28 +2,76 @@ import os
 import subprocess
 import threading
 import time
-import csv
 from dataclasses import dataclass
 from typing import Optional
 
+from core.profiler import PROFILER
+from core.frame_capture import FrameCaptureWriter, new_capture_path, prune_captures
+from core.frame_stats import FrameStats
+from core.frame_streams import FrameStreamTable
+from core.presentmon_csv import PresentMonCsvReader
+from core.stutter_detect import StutterDetector, STUTTER_FACTOR, STUTTER_MIN_MS
+
 @dataclass
 class FPSSample:
     fps: float = 0.0
     process_name: str = ""
     pid: Optional[int] = None
+    # baskın akışın takas zinciri (core.frame_streams)
+    swapchain: str = ""
+
+PIPE_READ_BYTES = 64 << 10
+FILE_POLL_S = 0.5
+
+def output_dir() -> str:
+    return os.path.join(os.getenv("TEMP", "."), "PulseBoost")
 
 class PresentMonMonitor:
     """
-    PresentMon CSV çıktısını dosyaya alır ve tail ederek FPS hesaplar.
+    PresentMon CSV çıktısını okuyarak FPS hesaplar.
     Kullanım: start(process_name="game.exe") veya start(pid=1234)
+
+    mode="pipe": PresentMon -output_stdout ile çalıştırılır, CSV bir okuyucu iş parçacığında borudan
+    ayrıştırılır (ara dosya yok). Başlatılamazsa ya da hiç satır gelmeden kapanırsa (stdout desteği
+    olmayan sürüm) dosya moduna düşülür.
+    mode="file": geçici CSV kalıcı tanıtıcıyla izlenir; max_file_mb aşılınca PresentMon yeni dosyaya
+    yeniden başlatılır, eski dosya okunup silinir. Oturum bitince dosyalar temizlenir.
+    launcher: komutun önüne eklenir (ör. [sys.executable] ile core/presentmon_fake.py).
+    capture_dir verilirse baskın akışın kareleri oturum başına bir .pbcap kaydına yazılır
+    (en yeni capture_keep kayıt tutulur).
+    PresentMon kendiliğinden çıkarsa (-terminate_on_proc_exit: oyun kapandı) oturum okuyucu iş
+    parçacığında kapanır; stop() ile aynı kapanış bir kez çalışır (yüksek çözünürlük bırakılır,
+    kare kaydı kapatılır).
     """
-    def __init__(self, presentmon_path: str):
+    def __init__(self, presentmon_path: str, system_monitor=None, mode: str = "pipe",
+                 max_file_mb: int = 64, launcher=(), capture_dir: str | None = None, capture_keep: int = 50,
+                 stutter_factor: float = STUTTER_FACTOR, stutter_min_ms: float = STUTTER_MIN_MS):
         self.presentmon_path = presentmon_path
+        # oturum süresince SystemMonitor yüksek çözünürlükte örnekler
+        self._mon = system_monitor
+        self.mode = mode
+        self.max_file_bytes = max(1, int(max_file_mb)) << 20
+        self.launcher = list(launcher)
+        self.capture_dir = capture_dir
+        self.capture_keep = capture_keep
+        self.capture: Optional[FrameCaptureWriter] = None
+        self.active_mode = ""
         self._proc: Optional[subprocess.Popen] = None
         self._tail_thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
         self._running = False
-        self._output_csv = None
+        # oturumu kimin kapatacağı (stop() ya da çıkan okuyucu) bu kilitle bir kez belirlenir
+        self._session_lock = threading.Lock()
+        self._target_args: list[str] = []
+        self.rotations = 0
         self.sample = FPSSample()
+        # kayan pencere kare süresi istatistikleri (ortalama, 1% / 0.1% low); arayüz snapshot() okur
+        self.stats = FrameStats()
+        # (pid, swapchain) akışları; stats yalnızca baskın akışla beslenir
+        self.streams = FrameStreamTable()
+        # baskın akışta takılma / ritim salınımı olayları (SystemMonitor durumuyla)
+        self.stutter = StutterDetector(system_monitor, stutter_factor, stutter_min_ms)
+        self.stutter.subscribe(self._on_stutter)
 
     def available(self) -> bool:
         return bool(self.presentmon_path and os.path.isfile(self.presentmon_path))
@@ -31,61 +79,237 @@ class PresentMonMonitor:
     def start(self, process_name: str | None = None, pid: int | None = None):
         if not self.available():
             raise RuntimeError("PresentMon yolu ayarlı değil veya bulunamadı.")
-        ts = int(time.time())
-        out_dir = os.path.join(os.getenv("TEMP", "."), "PulseBoost")
-        os.makedirs(out_dir, exist_ok=True)
-        self._output_csv = os.path.join(out_dir, f"presentmon_{ts}.csv")
-        args = [self.presentmon_path, "-output_file", self._output_csv, "-no_summary", "-append", "-terminate_on_proc_exit"]
+        self.stop()
+        target = []
         if process_name:
-            args += ["-process_name", process_name]
+            target += ["-process_name", process_name]
             self.sample.process_name = process_name
         if pid:
-            args += ["-process_id", str(pid)]
+            target += ["-process_id", str(pid)]
             self.sample.pid = pid
-        # per-present CSV
-        args += ["-csv"]
-        self._proc = subprocess.Popen(args, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        self._target_args = target
+        self.stats.reset()
+        self.streams.reset(prefer_pid=pid)
+        self.stutter.reset()
+        self.rotations = 0
+        self._open_capture(process_name or (f"pid{pid}" if pid else ""), pid)
+        self._stop = threading.Event()
         self._running = True
-        self._tail_thread = threading.Thread(target=self._tail_loop, daemon=True)
+        # tutma iş parçacığından önce alınır: okuyucu hemen biterse (ör. PresentMon başlatılamadı)
+        # _run() onu her çıkış yolunda bırakır
+        if self._mon:
+            self._mon.request_high_resolution("presentmon")
+        loop = self._pipe_loop if self.mode == "pipe" else self._file_loop
+        self._tail_thread = threading.Thread(target=self._run, args=(loop, self._stop), daemon=True)
         self._tail_thread.start()
 
     def stop(self):
-        self._running = False
+        with self._session_lock:
+            running, self._running = self._running, False
+            self._stop.set()
+        if running:
+            self._terminate(self._proc)
+        # okuyucu oturumu kendisi kapatıyor olabilir; yeni oturum açılmadan önce bitmesi beklenir
+        th = self._tail_thread
+        if th is not None and th is not threading.current_thread():
+            th.join(timeout=2.0)
+            self._tail_thread = None
+        if running:
+            self._end_session()
+
+    def _run(self, loop, stop: threading.Event):
+        try:
+            loop(stop)
+        finally:
+            # stop() çağrılmadan döndüyse PresentMon çıktı (ya da başlatılamadı): oturumu kapat
+            with self._session_lock:
+                ended = not stop.is_set() and self._running
+                if ended:
+                    self._running = False
+                    stop.set()
+            if ended:
+                self._end_session()
+
+    def _end_session(self):
+        if self._mon:
+            self._mon.release_high_resolution("presentmon")
+        self._close_capture()
+
+    def _on_stutter(self, ev):
+        cap = self.capture
+        if cap is not None:
+            try:
+                cap.add_event(ev.as_dict())
+            except OSError:
+                pass
+
+    def _open_capture(self, label: str, pid: int | None):
+        if not self.capture_dir:
+            return
+        try:
+            prune_captures(self.capture_dir, max(0, self.capture_keep - 1))
+            self.capture = FrameCaptureWriter(new_capture_path(self.capture_dir, label), {
+                "label": label, "process_name": label, "pid": pid,
+                # çevrimdışı analiz (core.frame_analysis) aynı takılma eşiklerini kullanır
+                "stutter_factor": self.stutter.factor, "stutter_min_ms": self.stutter.min_ms,
+            })
+        except OSError as e:
+            print("Kare kaydı açılamadı:", e)
+            self.capture = None
+
+    def _close_capture(self):
+        cap, self.capture = self.capture, None
+        if cap is None:
+            return
+        d = self.streams.dominant
         try:
-            if self._proc:
-                self._proc.terminate()
+            cap.close(pid=d.pid if d else None, swapchain=d.swapchain if d else "",
+                      stream_switches=self.streams.switches, stutters=self.stutter.stutters,
+                      pacing_events=self.stutter.pacing_events)
+        except OSError as e:
+            print("Kare kaydı kapatılamadı:", e)
+
+    def _spawn(self, output: list[str], stdout) -> subprocess.Popen:
+        # per-present CSV
+        args = self.launcher + [self.presentmon_path] + output + ["-no_summary", "-terminate_on_proc_exit"]
+        args += self._target_args + ["-csv"]
+        return subprocess.Popen(args, stdin=subprocess.DEVNULL, stdout=stdout, stderr=subprocess.DEVNULL)
+
+    @staticmethod
+    def _terminate(proc: Optional[subprocess.Popen]):
+        if proc is None:
+            return
+        try:
+            proc.terminate()
+            proc.wait(timeout=2.0)
         except Exception:
             pass
 
-    def _tail_loop(self):
-        # CSV header ör: "Application,ProcessID,SwapChainAddress,Runtime,...,msBetweenPresents,..."
-        last_size = 0
-        while self._running:
+    # ---------- boru modu ----------
+    def _pipe_loop(self, stop: threading.Event):
+        try:
+            self._proc = proc = self._spawn(["-output_stdout"], subprocess.PIPE)
+        except OSError as e:
+            print("PresentMon boru modu başlatılamadı, dosya moduna geçiliyor:", e)
+            return self._file_loop(stop)
+        self.active_mode = "pipe"
+        reader = PresentMonCsvReader()
+        out = proc.stdout
+        try:
+            while not stop.is_set():
+                # borudan gelen kadarı (en fazla PIPE_READ_BYTES) döner; boş = PresentMon kapandı
+                chunk = out.read1(PIPE_READ_BYTES) if hasattr(out, "read1") else out.read(PIPE_READ_BYTES)
+                if not chunk:
+                    break
+                with PROFILER.measure("PresentMon.pipe"):
+                    self._consume(reader.feed(chunk))
+        except (OSError, ValueError) as e:
+            if not stop.is_set():
+                print("PresentMon borusu okunamadı:", e)
+        finally:
             try:
-                if self._output_csv and os.path.exists(self._output_csv):
-                    size = os.path.getsize(self._output_csv)
-                    if size > last_size:
-                        with open(self._output_csv, "r", encoding="utf-8", newline="") as f:
-                            f.seek(last_size)
-                            reader = csv.reader(f)
-                            for row in reader:
-                                if not row or "msBetweenPresents" in row[0]:
-                                    # header satırı
-                                    continue
-                                try:
-                                    # kolonları bul
-                                    # basit yaklaşım: msBetweenPresents'ı sondan ara
-                                    ms = None
-                                    for col in row[::-1]:
-                                        if col.replace(".", "", 1).isdigit():
-                                            # aday
-                                            ms = float(col)
-                                            break
-                                    if ms is not None and ms > 0:
-                                        self.sample.fps = 1000.0 / ms
-                                except Exception:
-                                    continue
-                        last_size = size
+                out.close()
             except Exception:
                 pass
-            time.sleep(0.5)
\ No newline at end of file
+        if not stop.is_set() and reader.rows == 0:
+            self._terminate(proc)
+            print("PresentMon stdout çıktısı alınamadı, dosya moduna geçiliyor.")
+            self._file_loop(stop)
+
+    # ---------- dosya modu ----------
+    def _new_csv(self) -> str:
+        out_dir = output_dir()
+        os.makedirs(out_dir, exist_ok=True)
+        return os.path.join(out_dir, f"presentmon_{int(time.time() * 1000)}.csv")
+
+    def _spawn_file(self, path: str) -> subprocess.Popen:
+        return self._spawn(["-output_file", path], subprocess.DEVNULL)
+
+    def _file_loop(self, stop: threading.Event):
+        self.active_mode = "file"
+        cleanup_outputs()
+        path = self._new_csv()
+        try:
+            self._proc = self._spawn_file(path)
+        except OSError as e:
+            print("PresentMon başlatılamadı:", e)
+            return
+        # kalıcı tanıtıcı: her turda yalnızca yeni baytlar okunur, sütunlar başlıktan eşlenir
+        reader = PresentMonCsvReader(path)
+        try:
+            while not stop.is_set():
+                try:
+                    # çıkış okumadan önce denetlenir: son satırlar da okunmuş olur
+                    exited = self._proc.poll() is not None
+                    with PROFILER.measure("PresentMon.tail"):
+                        frames = reader.read()
+                        self._consume(frames)
+                    if exited and not frames:
+                        break
+                    if reader.bytes_read >= self.max_file_bytes:
+                        reader = self._rotate(reader)
+                except Exception as e:
+                    print("PresentMon CSV okunamadı:", e)
+                stop.wait(FILE_POLL_S)
+        finally:
+            self._terminate(self._proc)
+            reader.close()
+            _remove(reader.path)
+
+    def _rotate(self, reader: PresentMonCsvReader) -> PresentMonCsvReader:
+        """Yeni dosyaya yeni PresentMon başlatır; eskisini kapatıp kalanını okur ve siler."""
+        path = self._new_csv()
+        old = self._proc
+        self._proc = self._spawn_file(path)
+        self._terminate(old)
+        while True:
+            frames = reader.read()
+            if not frames:
+                break
+            self._consume(frames)
+        reader.close()
+        _remove(reader.path)
+        self.rotations += 1
+        return PresentMonCsvReader(path)
+
+    def _consume(self, frames: list[tuple]):
+        """(pid, swapchain, t, ms) kareleri akışlara ayrılır; istatistik ve FPS baskın akıştan."""
+        if not frames:
+            return
+        dominant, changed = self.streams.feed(frames)
+        if changed:
+            # başka bir akışa (ör. başlatıcıdan oyuna) geçildi: eski akışın kareleri karışmasın
+            self.stats.reset()
+            d = self.streams.dominant
+            self.sample.pid, self.sample.swapchain = d.pid, d.swapchain
+            self.stutter.reset(d.pid, d.swapchain)
+        if dominant:
+            self.stats.extend(dominant)
+            self.stutter.extend(dominant)
+            cap = self.capture
+            if cap is not None:
+                try:
+                    cap.add(dominant)
+                except OSError as e:
+                    print("Kare kaydı yazılamadı:", e)
+                    self.capture = None
+            self.sample.fps = self.stats.snapshot().avg_fps
+
+def _remove(path: str | None):
+    if not path:
+        return
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+def cleanup_outputs():
+    """Önceki (çökmüş) oturumlardan kalan presentmon_*.csv dosyalarını siler."""
+    out_dir = output_dir()
+    try:
+        names = os.listdir(out_dir)
+    except OSError:
+        return
+    for n in names:
+        if n.startswith("presentmon_") and n.endswith(".csv"):
+            _remove(os.path.join(out_dir, n))
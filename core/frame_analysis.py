@@ -0,0 +1,256 @@
+"""
+Kare süresi kayıtlarının (core.frame_capture, .pbcap) çevrimdışı analizi ve A/B karşılaştırması.
+
+    python -m core.frame_analysis analyze <kayıt.pbcap>
+    python -m core.frame_analysis compare <A.pbcap> <B.pbcap>
+"""
+import argparse
+import json
+import math
+import os
+import sys
+
+import numpy as np
+
+from core.frame_capture import EVENTS_FILE, META_FILE, MS_FILE, T_FILE
+# takılma tanımı canlı dedektörle ortak (core.stutter_detect): önceki MEDIAN_WINDOW karenin kayan
+# medyanının STUTTER_FACTOR katını ve en az STUTTER_MIN_MS fazlasını aşan kare; ritim salınımı
+# sırasında takılma sayılmaz. Kayıt meta.json'daki eşikler (oturumdaki ayarlar) önceliklidir.
+from core.stutter_detect import MEDIAN_WINDOW, STUTTER_FACTOR, STUTTER_MIN_MS, detect_array
+# histogram: 0..HIST_MAX_MS arası HIST_BIN_MS genişliğinde kutular + taşma kutusu
+HIST_BIN_MS = 0.5
+HIST_MAX_MS = 100.0
+# A/B: kayıt bu uzunlukta zaman partilerine bölünür (parti ortalamaları yöntemi); kareler
+# birbirinden bağımsız olmadığı için güven aralıkları kare değil parti düzeyinde hesaplanır
+BATCH_S = 5.0
+MIN_BATCHES = 4
+# çift yönlü %95 t kritik değerleri (serbestlik derecesi 1..30); üstünde normal yaklaşımı
+_T95 = (12.706, 4.303, 3.182, 2.776, 2.571, 2.447, 2.365, 2.306, 2.262, 2.228, 2.201, 2.179, 2.160, 2.145,
+        2.131, 2.120, 2.110, 2.101, 2.093, 2.086, 2.080, 2.074, 2.069, 2.064, 2.060, 2.056, 2.052, 2.048,
+        2.045, 2.042)
+
+class Capture:
+    """Bir .pbcap kaydı: ms (float32) ve t (float64) sütunları salt okunur memmap olarak."""
+    def __init__(self, path: str):
+        self.path = path
+        meta_path = os.path.join(path, META_FILE)
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                self.meta = json.load(f)
+        except (OSError, ValueError):
+            self.meta = {}
+        ms_path, t_path = os.path.join(path, MS_FILE), os.path.join(path, T_FILE)
+        # yarım kalan (çökmüş) kayıtta iki sütunun ortak uzunluğu kullanılır
+        n = min(os.path.getsize(ms_path) // 4, os.path.getsize(t_path) // 8)
+        self.ms = np.memmap(ms_path, dtype=np.float32, mode="r", shape=(n,)) if n else np.empty(0, np.float32)
+        self.t = np.memmap(t_path, dtype=np.float64, mode="r", shape=(n,)) if n else np.empty(0, np.float64)
+
+    def __len__(self):
+        return len(self.ms)
+
+    def events(self) -> list[dict]:
+        """Kayıt sırasında yayınlanan takılma/ritim olayları (core.stutter_detect)."""
+        out = []
+        try:
+            with open(os.path.join(self.path, EVENTS_FILE), "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        out.append(json.loads(line))
+                    except ValueError:
+                        continue
+        except OSError:
+            pass
+        return out
+
+    @property
+    def label(self) -> str:
+        return self.meta.get("label") or os.path.basename(self.path)
+
+    def stutter_params(self) -> dict:
+        """Kayıt sırasında canlı dedektörün kullandığı eşikler (eski kayıtlarda varsayılanlar)."""
+        return {"factor": float(self.meta.get("stutter_factor", STUTTER_FACTOR)),
+                "min_ms": float(self.meta.get("stutter_min_ms", STUTTER_MIN_MS))}
+
+def _lows(ms: np.ndarray) -> dict:
+    """Yüzdelik tanımı (FrameStats ile aynı): 1% low = 1000 / p99 kare süresi."""
+    n = len(ms)
+    k50, k90, k99, k999 = (min(n - 1, int(q * n)) for q in (0.5, 0.9, 0.99, 0.999))
+    # önce p90'da bölünür, alt ve üst parçalar ayrı ayrı seçilir (çoklu kth'li tek partition'dan hızlı)
+    part = np.partition(ms, k90)
+    p90 = float(part[k90])
+    p50 = float(np.partition(part[:k90], k50)[k50]) if k50 < k90 else p90
+    upper = np.partition(part[k90:], [k99 - k90, k999 - k90])
+    p99, p999 = float(upper[k99 - k90]), float(upper[k999 - k90])
+    return {"p50_ms": p50, "p90_ms": p90, "p99_ms": p99, "p999_ms": p999,
+            "low_1": 1000.0 / p99 if p99 > 0 else 0.0, "low_01": 1000.0 / p999 if p999 > 0 else 0.0}
+
+def stutters(ms: np.ndarray, factor: float = STUTTER_FACTOR, window: int = MEDIAN_WINDOW,
+             min_ms: float = STUTTER_MIN_MS) -> np.ndarray:
+    """Takılma karelerinin indisleri; canlı StutterDetector ile aynı kural (detect_array)."""
+    return detect_array(ms, factor, min_ms, window)[0]
+
+def detect(cap) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Capture ya da ms dizisinde (takılma, ritim olayı) kare indisleri. Dedektör geçerli (ms > 0)
+    kareleri görür; indisler kaydın kendi indisleridir. Kayıt başına bir kez hesaplanıp analyze()
+    ve batch_metrics()'e verilebilir (detect_array kayıt analizinin baskın maliyetidir).
+    """
+    ms = cap.ms if isinstance(cap, Capture) else np.asarray(cap, dtype=np.float32)
+    params = cap.stutter_params() if isinstance(cap, Capture) else {}
+    valid = ms > 0
+    if valid.all():
+        return detect_array(ms, **params)
+    keep = np.flatnonzero(valid)
+    st, pacing = detect_array(ms[keep], **params)
+    return keep[st], keep[pacing]
+
+def histogram(ms: np.ndarray, bin_ms: float = HIST_BIN_MS, max_ms: float = HIST_MAX_MS) -> dict:
+    nb = int(round(max_ms / bin_ms))
+    idx = np.minimum((ms * (1.0 / bin_ms)).astype(np.int64), nb)
+    counts = np.bincount(idx, minlength=nb + 1)
+    return {"bin_ms": bin_ms, "max_ms": max_ms, "counts": counts.tolist()}
+
+def analyze(cap, hist: bool = True, detected: tuple | None = None) -> dict:
+    """
+    Capture ya da ms dizisi için özet; milyonlarca karede NumPy ile tek geçişli işlemler.
+    `detected`: aynı kayıt için önceden hesaplanmış detect() sonucu.
+    """
+    if detected is None:
+        detected = detect(cap)
+    ms = cap.ms if isinstance(cap, Capture) else np.asarray(cap, dtype=np.float32)
+    ms = ms[ms > 0]
+    n = len(ms)
+    if n == 0:
+        return {"frames": 0}
+    total = float(ms.sum(dtype=np.float64))
+    out = {"frames": n, "duration_s": total / 1000.0, "avg_fps": n * 1000.0 / total,
+           "avg_ms": total / n, "std_ms": float(ms.std(dtype=np.float64)), "max_ms": float(ms.max())}
+    out.update(_lows(ms))
+    st, pacing = detected
+    out["stutters"] = int(len(st))
+    out["stutters_per_min"] = len(st) / (total / 60000.0)
+    out["pacing_events"] = int(len(pacing))
+    if hist:
+        out["histogram"] = histogram(ms)
+    return out
+
+def batch_metrics(cap: Capture, batch_s: float = BATCH_S, detected: tuple | None = None) -> dict[str, np.ndarray]:
+    """
+    Kaydı zaman partilerine böler; parti başına ortalama FPS, 1% low ve takılma/dk.
+    `detected`: aynı kayıt için önceden hesaplanmış detect() sonucu.
+    """
+    ms, t = cap.ms, cap.t
+    if len(ms) == 0:
+        return {"avg_fps": np.empty(0), "low_1": np.empty(0), "stutters_per_min": np.empty(0)}
+    edges = np.arange(float(t[0]), float(t[-1]) + batch_s, batch_s)
+    bounds = np.searchsorted(t, edges)
+    st_mask = np.zeros(len(ms), dtype=bool)
+    st_mask[(detected if detected is not None else detect(cap))[0]] = True
+    fps, low, spm = [], [], []
+    for a, b in zip(bounds[:-1], bounds[1:]):
+        # kısmi son parti ve boş partiler atlanır
+        if b - a < 100:
+            continue
+        seg = ms[a:b]
+        total = float(seg.sum(dtype=np.float64))
+        if total < batch_s * 500.0:
+            continue
+        k = int(0.99 * len(seg))
+        p99 = float(np.partition(seg, k)[k])
+        fps.append(len(seg) * 1000.0 / total)
+        low.append(1000.0 / p99)
+        spm.append(int(st_mask[a:b].sum()) / (total / 60000.0))
+    return {"avg_fps": np.array(fps), "low_1": np.array(low), "stutters_per_min": np.array(spm)}
+
+def _t95(df: float) -> float:
+    if df < 1:
+        return float("nan")
+    i = int(df)
+    return _T95[i - 1] if i <= len(_T95) else 1.96
+
+def welch(a: np.ndarray, b: np.ndarray) -> dict:
+    """B - A farkı ve %95 güven aralığı (Welch t, parti ortalamaları üzerinden)."""
+    na, nb = len(a), len(b)
+    if na < 2 or nb < 2:
+        return {"a": float(a.mean()) if na else float("nan"), "b": float(b.mean()) if nb else float("nan"),
+                "diff": float("nan"), "ci": (float("nan"), float("nan")), "significant": False}
+    ma, mb = float(a.mean()), float(b.mean())
+    va, vb = float(a.var(ddof=1)) / na, float(b.var(ddof=1)) / nb
+    se = math.sqrt(va + vb)
+    if se == 0:
+        d = mb - ma
+        return {"a": ma, "b": mb, "diff": d, "ci": (d, d), "significant": d != 0}
+    df = (va + vb) ** 2 / ((va ** 2) / (na - 1) + (vb ** 2) / (nb - 1))
+    h = _t95(df) * se
+    d = mb - ma
+    return {"a": ma, "b": mb, "diff": d, "ci": (d - h, d + h), "significant": not (d - h <= 0.0 <= d + h)}
+
+def compare(a: Capture, b: Capture, batch_s: float = BATCH_S) -> dict:
+    # takılma/ritim tespiti kayıt başına bir kez; özet ve partiler aynı sonucu kullanır
+    da, db = detect(a), detect(b)
+    ba, bb = batch_metrics(a, batch_s, da), batch_metrics(b, batch_s, db)
+    out = {"batch_s": batch_s, "batches": (len(ba["avg_fps"]), len(bb["avg_fps"])),
+           "summary": (analyze(a, hist=False, detected=da), analyze(b, hist=False, detected=db)), "metrics": {}}
+    for key in ("avg_fps", "low_1", "stutters_per_min"):
+        out["metrics"][key] = welch(ba[key], bb[key])
+    out["enough_data"] = min(out["batches"]) >= MIN_BATCHES
+    return out
+
+def format_analysis(r: dict, label: str = "") -> str:
+    if not r.get("frames"):
+        return f"{label}: kare yok"
+    return (f"{label}\n"
+            f"  kare {r['frames']:,} • süre {r['duration_s']:.1f} sn\n"
+            f"  FPS ort. {r['avg_fps']:.1f} • 1% low {r['low_1']:.1f} • 0.1% low {r['low_01']:.1f}\n"
+            f"  kare süresi p50 {r['p50_ms']:.2f} • p99 {r['p99_ms']:.2f} • p99.9 {r['p999_ms']:.2f} • "
+            f"maks {r['max_ms']:.1f} ms • std {r['std_ms']:.2f}\n"
+            f"  takılma {r['stutters']} ({r['stutters_per_min']:.1f}/dk) • ritim salınımı {r['pacing_events']}")
+
+def format_compare(c: dict, label_a: str = "A", label_b: str = "B") -> str:
+    names = {"avg_fps": "FPS ort.", "low_1": "1% low", "stutters_per_min": "takılma/dk"}
+    lines = [f"A: {label_a}", f"B: {label_b}",
+             f"parti {c['batch_s']:.0f} sn • A {c['batches'][0]} / B {c['batches'][1]} parti",
+             f"{'metrik':<12} {'A':>9} {'B':>9} {'B-A':>9}   %95 GA"]
+    for key, m in c["metrics"].items():
+        lo, hi = m["ci"]
+        mark = " *" if m["significant"] else ""
+        lines.append(f"{names[key]:<12} {m['a']:>9.2f} {m['b']:>9.2f} {m['diff']:>+9.2f}   [{lo:+.2f}, {hi:+.2f}]{mark}")
+    lines.append("* aralık 0'ı içermiyor: fark anlamlı")
+    if not c["enough_data"]:
+        lines.append(f"uyarı: güvenilir bir aralık için her oturumda en az {MIN_BATCHES} parti gerekir")
+    return "\n".join(lines)
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="kare süresi kaydı analizi / A-B karşılaştırması")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    p = sub.add_parser("analyze")
+    p.add_argument("capture")
+    p.add_argument("--json", action="store_true")
+    p = sub.add_parser("compare")
+    p.add_argument("a")
+    p.add_argument("b")
+    p.add_argument("--batch", type=float, default=BATCH_S, help="parti uzunluğu (sn)")
+    args = ap.parse_args(argv)
+
+    if args.cmd == "analyze":
+        cap = Capture(args.capture)
+        r = analyze(cap)
+        events = cap.events()
+        if args.json:
+            r["events"] = events
+            print(json.dumps(r, indent=2))
+        else:
+            print(format_analysis(r, cap.label))
+            if events:
+                causes = {}
+                for e in events:
+                    k = f"{e['kind']}/{e.get('cause') or '?'}"
+                    causes[k] = causes.get(k, 0) + 1
+                print("  olaylar: " + ", ".join(f"{k} {n}" for k, n in sorted(causes.items())))
+        return 0
+    a, b = Capture(args.a), Capture(args.b)
+    print(format_compare(compare(a, b, args.batch), a.label, b.label))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,115 @@
+import json
+import os
+import re
+import shutil
+import time
+from array import array
+
+from core.settings import CONFIG_DIR
+
+CAPTURE_DIR = os.path.join(CONFIG_DIR, "captures")
+CAPTURE_EXT = ".pbcap"
+# sütun dosyaları: kare süresi float32 ms, sunum zamanı float64 sn (PresentMon TimeInSeconds)
+MS_FILE = "ms.f32"
+T_FILE = "t.f64"
+META_FILE = "meta.json"
+# takılma/ritim olayları (core.stutter_detect), satır başına bir JSON
+EVENTS_FILE = "events.jsonl"
+FORMAT_VERSION = 1
+# bu kadar kare birikince diske yazılır
+FLUSH_FRAMES = 8192
+
+class FrameCaptureWriter:
+    """
+    Bir oturumun kare sürelerini ikili sütun dosyalarına ekler: <ad>.pbcap/ klasöründe ms.f32 ve
+    t.f64 (yerel bayt sırası, başlıksız) ile meta.json. Sütunlar ayrı dosyalar olduğu için kayıt
+    sürerken yalnızca eklenir ve analiz tarafında doğrudan np.memmap ile açılır. Kare sayısı dosya
+    boyutlarından çıkarılır; uygulama çökse bile yazılmış kareler okunabilir.
+    add() PresentMon okuyucu iş parçacığından çağrılır (tek yazıcı).
+    """
+    def __init__(self, path: str, meta: dict | None = None):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+        self.meta = {"version": FORMAT_VERSION, "started": time.time(), **(meta or {})}
+        self._ms = array("f")
+        self._t = array("d")
+        self._fms = open(os.path.join(path, MS_FILE), "ab")
+        self._ft = open(os.path.join(path, T_FILE), "ab")
+        self._fev = None
+        self.frames = 0
+        self._write_meta()
+
+    def add(self, frames):
+        """(ms, t) kareleri."""
+        ms, t = self._ms, self._t
+        for m, ts in frames:
+            ms.append(m)
+            t.append(ts)
+        if len(ms) >= FLUSH_FRAMES:
+            self.flush()
+
+    def add_event(self, event: dict):
+        if self._fms is None:
+            return
+        if self._fev is None:
+            self._fev = open(os.path.join(self.path, EVENTS_FILE), "a", encoding="utf-8")
+        # olaylar seyrek: her biri hemen diske
+        self._fev.write(json.dumps(event, ensure_ascii=False) + "\n")
+        self._fev.flush()
+
+    def flush(self):
+        if self._fms is None or not self._ms:
+            return
+        self._fms.write(self._ms.tobytes())
+        self._ft.write(self._t.tobytes())
+        self._fms.flush()
+        self._ft.flush()
+        self.frames += len(self._ms)
+        self._ms = array("f")
+        self._t = array("d")
+
+    def close(self, **meta):
+        if self._fms is None:
+            return
+        self.flush()
+        self._fms.close()
+        self._ft.close()
+        if self._fev is not None:
+            self._fev.close()
+        self._fms = self._ft = self._fev = None
+        self.meta.update(meta)
+        self.meta["ended"] = time.time()
+        self.meta["frames"] = self.frames
+        self._write_meta()
+
+    def _write_meta(self):
+        tmp = os.path.join(self.path, META_FILE + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.meta, f, ensure_ascii=False, indent=2)
+        os.replace(tmp, os.path.join(self.path, META_FILE))
+
+def new_capture_path(root: str = CAPTURE_DIR, label: str = "") -> str:
+    name = time.strftime("%Y%m%d_%H%M%S")
+    label = re.sub(r"[^\w.-]+", "_", label).strip("_")
+    if label:
+        name += "_" + label
+    path = os.path.join(root, name + CAPTURE_EXT)
+    n = 1
+    while os.path.exists(path):
+        n += 1
+        path = os.path.join(root, f"{name}_{n}{CAPTURE_EXT}")
+    return path
+
+def list_captures(root: str = CAPTURE_DIR) -> list[str]:
+    """Kayıt klasörleri, eskiden yeniye."""
+    try:
+        names = sorted(n for n in os.listdir(root) if n.endswith(CAPTURE_EXT))
+    except OSError:
+        return []
+    return [os.path.join(root, n) for n in names]
+
+def prune_captures(root: str = CAPTURE_DIR, keep: int = 50):
+    """En yeni `keep` kayıt dışındakileri siler."""
+    caps = list_captures(root)
+    for p in caps[:max(0, len(caps) - keep)]:
+        shutil.rmtree(p, ignore_errors=True)
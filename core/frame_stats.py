@@ -0,0 +1,242 @@
+import math
+import threading
+from array import array
+
+DEFAULT_WINDOW_S = 10.0
+# ~10 sn @ 1600 FPS; daha eski kareler pencere süresinden önce de düşer
+DEFAULT_CAPACITY = 16384
+# kayan toplamlar her bu kadar çıkarmada ring'den yeniden hesaplanır (kayan nokta kayması)
+RESUM_EVERY = 1 << 16
+
+class P2Quantile:
+    """
+    Jain & Chlamtac P² algoritması: tek bir q yüzdeliğini 5 işaretçiyle, kare başına O(1) ve
+    sabit bellekle tahmin eder. İlk 5 örnekte tam değer kullanılır.
+    """
+    __slots__ = ("q", "n", "heights", "pos", "desired", "incr")
+
+    def __init__(self, q: float):
+        self.q = q
+        self.reset()
+
+    def reset(self):
+        q = self.q
+        self.n = 0
+        self.heights = [0.0] * 5
+        self.pos = [1.0, 2.0, 3.0, 4.0, 5.0]
+        self.desired = [1.0, 1.0 + 2 * q, 1.0 + 4 * q, 3.0 + 2 * q, 5.0]
+        self.incr = [0.0, q / 2, q, (1 + q) / 2, 1.0]
+
+    def add(self, x: float):
+        h = self.heights
+        if self.n < 5:
+            h[self.n] = x
+            self.n += 1
+            if self.n == 5:
+                h.sort()
+            return
+        self.n += 1
+        if x < h[0]:
+            h[0] = x
+            k = 0
+        elif x >= h[4]:
+            h[4] = x
+            k = 3
+        else:
+            k = 0
+            while k < 3 and x >= h[k + 1]:
+                k += 1
+        pos, desired, incr = self.pos, self.desired, self.incr
+        for i in range(k + 1, 5):
+            pos[i] += 1.0
+        for i in range(5):
+            desired[i] += incr[i]
+        for i in (1, 2, 3):
+            d = desired[i] - pos[i]
+            if (d >= 1.0 and pos[i + 1] - pos[i] > 1.0) or (d <= -1.0 and pos[i - 1] - pos[i] < -1.0):
+                s = 1.0 if d > 0 else -1.0
+                # parabolik tahmin; sıralamayı bozarsa doğrusal
+                hp = h[i] + s / (pos[i + 1] - pos[i - 1]) * (
+                    (pos[i] - pos[i - 1] + s) * (h[i + 1] - h[i]) / (pos[i + 1] - pos[i])
+                    + (pos[i + 1] - pos[i] - s) * (h[i] - h[i - 1]) / (pos[i] - pos[i - 1])
+                )
+                if not h[i - 1] < hp < h[i + 1]:
+                    j = i + int(s)
+                    hp = h[i] + s * (h[j] - h[i]) / (pos[j] - pos[i])
+                h[i] = hp
+                pos[i] += s
+
+    def value(self) -> float:
+        if self.n == 0:
+            return 0.0
+        if self.n < 5:
+            s = sorted(self.heights[:self.n])
+            return s[min(self.n - 1, int(self.q * self.n))]
+        return self.heights[2]
+
+class _Staggered:
+    """
+    Kayan pencereye yaklaşmak için yarım pencere kaydırılmış iki P² kümesi: her biri pencere
+    dolunca sıfırlanır; okunan değer daha uzun süredir dolan (pencerenin yarısı..tamamı kadar
+    veri görmüş) kümeden gelir.
+    """
+    __slots__ = ("quantiles", "sets", "started", "window")
+
+    def __init__(self, quantiles: tuple, window: float):
+        self.quantiles = quantiles
+        self.window = window
+        self.sets = [[P2Quantile(q) for q in quantiles] for _ in range(2)]
+        self.started = [None, None]
+
+    def add(self, x: float, t: float):
+        started = self.started
+        if started[0] is None:
+            started[0] = t
+            started[1] = t + self.window / 2
+        for i in (0, 1):
+            if t < started[i]:
+                continue
+            if t - started[i] >= self.window:
+                for est in self.sets[i]:
+                    est.reset()
+                started[i] = t
+            for est in self.sets[i]:
+                est.add(x)
+
+    def values(self) -> list[float]:
+        a, b = self.sets
+        best = a if a[0].n >= b[0].n else b
+        return [est.value() for est in best]
+
+    def reset(self):
+        for s in self.sets:
+            for est in s:
+                est.reset()
+        self.started = [None, None]
+
+class FrameStatsSnapshot:
+    # max_ms: reset()'ten bu yana en uzun kare
+    __slots__ = ("frames", "window_s", "avg_fps", "low_1", "low_01", "avg_ms", "p99_ms", "p999_ms",
+                 "var_ms2", "std_ms", "last_ms", "max_ms", "total_frames")
+
+    def __init__(self, **kw):
+        for k in self.__slots__:
+            setattr(self, k, kw.get(k, 0.0))
+
+    def as_dict(self) -> dict:
+        return {k: getattr(self, k) for k in self.__slots__}
+
+class FrameStats:
+    """
+    Kare süresi (ms) akışından kayan pencere istatistikleri. Kareler önceden ayrılmış bir ring'de
+    tutulur; toplam/kare toplamı kare başına O(1) güncellenir (ortalama FPS, varyans). p99 ve p99.9
+    kare süreleri kayan P² tahmincileriyle O(1) izlenir.
+    1% low / 0.1% low = 1000 / p99 ve 1000 / p99.9 kare süresi (yüzdelik tanımı).
+    add() PresentMon okuyucu iş parçacığından, snapshot() arayüzden çağrılır.
+    """
+    def __init__(self, window_s: float = DEFAULT_WINDOW_S, capacity: int = DEFAULT_CAPACITY):
+        self.window_s = window_s
+        self.capacity = capacity
+        self._ms = array("d", bytes(8 * capacity))
+        self._t = array("d", bytes(8 * capacity))
+        self._lock = threading.Lock()
+        self._q = _Staggered((0.99, 0.999), window_s)
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._head = 0      # en eski kare
+            self._count = 0
+            self._sum = 0.0
+            self._sumsq = 0.0
+            self._removed = 0
+            self._last = 0.0
+            self._max = 0.0
+            self._last_t = 0.0
+            self.total_frames = 0
+            self._q.reset()
+
+    def _evict_one(self):
+        i = self._head
+        v = self._ms[i]
+        self._sum -= v
+        self._sumsq -= v * v
+        self._head = (i + 1) % self.capacity
+        self._count -= 1
+        self._removed += 1
+
+    def _push(self, ms: float, t: float):
+        cap = self.capacity
+        if self._count == cap:
+            self._evict_one()
+        i = (self._head + self._count) % cap
+        self._ms[i] = ms
+        self._t[i] = t
+        self._count += 1
+        self._sum += ms
+        self._sumsq += ms * ms
+        # zaman penceresi dışına düşenler
+        limit = t - self.window_s
+        while self._count > 1 and self._t[self._head] < limit:
+            self._evict_one()
+        if self._removed >= RESUM_EVERY:
+            self._resum()
+        self._q.add(ms, t)
+        self._last = ms
+        self._last_t = t
+        if ms > self._max:
+            self._max = ms
+        self.total_frames += 1
+
+    def _resum(self):
+        s = sq = 0.0
+        cap = self.capacity
+        for k in range(self._count):
+            v = self._ms[(self._head + k) % cap]
+            s += v
+            sq += v * v
+        self._sum, self._sumsq, self._removed = s, sq, 0
+
+    def add(self, ms: float, t: float | None = None):
+        """Bir kare ekler; t (sn) verilmezse önceki karenin zamanına ms eklenir."""
+        if not ms > 0 or math.isinf(ms):
+            return
+        with self._lock:
+            self._push(ms, t if t is not None else self._last_t + ms / 1000.0)
+
+    def extend(self, frames):
+        """(ms, t) çiftleri ya da yalnızca ms değerleri; tek kilitle."""
+        with self._lock:
+            for f in frames:
+                if isinstance(f, tuple):
+                    ms, t = f
+                else:
+                    ms, t = f, None
+                if not ms > 0 or math.isinf(ms):
+                    continue
+                self._push(ms, t if t is not None else self._last_t + ms / 1000.0)
+
+    def window(self) -> list[float]:
+        """Penceredeki kare süreleri (eskiden yeniye); doğrulama ve dışa aktarma için."""
+        with self._lock:
+            cap = self.capacity
+            return [self._ms[(self._head + k) % cap] for k in range(self._count)]
+
+    def snapshot(self) -> FrameStatsSnapshot:
+        with self._lock:
+            n = self._count
+            if n == 0:
+                return FrameStatsSnapshot(frames=0, window_s=self.window_s, total_frames=self.total_frames)
+            total = self._sum
+            mean = total / n
+            var = max(0.0, self._sumsq / n - mean * mean)
+            p99, p999 = self._q.values()
+            return FrameStatsSnapshot(
+                frames=n, window_s=self.window_s,
+                avg_fps=n * 1000.0 / total if total > 0 else 0.0,
+                low_1=1000.0 / p99 if p99 > 0 else 0.0,
+                low_01=1000.0 / p999 if p999 > 0 else 0.0,
+                avg_ms=mean, p99_ms=p99, p999_ms=p999,
+                var_ms2=var, std_ms=math.sqrt(var), last_ms=self._last,
+                max_ms=self._max, total_frames=self.total_frames,
+            )
@@ -0,0 +1,143 @@
+RATE_BUCKET_S = 1.0
+# baskın akış değişimi: aday bu oranda daha hızlı olmalı ve bu kadar süre önde kalmalı
+SWITCH_RATIO = 1.2
+SWITCH_HOLD_S = 2.0
+# bu kadar süre kare gelmeyen akış bayat sayılır (baskınsa hemen bırakılır)
+STALE_S = 1.0
+DROP_S = 30.0
+MAX_STREAMS = 64
+
+class FrameStream:
+    """Tek bir (ProcessID, SwapChainAddress) akışı: sayaçlar ve 1 sn'lik kovalardan sunum hızı."""
+    __slots__ = ("pid", "swapchain", "frames", "first_t", "last_t", "last_ms", "rate",
+                 "_bucket_t", "_bucket_n", "ahead_since")
+
+    def __init__(self, pid: int, swapchain: str, t: float):
+        self.pid = pid
+        self.swapchain = swapchain
+        self.frames = 0
+        self.first_t = t
+        self.last_t = t
+        self.last_ms = 0.0
+        self.rate = 0.0
+        self._bucket_t = t
+        self._bucket_n = 0
+        self.ahead_since = None
+
+    @property
+    def key(self) -> tuple:
+        return self.pid, self.swapchain
+
+    def add(self, t: float, ms: float):
+        self.frames += 1
+        self.last_t = t
+        self.last_ms = ms
+        self._bucket_n += 1
+        span = t - self._bucket_t
+        if span >= RATE_BUCKET_S:
+            self.rate = self._bucket_n / span
+            self._bucket_t = t
+            self._bucket_n = 0
+
+    def present_rate(self, now: float) -> float:
+        """Son tamamlanan kovanın hızı; ilk kova dolmadan kısmi kova, bayat akış için 0."""
+        if now - self.last_t > STALE_S:
+            return 0.0
+        if self.rate:
+            return self.rate
+        span = self.last_t - self.first_t
+        return self._bucket_n / span if span > 0 else 0.0
+
+class FrameStreamTable:
+    """
+    PresentMon satırlarını (pid, swapchain) anahtarıyla akışlara ayırır. Satır başına maliyet tek
+    sözlük araması (ardışık aynı akış satırlarında o da yok); baskın akış seçimi parti başına
+    akış sayısıyla orantılıdır. Baskın akış sunum hızına göre seçilir; başlatıcı/overlay gibi kısa
+    süreli hızlı akışlara geçmemek için aday SWITCH_RATIO kat hızlı ve SWITCH_HOLD_S süre önde
+    olmalıdır. prefer_pid verilirse o sürecin akışları eşitlikte öne alınır.
+    feed() yalnızca baskın akışın karelerini (ms, t) döndürür.
+    """
+    def __init__(self, prefer_pid: int | None = None, max_streams: int = MAX_STREAMS):
+        self.prefer_pid = prefer_pid
+        self.max_streams = max_streams
+        self.streams: dict[tuple, FrameStream] = {}
+        self.dominant: FrameStream | None = None
+        self.switches = 0
+        self.now = 0.0
+
+    def reset(self, prefer_pid: int | None = None):
+        self.prefer_pid = prefer_pid
+        self.streams.clear()
+        self.dominant = None
+        self.switches = 0
+        self.now = 0.0
+
+    def feed(self, frames: list[tuple]) -> tuple[list[tuple], bool]:
+        """(pid, swapchain, t, ms) kareleri; (baskın akışın (ms, t) kareleri, baskın değişti mi) döndürür."""
+        if not frames:
+            return [], False
+        streams = self.streams
+        last_pid = last_swap = cur = None
+        for pid, swap, t, ms in frames:
+            if pid != last_pid or swap != last_swap:
+                last_pid, last_swap = pid, swap
+                cur = streams.get((pid, swap))
+                if cur is None:
+                    cur = streams[pid, swap] = FrameStream(pid, swap, t)
+            cur.add(t, ms)
+        self.now = max(self.now, frames[-1][2])
+        changed = self._select()
+        dom = self.dominant
+        if dom is None:
+            return [], changed
+        dpid, dswap = dom.pid, dom.swapchain
+        return [(ms, t) for pid, swap, t, ms in frames if pid == dpid and swap == dswap], changed
+
+    def _score(self, s: FrameStream) -> float:
+        rate = s.present_rate(self.now)
+        if self.prefer_pid is not None and s.pid == self.prefer_pid:
+            rate *= SWITCH_RATIO
+        return rate
+
+    def _select(self) -> bool:
+        now = self.now
+        if len(self.streams) > self.max_streams or any(now - s.last_t > DROP_S for s in self.streams.values()):
+            self._prune()
+        best = max(self.streams.values(), key=self._score, default=None)
+        dom = self.dominant
+        if best is None or best is dom:
+            if dom is not None:
+                dom.ahead_since = None
+            return False
+        if dom is None or dom.key not in self.streams or dom.present_rate(now) == 0.0:
+            return self._switch(best)
+        if self._score(best) >= self._score(dom) * SWITCH_RATIO:
+            if best.ahead_since is None:
+                best.ahead_since = now
+            elif now - best.ahead_since >= SWITCH_HOLD_S:
+                return self._switch(best)
+        else:
+            best.ahead_since = None
+        return False
+
+    def _switch(self, s: FrameStream) -> bool:
+        s.ahead_since = None
+        self.dominant = s
+        self.switches += 1
+        return True
+
+    def _prune(self):
+        now = self.now
+        live = sorted(self.streams.values(), key=lambda s: s.last_t, reverse=True)
+        keep = [s for s in live[:self.max_streams] if now - s.last_t <= DROP_S or s is self.dominant]
+        self.streams = {s.key: s for s in keep}
+
+    def snapshot(self) -> list[dict]:
+        """Tanılama için tüm akışlar (hıza göre azalan)."""
+        now = self.now
+        out = [{
+            "pid": s.pid, "swapchain": s.swapchain, "fps": s.present_rate(now), "frames": s.frames,
+            "idle_s": max(0.0, now - s.last_t), "last_ms": s.last_ms, "dominant": s is self.dominant,
+        } for s in list(self.streams.values())]
+        out.sort(key=lambda d: d["fps"], reverse=True)
+        return out
@@ -0,0 +1,210 @@
+import ntpath
+import threading
+
+from core.profiler import PROFILER
+from core.process_table import ProcessTable, ProcEntry
+
+# Bilinen oyun çalıştırılabilirleri (küçük harf)
+KNOWN_GAME_EXES = {
+    "cs2.exe", "csgo.exe", "dota2.exe", "valorant-win64-shipping.exe", "r5apex.exe", "r5apex_dx12.exe",
+    "fortniteclient-win64-shipping.exe", "overwatch.exe", "gta5.exe", "rdr2.exe", "eldenring.exe",
+    "cyberpunk2077.exe", "witcher3.exe", "leagueoflegends.exe", "league of legends.exe",
+    "rocketleague.exe", "pubg-win64-shipping.exe", "tslgame.exe", "destiny2.exe", "minecraft.exe",
+    "robloxplayerbeta.exe", "cod.exe", "modernwarfare.exe", "bf2042.exe", "bfv.exe",
+    "starfield.exe", "bg3.exe", "bg3_dx11.exe", "helldivers2.exe", "rainbowsix.exe",
+    "rainbowsix_vulkan.exe", "eurotrucks2.exe", "amtrucks.exe", "forzahorizon5.exe", "re4.exe",
+    "hogwartslegacy.exe", "palworld-win64-shipping.exe", "deadbydaylight-win64-shipping.exe",
+}
+# Kurulum klasörü işaretleri: yol bileşenlerinden biri bunlardan biriyse oyun sayılır (küçük harf)
+GAME_DIR_MARKERS = {
+    "steamapps", "epic games", "gog games", "gog galaxy", "riot games", "xboxgames",
+    "ea games", "ubisoft game launcher", "battle.net", "rockstar games",
+}
+# Oyun klasöründe olsa da oyun olmayanlar (başlatıcılar, çökme raporlayıcılar, hile koruması)
+NON_GAME_EXES = {
+    "steam.exe", "steamwebhelper.exe", "steamerrorreporter.exe", "steamerrorreporter64.exe",
+    "epicgameslauncher.exe", "epicwebhelper.exe", "unrealcefsubprocess.exe", "crashreportclient.exe",
+    "unitycrashhandler64.exe", "unitycrashhandler32.exe", "easyanticheat.exe", "easyanticheat_eos.exe",
+    "beservice.exe", "battleye.exe", "riotclientservices.exe", "riotclientux.exe", "riotclientcrashhandler.exe",
+    "galaxyclient.exe", "eadesktop.exe", "ealauncher.exe", "upc.exe", "uplaywebcore.exe", "battle.net.exe",
+    "agent.exe", "vc_redist.x64.exe", "vc_redist.x86.exe", "dxsetup.exe", "dotnetfx.exe",
+}
+
+# GPU sezgiseli: bilinmeyen yeni süreç bu süre içinde bu eşikleri aşarsa oyun sayılır
+HEURISTIC_WINDOW_S = 60.0
+HEURISTIC_GPU_UTIL = 60.0
+HEURISTIC_MIN_RSS = 1024 ** 3
+HEURISTIC_MIN_CPU = 20.0
+HEURISTIC_MAX_PENDING = 32
+
+class GameSignatures:
+    """
+    Oyun imza veritabanı: ad ve klasör işaretleri kümelerde tutulur; eşleştirme ad için tek
+    küme araması, yol için yol derinliği kadar küme araması.
+    """
+    def __init__(self, exes=(), dirs=(), exclude=()):
+        self.exes = set(KNOWN_GAME_EXES) | {x.lower() for x in exes}
+        self.dirs = set(GAME_DIR_MARKERS)
+        # kullanıcı klasörleri tam yol önekleri olarak da verilebilir
+        self.dir_prefixes = set()
+        for d in dirs:
+            d = ntpath.normcase(d).rstrip("\\")
+            if "\\" in d:
+                self.dir_prefixes.add(d + "\\")
+            elif d:
+                self.dirs.add(d.lower())
+        self.exclude = set(NON_GAME_EXES) | {x.lower() for x in exclude}
+
+    def match(self, name: str, path: str = "") -> str | None:
+        """Eşleşme kaynağını ("exe" / "path") ya da None döndürür."""
+        name = name.lower()
+        if name in self.exclude:
+            return None
+        if name in self.exes:
+            return "exe"
+        if path:
+            norm = ntpath.normcase(path)
+            parts = norm.split("\\")
+            if any(p in self.dirs for p in parts[:-1]):
+                return "path"
+            if self.dir_prefixes and any(norm.startswith(pre) for pre in self.dir_prefixes):
+                return "path"
+        return None
+
+class _Pending:
+    __slots__ = ("entry", "since", "cpu_time", "at")
+
+    def __init__(self, entry: ProcEntry, now: float):
+        self.entry = entry
+        self.since = now
+        self.cpu_time = None
+        self.at = now
+
+class GameWatcher:
+    """
+    Paylaşılan süreç tablosunun farklarını izler (tabloyu kim yenilerse yenilesin, ProcessTable.watch).
+    Yeni süreçler imza veritabanıyla eşleştirilir; `heuristic` açıksa eşleşmeyenler GPU sezgiseli
+    için kısa bir süre adaylıkta tutulur (yalnızca adayların CPU/RAM'i okunur). Sezgisel sistem
+    geneli GPU kullanımına bakar, hangi sürecin GPU'yu kullandığını bilemez; varsayılan kapalıdır.
+    Çıkış, tablonun (pid, create_time) kimliğiyle raporladığı "çıkan" girişlerden anlaşılır; izlenen
+    oyunun kimliği her poll()'da ProcessTable.verify ile doğrulanır, pid yeniden kullanılsa da eski
+    oyunun çıktığı görülür. Oyun bulununca on_start(entry, kaynak), oyun çıkınca on_stop(entry)
+    çağrılır. Aynı anda tek oyun izlenir.
+    poll() periyodik çağrılır (ör. 2 sn QTimer); maliyeti pid farkı + yeni süreç sayısıyla orantılıdır,
+    mevcut süreç başına sistem çağrısı yapılmaz (oyun izlenirken yalnızca onun kimlik denetimi).
+    """
+    def __init__(self, table: ProcessTable, signatures: GameSignatures | None = None,
+                 on_start=None, on_stop=None, system_monitor=None, interval: float = 2.0,
+                 heuristic: bool = False):
+        self.table = table
+        self.signatures = signatures or GameSignatures()
+        self.on_start = on_start
+        self.on_stop = on_stop
+        self._mon = system_monitor
+        self.interval = interval
+        self.heuristic = heuristic
+        self.active: ProcEntry | None = None
+        self.source = ""
+        self._lock = threading.Lock()
+        self._new: list[ProcEntry] = []
+        self._gone: set[tuple] = set()
+        self._pending: dict[tuple, _Pending] = {}
+        table.watch(self._on_diff)
+
+    def close(self):
+        self.table.unwatch(self._on_diff)
+
+    def _on_diff(self, added, removed):
+        with self._lock:
+            self._new.extend(added)
+            self._gone.update(e.key for e in removed)
+
+    @PROFILER.profiled("GameWatcher.poll")
+    def poll(self):
+        self.table.refresh(detail=False, max_age=self.interval * 0.5)
+        if self.active is not None:
+            # tablo pid yeniden kullanımını toptan denetlemez; izlenen oyunun kimliği burada
+            # doğrulanır (tek sistem çağrısı), değiştiyse "çıkan" olarak bildirilir
+            self.table.verify(self.active.pid)
+        with self._lock:
+            new, self._new = self._new, []
+            gone, self._gone = self._gone, set()
+        now = self.table.clock()
+        if self.active is not None and self.active.key in gone:
+            ended, self.active = self.active, None
+            self._pending.clear()
+            if self.on_stop:
+                self.on_stop(ended)
+        for k in gone:
+            self._pending.pop(k, None)
+        if self.active is not None:
+            return
+        for e in new:
+            src = self._match(e)
+            if src:
+                self._engage(e, src)
+                return
+            if self.heuristic and e.name.lower() not in self.signatures.exclude:
+                if len(self._pending) >= HEURISTIC_MAX_PENDING:
+                    # en eski aday düşer
+                    del self._pending[next(iter(self._pending))]
+                self._pending[e.key] = _Pending(e, now)
+        if self._pending:
+            if self.heuristic:
+                self._check_heuristic(now)
+            else:
+                # sezgisel ayarlardan kapatıldı
+                self._pending.clear()
+
+    def _match(self, e: ProcEntry) -> str | None:
+        src = self.signatures.match(e.name)
+        if src is None and e.name.lower() not in self.signatures.exclude:
+            # yol okuması yalnızca adla eşleşmeyen yeni süreçler için yapılır (önbelleğe alınır)
+            src = self.signatures.match(e.name, e.exe())
+        return src
+
+    def _engage(self, e: ProcEntry, source: str):
+        self.active = e
+        self.source = source
+        self._pending.clear()
+        if self.on_start:
+            self.on_start(e, source)
+
+    def _check_heuristic(self, now: float):
+        snap = self._mon.snapshot if self._mon else None
+        gpu = getattr(snap, "gpu_util", None) if snap is not None else None
+        for key, pend in list(self._pending.items()):
+            if now - pend.since > HEURISTIC_WINDOW_S:
+                del self._pending[key]
+                continue
+            p = pend.entry.proc
+            try:
+                ct = p.cpu_times()
+                total = ct.user + ct.system
+                rss = p.memory_info().rss
+            except Exception:
+                del self._pending[key]
+                continue
+            cpu = None
+            if pend.cpu_time is not None and now > pend.at:
+                cpu = (total - pend.cpu_time) / (now - pend.at) * 100.0
+            pend.cpu_time, pend.at = total, now
+            if cpu is None or gpu is None:
+                continue
+            if gpu >= HEURISTIC_GPU_UTIL and rss >= HEURISTIC_MIN_RSS and cpu >= HEURISTIC_MIN_CPU:
+                self._engage(pend.entry, "gpu")
+                return
+
+    def scan_running(self):
+        """Zaten çalışan bir oyunu yakalamak için tüm tabloyu bir kez imzalarla tarar."""
+        self.table.refresh(detail=False)
+        with self._lock:
+            self._new.clear()
+            self._gone.clear()
+        if self.active is not None:
+            return
+        for e in self.table.entries():
+            src = self._match(e)
+            if src:
+                self._engage(e, src)
+                return
@@ -0,0 +1,106 @@
+import threading
+import numpy as np
+
+# Varsayılan kapasite: 1 Hz'de 1 saat. Bellek kapasiteyle sabittir, oturum süresiyle büyümez.
+DEFAULT_CAPACITY = 3600
+
+class MetricHistory:
+    """
+    Sabit kapasiteli, metrik başına önceden ayrılmış NumPy kolonlarından oluşan halka tampon.
+
+    Her değer iki kez yazılır (i ve i+kapasite), böylece kapasiteye kadar her pencere
+    bellekte bitişiktir ve sorgular kopya yerine görünüm (view) döndürür. Yazma O(1)'dir.
+    Dönen görünümler sonraki yazmalarla değişebilir; saklanacaksa .copy() alınmalıdır.
+    """
+    def __init__(self, metrics, capacity: int = DEFAULT_CAPACITY):
+        if capacity <= 0:
+            raise ValueError("capacity > 0 olmalı")
+        self.capacity = int(capacity)
+        self.metrics = tuple(metrics)
+        self._index = {m: i for i, m in enumerate(self.metrics)}
+        # satır 0: zaman damgası (monotonic), sonraki satırlar metrikler
+        self._data = np.full((len(self.metrics) + 1, 2 * self.capacity), np.nan, dtype=np.float64)
+        self._head = 0      # bir sonraki yazma konumu
+        self._count = 0
+        # Kilit yalnızca (head, count) çiftini tutarlı okumak için; veri kopyalanmaz
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return self._count
+
+    def append(self, ts: float, values: dict):
+        """Bir örnek ekler. Eksik veya None metrikler NaN olarak kaydedilir."""
+        cap = self.capacity
+        h = self._head
+        col = self._data[:, h]
+        col[:] = np.nan
+        col[0] = ts
+        for name, v in values.items():
+            i = self._index.get(name)
+            if i is not None and v is not None:
+                col[i + 1] = v
+        self._data[:, h + cap] = col
+        with self._lock:
+            self._head = (h + 1) % cap
+            self._count = min(self._count + 1, cap)
+
+    def _span(self, seconds: float | None = None, n: int | None = None):
+        with self._lock:
+            head, count = self._head, self._count
+        if count == 0:
+            return 0, 0
+        # head+cap konumunda biten bitişik bölge: [end-count, end)
+        end = head + self.capacity
+        start = end - count
+        if n is not None:
+            start = max(start, end - int(n))
+        if seconds is not None:
+            ts = self._data[0, start:end]
+            cutoff = ts[-1] - float(seconds)
+            start += int(np.searchsorted(ts, cutoff, side="left"))
+        return start, end
+
+    def times(self, seconds: float | None = None, n: int | None = None) -> np.ndarray:
+        start, end = self._span(seconds, n)
+        return self._data[0, start:end]
+
+    def window(self, metric: str, seconds: float | None = None, n: int | None = None) -> np.ndarray:
+        """Son `seconds` saniyenin (veya son `n` örneğin) değerlerini görünüm olarak döndürür."""
+        row = self._index[metric] + 1
+        start, end = self._span(seconds, n)
+        return self._data[row, start:end]
+
+    def latest(self, metric: str) -> float | None:
+        w = self.window(metric, n=1)
+        if not len(w) or np.isnan(w[0]):
+            return None
+        return float(w[0])
+
+    def min(self, metric: str, seconds: float | None = None) -> float | None:
+        return self._reduce(np.nanmin, metric, seconds)
+
+    def max(self, metric: str, seconds: float | None = None) -> float | None:
+        return self._reduce(np.nanmax, metric, seconds)
+
+    def mean(self, metric: str, seconds: float | None = None) -> float | None:
+        return self._reduce(np.nanmean, metric, seconds)
+
+    def percentile(self, metric: str, q: float, seconds: float | None = None) -> float | None:
+        return self._reduce(lambda w: np.nanpercentile(w, q), metric, seconds)
+
+    def stats(self, metric: str, seconds: float | None = None) -> dict:
+        w = self.window(metric, seconds)
+        if not len(w) or np.isnan(w).all():
+            return {"count": 0, "min": None, "max": None, "mean": None}
+        return {
+            "count": int(np.count_nonzero(~np.isnan(w))),
+            "min": float(np.nanmin(w)),
+            "max": float(np.nanmax(w)),
+            "mean": float(np.nanmean(w)),
+        }
+
+    def _reduce(self, fn, metric, seconds):
+        w = self.window(metric, seconds)
+        if not len(w) or np.isnan(w).all():
+            return None
+        return float(fn(w))
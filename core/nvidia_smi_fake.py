@@ -0,0 +1,85 @@
+"""
+nvidia-smi yerine geçen sahte CSV yayıcı (GPU'suz makinede NvidiaSmiStreamProvider'ı denemek için).
+nvidia-smi bayraklarını tanır: --query-gpu, --format, --loop-ms, -i/--id; diğerleri yok sayılır.
+Her --loop-ms'de GPU başına bir `index,util,mem_used,mem_total,temp,power` satırı basar
+(--format=csv,noheader,nounits gibi: başlıksız, birimsiz).
+
+    python -m core.nvidia_smi_fake --query-gpu=index,utilization.gpu,... --loop-ms=500
+    NvidiaSmiStreamProvider(cmd=[sys.executable, "-m", "core.nvidia_smi_fake", "--loop-ms=500"]) ile de.
+
+--fake_exit_after N: N satırdan sonra çıkar (yeniden başlatma/bekleme yolunu denemek için).
+"""
+import argparse
+import random
+import sys
+import time
+
+FIELDS = ("utilization.gpu", "memory.used", "memory.total", "temperature.gpu", "power.draw")
+
+class GpuGen:
+    """Sentetik GPU örnekleri: kullanım rastgele yürüyüş, sıcaklık ve güç kullanıma bağlı."""
+    def __init__(self, index: int, seed: int = 1, mem_total_mib: float = 8192.0):
+        self.rng = random.Random(seed * 1000 + index)
+        self.index = index
+        self.mem_total = mem_total_mib
+        self.util = self.rng.uniform(20, 60)
+        self.mem = mem_total_mib * 0.3
+        self.temp = 45.0
+
+    def line(self, fields: list[str]) -> str:
+        rng = self.rng
+        self.util = min(100.0, max(0.0, self.util + rng.gauss(0, 6)))
+        self.mem = min(self.mem_total, max(256.0, self.mem + rng.gauss(0, 32)))
+        self.temp += (35.0 + 0.45 * self.util - self.temp) * 0.1
+        values = {
+            "index": str(self.index),
+            "utilization.gpu": f"{self.util:.0f}",
+            "memory.used": f"{self.mem:.0f}",
+            "memory.total": f"{self.mem_total:.0f}",
+            "temperature.gpu": f"{self.temp:.0f}",
+            "power.draw": f"{20.0 + 2.2 * self.util:.2f}",
+        }
+        return ", ".join(values.get(f, "[N/A]") for f in fields) + "\n"
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="sahte nvidia-smi CSV yayıcı")
+    ap.add_argument("--query-gpu", default="index," + ",".join(FIELDS))
+    ap.add_argument("--format", default="csv,noheader,nounits")
+    ap.add_argument("--loop-ms", type=int, default=0, help="0 = tek örnek basıp çık")
+    ap.add_argument("-i", "--id", type=int, default=None, help="yalnızca bu GPU'nun satırları")
+    ap.add_argument("--fake_gpus", type=int, default=1)
+    ap.add_argument("--fake_seconds", type=float, default=0.0, help="0 = durdurulana kadar")
+    ap.add_argument("--fake_exit_after", type=int, default=0)
+    ap.add_argument("--fake_seed", type=int, default=1)
+    args, _ = ap.parse_known_args(argv)
+
+    fields = [f.strip() for f in args.query_gpu.split(",") if f.strip()]
+    gens = [GpuGen(i, args.fake_seed) for i in range(max(1, args.fake_gpus))]
+    if args.id is not None:
+        if not 0 <= args.id < len(gens):
+            print(f"No devices were found (-i {args.id})", file=sys.stderr)
+            return 6
+        gens = [gens[args.id]]
+    out = sys.stdout
+    end = time.perf_counter() + args.fake_seconds if args.fake_seconds > 0 else None
+    lines = 0
+    try:
+        if "noheader" not in args.format:
+            out.write(", ".join(fields) + "\n")
+        next_t = time.perf_counter()
+        while True:
+            out.write("".join(g.line(fields) for g in gens))
+            out.flush()
+            lines += 1
+            if args.loop_ms <= 0 or (args.fake_exit_after and lines >= args.fake_exit_after):
+                break
+            if end is not None and time.perf_counter() >= end:
+                break
+            next_t += args.loop_ms / 1000.0
+            time.sleep(max(0.0, next_t - time.perf_counter()))
+    except (BrokenPipeError, KeyboardInterrupt):
+        pass
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,230 @@
+import json
+import os
+import queue
+import threading
+import time
+
+import psutil
+
+from core.settings import CONFIG_DIR
+
+JOURNAL_PATH = os.path.join(CONFIG_DIR, "perf_journal.jsonl")
+# yazıcı en fazla bu aralıkla diske yazar ve fsync eder
+FLUSH_INTERVAL_S = 0.5
+# süreç başına geri yüklenebilen işlemler (orig: değişiklikten önceki değer)
+RESTORABLE_OPS = ("suspend", "priority", "affinity", "ionice", "throttle")
+
+# record(wait=True)/sync() en fazla bu kadar bekler
+SYNC_TIMEOUT_S = 2.0
+
+_END = object()
+
+class Barrier:
+    """
+    Yazıcı kendisinden önceki kayıtları fsync edince `ok` ile işaretlenip `done` kurulur.
+    Yazım başarısızsa `done` kurulur, `ok` False kalır. durable=True ile tamamlanmış oluşturulur.
+    """
+    __slots__ = ("done", "ok")
+
+    def __init__(self, durable: bool = False):
+        self.done = threading.Event()
+        self.ok = durable
+        if durable:
+            self.done.set()
+
+class PerfJournal:
+    """
+    Performans modunun süreçlere yaptığı değişikliklerin (askıya alma, öncelik, affinity, G/Ç
+    önceliği, cgroup kısma) yalnızca eklemeli disk günlüğü. Her satır bir JSON kaydıdır:
+        {"op": "priority", "pid": 1234, "ct": 1700000000.12, "orig": 32}
+    Kimlik (pid, create_time) çiftidir; pid yeniden kullanılmışsa kayıt yok sayılır.
+
+    record() kuyruğa ekler; yazma, toplu fsync ve dosya yönetimi ayrı bir iş parçacığında yapılır.
+    Süreci değiştiren işlemler önce kaydedilir, sonra sync() (ya da record(wait=True)) o ana kadarki
+    kayıtlar fsync edilene kadar bekler; değişiklik ancak True dönerse uygulanır. Beklemek
+    istemeyen (ör. Qt ana iş parçacığı) barrier() alır ve değişikliği bariyer `ok` ile
+    tamamlandığında uygular. Bekleyen bariyer varken yazıcı biriktirmeyi keser ve hemen yazar. Oturum temiz kapanınca end() günlüğü boşaltır.
+    Uygulama çöker ya da öldürülürse bir sonraki açılışta replay() hâlâ çalışan süreçleri geri yükler.
+    """
+    def __init__(self, path: str = JOURNAL_PATH, flush_interval: float = FLUSH_INTERVAL_S):
+        self.path = path
+        self.flush_interval = flush_interval
+        self._q: queue.SimpleQueue = queue.SimpleQueue()
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+        self._idle = threading.Event()
+        self._idle.set()
+        self._pending = 0
+        self.writes = 0
+        self.fsyncs = 0
+
+    def record(self, op: str, pid: int, create_time: float, orig=None, wait: bool = False,
+               timeout: float = SYNC_TIMEOUT_S) -> bool:
+        """wait=True ise kayıt diske fsync edilene kadar bekler; başarıyı döndürür."""
+        self._put({"op": op, "pid": pid, "ct": create_time, "orig": orig})
+        return self.sync(timeout) if wait else True
+
+    def sync(self, timeout: float = SYNC_TIMEOUT_S) -> bool:
+        """Şimdiye kadarki kayıtlar fsync edilene kadar bekler; yazılamadıysa ya da süre dolduysa False."""
+        b = self.barrier()
+        return b.done.wait(timeout) and b.ok
+
+    def barrier(self) -> Barrier:
+        """Şimdiye kadarki kayıtlar için beklemeden bir bariyer döndürür (bkz. Barrier)."""
+        b = Barrier()
+        self._put(b)
+        return b
+
+    def _put(self, item):
+        with self._lock:
+            self._pending += 1
+            self._idle.clear()
+            self._q.put(item)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._writer, name="PerfJournal", daemon=True)
+                self._thread.start()
+
+    def end(self, timeout: float = 1.0):
+        """Oturum bitti, her şey geri yüklendi: günlüğü boşalt (yazıcının bitirmesi beklenir)."""
+        if self._thread is None and not os.path.exists(self.path):
+            return
+        self._put(_END)
+        self._idle.wait(timeout)
+
+    def flush(self, timeout: float = 1.0) -> bool:
+        """Kuyruktaki kayıtlar diske yazılana kadar bekler."""
+        return self._idle.wait(timeout)
+
+    def _writer(self):
+        f = None
+        batch = []
+        try:
+            while True:
+                try:
+                    item = self._q.get(timeout=30.0)
+                except queue.Empty:
+                    # boşta: iş parçacığı kapanır, bir sonraki kayıt yenisini başlatır
+                    with self._lock:
+                        if self._q.empty():
+                            self._thread = None
+                            return
+                    continue
+                # toplu yazım: ilk kayıttan sonra flush_interval kadar biriktir, sonra tek fsync;
+                # bekleyen biri varsa (bariyer) hemen yazılır
+                batch = [item]
+                t_end = time.monotonic() + self.flush_interval
+                while item is not _END and not isinstance(item, Barrier):
+                    left = t_end - time.monotonic()
+                    if left <= 0:
+                        break
+                    try:
+                        item = self._q.get(timeout=left)
+                    except queue.Empty:
+                        break
+                    batch.append(item)
+                barriers = []
+                for item in batch:
+                    if isinstance(item, Barrier):
+                        barriers.append(item)
+                        continue
+                    if item is _END:
+                        if f is not None:
+                            f.close()
+                            f = None
+                        self._truncate()
+                        continue
+                    if f is None:
+                        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                        f = open(self.path, "a", encoding="utf-8")
+                    f.write(json.dumps(item, separators=(",", ":")) + "\n")
+                    self.writes += 1
+                if f is not None:
+                    f.flush()
+                    os.fsync(f.fileno())
+                    self.fsyncs += 1
+                for b in barriers:
+                    b.ok = True
+                    b.done.set()
+                self._done(len(batch))
+        except Exception as e:
+            print("Performans günlüğü yazılamadı:", e)
+            # bekleyenler başarısızlıkla uyandırılır; değişiklikleri uygulamazlar
+            for item in batch:
+                if isinstance(item, Barrier):
+                    item.done.set()
+            with self._lock:
+                self._thread = None
+                self._pending = 0
+                self._idle.set()
+        finally:
+            if f is not None:
+                f.close()
+
+    def _done(self, n: int):
+        with self._lock:
+            self._pending -= n
+            if self._pending <= 0:
+                self._pending = 0
+                self._idle.set()
+
+    def _truncate(self):
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+    def pending(self) -> dict[tuple, dict]:
+        """Günlükteki geri yüklenmemiş değişiklikler: (pid, ct) -> {op: ilk kaydedilen orig}."""
+        state: dict[tuple, dict] = {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        rec = json.loads(line)
+                    except ValueError:
+                        # çökme anında yarım kalmış son satır
+                        continue
+                    op = rec.get("op")
+                    if op not in RESTORABLE_OPS:
+                        continue
+                    # ilk değişiklikten önceki değer asıl özgün değerdir
+                    state.setdefault((rec["pid"], rec["ct"]), {}).setdefault(op, rec.get("orig"))
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print("Performans günlüğü okunamadı:", e)
+        return state
+
+    def replay(self, provider=psutil, throttler=None) -> int:
+        """
+        Önceki (temiz kapanmamış) oturumun değişikliklerini hâlâ çalışan süreçlerde geri alır.
+        "throttle" kayıtları (orig = özgün cgroup yolu) yalnızca throttler verilmişse geri taşınır.
+        Geri yüklenen süreç sayısını döndürür; ardından günlük boşaltılır.
+        """
+        restored = 0
+        for (pid, ct), ops in self.pending().items():
+            try:
+                p = provider.Process(pid)
+                if abs(p.create_time() - ct) > 0.01:
+                    continue
+            except Exception:
+                continue
+            ok = False
+            for op, orig in ops.items():
+                try:
+                    if op == "suspend":
+                        p.resume()
+                    elif op == "priority" and orig is not None:
+                        p.nice(orig)
+                    elif op == "affinity" and orig:
+                        p.cpu_affinity(orig)
+                    elif op == "ionice" and orig is not None:
+                        p.ionice(*orig) if isinstance(orig, list) else p.ionice(orig)
+                    elif op == "throttle" and orig and throttler is not None:
+                        throttler.move_back(pid, orig)
+                    ok = True
+                except Exception:
+                    continue
+            restored += ok
+        self._truncate()
+        return restored
@@ -1,5 +1,4 @@
 import threading
-import time
 import subprocess
 import shutil
 
@@ -20,32 +19,52 @@ def get_active_power_plan_guid() -> str | None:
     return None
 
 class AutoPowerPlanManager:
-    def __init__(self, system_monitor, cpu_th=40, gpu_th=30, poll_interval=3.0):
+    def __init__(self, system_monitor, cpu_th=40, gpu_th=30, poll_interval=3.0, core_th=90):
         self.system_monitor = system_monitor
         self.cpu_th = cpu_th
         self.gpu_th = gpu_th
+        self.core_th = core_th
         self.poll_interval = poll_interval
         self._running = False
         self._thread = None
         self._last_state_high = False
+        self._token = None
+        self._pending = None
+        self._wake = threading.Event()
 
     def start(self):
         self._running = True
+        # Yoklama yerine SystemMonitor yayınlarına abone ol; powercfg çağrısı kendi thread'inde kalır
+        self._token = self.system_monitor.subscribe(self._on_snapshot, self.poll_interval)
         self._thread = threading.Thread(target=self._run, daemon=True)
         self._thread.start()
 
     def stop(self):
         self._running = False
+        if self._token is not None:
+            self.system_monitor.unsubscribe(self._token)
+            self._token = None
+        self._wake.set()
         if self._thread:
             self._thread.join(timeout=2)
 
+    def _on_snapshot(self, s):
+        self._pending = s
+        self._wake.set()
+
     def _run(self):
         while self._running:
-            s = self.system_monitor.get()
+            self._wake.wait()
+            self._wake.clear()
+            s, self._pending = self._pending, None
+            if s is None:
+                continue
             cpu = s.cpu_percent or 0
             gpu = s.gpu_util or 0
+            # ana thread'e bağlı oyunlar tek çekirdeği doyururken ortalama düşük kalabilir
+            hot = s.cpu_hot_core_percent or 0
             try:
-                if cpu >= self.cpu_th or gpu >= self.gpu_th:
+                if cpu >= self.cpu_th or gpu >= self.gpu_th or hot >= self.core_th:
                     if not self._last_state_high:
                         set_power_plan(GUID_HIGH_PERFORMANCE)
                         self._last_state_high = True
@@ -54,5 +73,4 @@ class AutoPowerPlanManager:
                         set_power_plan(GUID_BALANCED)
                         self._last_state_high = False
             except Exception as e:
-                print("AutoPowerPlan error:", e)
-            time.sleep(self.poll_interval)
\ No newline at end of file
+                print("AutoPowerPlan error:", e)
\ No newline at end of file
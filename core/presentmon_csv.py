@@ -0,0 +1,151 @@
+import os
+
+# Sütun adı (küçük harf) -> alan; PresentMon 1.x ve 2.x adları
+COLUMN_ALIASES = {
+    "application": "app",
+    "processid": "pid",
+    "swapchainaddress": "swapchain",
+    "msbetweenpresents": "ms",
+    "timeinseconds": "t_s",
+    "timeinms": "t_ms",
+    "cpustarttime": "t_ms",
+}
+REQUIRED = ("ms",)
+# tek okumada en fazla bu kadar bayt işlenir (büyük birikmelerde bellek sınırlı kalır)
+MAX_READ_BYTES = 4 << 20
+
+class PresentMonCsvReader:
+    """
+    PresentMon CSV'sini kalıcı bir tanıtıcıyla artımlı okur. Sütunlar başlık satırından ada göre
+    eşlenir (başlık dosyanın ortasında yeniden görünürse yeniden eşlenir), satır sınırında kalan
+    yarım satır bir sonraki okumaya taşınır ve yalnızca yeni baytlar toplu olarak ayrıştırılır.
+    Dosya kısalırsa (yeniden oluşturma/döndürme) baştan okunur. Boru modunda path=None verilir ve
+    baytlar feed() ile beslenir.
+
+    read() yeni kareleri (pid, swapchain, zaman_sn, ms_between_presents) demetleri olarak döndürür.
+    Zaman sütunu yoksa zaman, ms değerlerinin kümülatif toplamından türetilir.
+    """
+    def __init__(self, path: str | None = None):
+        self.path = path
+        self._f = None
+        self._pos = 0
+        self._carry = b""
+        self._cols: dict[str, int] | None = None
+        self._need = 0
+        self._t_scale = 1.0
+        self._t_idx = None
+        self._synthetic_t = 0.0
+        self.rows = 0
+        self.bad_rows = 0
+        self.bytes_read = 0
+
+    def close(self):
+        if self._f is not None:
+            try:
+                self._f.close()
+            except Exception:
+                pass
+            self._f = None
+
+    def _open(self) -> bool:
+        if self._f is not None:
+            return True
+        if not self.path:
+            return False
+        try:
+            self._f = open(self.path, "rb")
+        except OSError:
+            return False
+        self._pos = 0
+        self._carry = b""
+        self._cols = None
+        return True
+
+    def _set_header(self, line: bytes):
+        names = [c.strip().strip('"').lower() for c in line.decode("utf-8", "replace").split(",")]
+        cols = {}
+        for i, n in enumerate(names):
+            field = COLUMN_ALIASES.get(n)
+            if field and field not in cols:
+                cols[field] = i
+        if not all(k in cols for k in REQUIRED):
+            return
+        self._cols = cols
+        if "t_s" in cols:
+            self._t_idx, self._t_scale = cols["t_s"], 1.0
+        elif "t_ms" in cols:
+            self._t_idx, self._t_scale = cols["t_ms"], 0.001
+        else:
+            self._t_idx = None
+        self._need = max(cols.values()) + 1
+
+    @staticmethod
+    def _is_header(line: bytes) -> bool:
+        return line.startswith((b"Application", b'"Application'))
+
+    def read(self) -> list[tuple]:
+        if not self._open():
+            return []
+        f = self._f
+        try:
+            size = os.fstat(f.fileno()).st_size
+        except OSError:
+            return []
+        if size < self._pos:
+            # dosya kısaldı: yeniden başla
+            f.seek(0)
+            self._pos = 0
+            self._carry = b""
+            self._cols = None
+        if size == self._pos:
+            return []
+        chunk = f.read(min(size - self._pos, MAX_READ_BYTES))
+        self._pos += len(chunk)
+        return self.feed(chunk)
+
+    def feed(self, chunk: bytes) -> list[tuple]:
+        """Dosyasız kullanım (ör. PresentMon stdout borusu): gelen baytları ayrıştırır."""
+        self.bytes_read += len(chunk)
+        data = self._carry + chunk if self._carry else chunk
+        end = data.rfind(b"\n")
+        if end < 0:
+            self._carry = data
+            return []
+        self._carry = data[end + 1:]
+        return self._parse(data[:end].split(b"\n"))
+
+    def _parse(self, lines: list[bytes]) -> list[tuple]:
+        out = []
+        append = out.append
+        is_header = self._is_header
+        cols = self._cols
+        if cols is not None:
+            ms_i, pid_i, sc_i, t_i = cols["ms"], cols.get("pid"), cols.get("swapchain"), self._t_idx
+            need, scale = self._need, self._t_scale
+        for line in lines:
+            if not line or line == b"\r":
+                continue
+            if is_header(line):
+                self._set_header(line.rstrip(b"\r"))
+                cols = self._cols
+                if cols is not None:
+                    ms_i, pid_i, sc_i, t_i = cols["ms"], cols.get("pid"), cols.get("swapchain"), self._t_idx
+                    need, scale = self._need, self._t_scale
+                continue
+            if cols is None:
+                continue
+            parts = line.split(b",", need)
+            try:
+                ms = float(parts[ms_i])
+                pid = int(parts[pid_i]) if pid_i is not None else 0
+                t = float(parts[t_i]) * scale if t_i is not None else None
+                swap = parts[sc_i].decode("ascii", "replace") if sc_i is not None else ""
+            except (ValueError, IndexError):
+                self.bad_rows += 1
+                continue
+            if t is None:
+                self._synthetic_t += ms / 1000.0
+                t = self._synthetic_t
+            append((pid, swap, t, ms))
+        self.rows += len(out)
+        return out
@@ -0,0 +1,84 @@
+"""
+PresentMon yerine geçen sahte CSV yayıcı (Linux'ta boru/dosya modlarını denemek için).
+PresentMon bayraklarını tanır: -output_stdout, -output_file <yol>; diğerleri yok sayılır.
+
+    python -m core.presentmon_fake -output_stdout -fake_fps 1000 -fake_seconds 5
+    PresentMonMonitor(__file__, launcher=[sys.executable]) ile de çalıştırılabilir.
+
+-fake_no_stdout: stdout desteği olmayan eski sürüm gibi davranır (-output_stdout ile hata verip çıkar).
+"""
+import argparse
+import random
+import sys
+import time
+
+HEADER = ("Application,ProcessID,SwapChainAddress,Runtime,SyncInterval,PresentFlags,AllowsTearing,"
+          "PresentMode,WasBatched,DwmNotified,Dropped,TimeInSeconds,msInPresentAPI,msBetweenPresents,"
+          "msUntilRenderComplete,msUntilDisplayed\n")
+
+class RowGen:
+    """Sentetik kare satırları: ~145 FPS etrafında gürültü ve seyrek takılmalar."""
+    def __init__(self, seed: int = 1, mean_ms: float = 6.9, app: str = "game.exe", pid: int = 4242):
+        self.rng = random.Random(seed)
+        self.mean_ms = mean_ms
+        self.app = app
+        self.pid = pid
+        self.t = 0.0
+
+    def lines(self, n: int) -> str:
+        rng = self.rng
+        out = []
+        for _ in range(n):
+            ms = max(0.2, rng.gauss(self.mean_ms, 0.8)) if rng.random() > 0.002 else rng.uniform(20, 60)
+            self.t += ms / 1000.0
+            out.append(
+                f"{self.app},{self.pid},0x000001D5A3C1F0E0,DXGI,0,512,1,Hardware: Independent Flip,0,0,0,"
+                f"{self.t:.6f},{rng.uniform(0.05, 0.4):.4f},{ms:.4f},{ms * 0.8:.4f},{ms * 1.6:.4f}\n"
+            )
+        return "".join(out)
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="sahte PresentMon CSV yayıcı")
+    ap.add_argument("-output_stdout", action="store_true")
+    ap.add_argument("-output_file")
+    ap.add_argument("-process_name", default="game.exe")
+    ap.add_argument("-process_id", type=int, default=4242)
+    ap.add_argument("-fake_fps", type=float, default=144.0)
+    ap.add_argument("-fake_seconds", type=float, default=0.0, help="0 = durdurulana kadar")
+    ap.add_argument("-fake_no_stdout", action="store_true")
+    ap.add_argument("-fake_seed", type=int, default=1)
+    args, _ = ap.parse_known_args(argv)
+
+    if args.output_stdout and args.fake_no_stdout:
+        print("error: unrecognized option -output_stdout", file=sys.stderr)
+        return 1
+    if args.output_stdout:
+        out = sys.stdout
+    elif args.output_file:
+        out = open(args.output_file, "w", encoding="utf-8", newline="")
+    else:
+        print("error: no output", file=sys.stderr)
+        return 1
+
+    gen = RowGen(args.fake_seed, 1000.0 / max(1.0, args.fake_fps), args.process_name, args.process_id)
+    per_batch = max(1, int(args.fake_fps * 0.01))
+    end = time.perf_counter() + args.fake_seconds if args.fake_seconds > 0 else None
+    try:
+        out.write(HEADER)
+        next_t = time.perf_counter()
+        while end is None or time.perf_counter() < end:
+            out.write(gen.lines(per_batch))
+            out.flush()
+            next_t += 0.01
+            time.sleep(max(0.0, next_t - time.perf_counter()))
+    except (BrokenPipeError, KeyboardInterrupt):
+        pass
+    finally:
+        try:
+            out.close()
+        except Exception:
+            pass
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
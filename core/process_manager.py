@@ -1,77 +1,546 @@
 import psutil
+import socket
 import time
 from dataclasses import dataclass
 from typing import Optional
 
+from core.profiler import PROFILER
+from core.process_table import ProcessTable
+from core.process_rules import RuleEngine, PRIORITIES
+from core.cpu_topology import CpuTopology, AffinityPlan, plan_affinity
+from core.perf_journal import PerfJournal, Barrier
+
 HIGH = psutil.HIGH_PRIORITY_CLASS if hasattr(psutil, "HIGH_PRIORITY_CLASS") else None
 ABOVE = psutil.ABOVE_NORMAL_PRIORITY_CLASS if hasattr(psutil, "ABOVE_NORMAL_PRIORITY_CLASS") else None
 NORMAL = psutil.NORMAL_PRIORITY_CLASS if hasattr(psutil, "NORMAL_PRIORITY_CLASS") else None
 
+# Windows G/Ç öncelikleri; POSIX'te (ioclass, değer)
+if hasattr(psutil, "IOPRIO_VERYLOW"):
+    IO_PRIORITIES = {
+        "very_low": psutil.IOPRIO_VERYLOW,
+        "low": psutil.IOPRIO_LOW,
+        "normal": psutil.IOPRIO_NORMAL,
+        "high": psutil.IOPRIO_HIGH,
+    }
+elif hasattr(psutil, "IOPRIO_CLASS_IDLE"):
+    IO_PRIORITIES = {
+        "very_low": (psutil.IOPRIO_CLASS_IDLE, 0),
+        "low": (psutil.IOPRIO_CLASS_BE, 7),
+        "normal": (psutil.IOPRIO_CLASS_BE, 4),
+        "high": (psutil.IOPRIO_CLASS_BE, 0),
+    }
+else:
+    IO_PRIORITIES = {}
+
+# servis/sistem hesapları (küçük harf); bu süreçler çekirdek planıyla sabitlenmez
+SYSTEM_USERS = {
+    "nt authority\\system", "nt authority\\local service", "nt authority\\network service",
+    "system", "local service", "network service", "root",
+}
+
 @dataclass
 class PerfSession:
     target_pid: Optional[int] = None
     suspended_pids: set[int] = None
+    # askıya almak yerine cgroup ile kısılan boşta süreçler
+    throttled_pids: set[int] = None
+    # kural eylemleri uygulanmış süreçler (pid, create_time) ve geri yükleme için özgün değerler
+    applied: set[tuple] = None
+    originals: dict[int, dict] = None
 
     def __post_init__(self):
         if self.suspended_pids is None:
             self.suspended_pids = set()
+        if self.throttled_pids is None:
+            self.throttled_pids = set()
+        if self.applied is None:
+            self.applied = set()
+        if self.originals is None:
+            self.originals = {}
+
+class _Deferred:
+    """Bir maintain() geçişinde günlüğe eklenen değişiklikler; bariyer fsync'i bildirince uygulanır."""
+    __slots__ = ("barrier", "target", "staged", "throttle", "suspend", "added")
+
+    def __init__(self):
+        self.barrier: Barrier | None = None
+        # hedef sürece (Process, eylem, değer)
+        self.target = []
+        # kural eylemleri: (giriş, [(eylem, değer)])
+        self.staged = []
+        # boşta kısılacak girişler; askıya alınacak (giriş, boşta adayı mı)
+        self.throttle = []
+        self.suspend = []
+        # bu partide saklanan özgün değerler (pid, anahtar); yazım başarısızsa geri alınır
+        self.added = []
+
+    def __bool__(self):
+        return bool(self.target or self.staged or self.throttle or self.suspend)
 
 class PerformanceMode:
     """
-    Hedef oyun sürecinin önceliğini yükseltir; beyaz liste dışı ve boşta süreçleri askıya alır, çıkışta geri yükler.
+    Hedef oyun sürecinin önceliğini yükseltir; diğer süreçlere kural motorunun (core.process_rules)
+    kararlarını uygular ve çıkışta her şeyi geri yükler.
+    Kural "suspend": "idle" (varsayılan) ise süreç ancak `idle_window` saniye boyunca kesintisiz boşta
+    kalırsa (CPU <= eşik, disk G/Ç yok, çalışır durumda) askıya alınır. Hedefin üst/alt süreçleri ve
+    ağ bağlantısı açık süreçler korunur. `throttler` (ör. core.cgroup_throttle.CgroupThrottler) ve
+    `throttle_percent` verilirse boşta süreçler dondurulmak yerine bu CPU payıyla sınırlanır.
+    `journal` verilirse her değişiklik (hedefin önceliği dahil) önce günlüğe yazılır; süreçlere
+    ancak kayıtlar fsync edildikten sonra dokunulur. Çağıran (Qt ana iş parçacığı) beklemez: geçişin
+    değişiklikleri günlük bariyeriyle birlikte bekletilir ve bariyer tamamlandıktan sonraki ilk
+    maintain() geçişinde uygulanır; yazım başarısızsa bırakılır ve sonraki geçişte yeniden denenir.
     """
-    def __init__(self, whitelist: list[str], suspend_cpu_threshold: float = 1.0):
+    def __init__(self, whitelist: list[str], suspend_cpu_threshold: float = 1.0, system_monitor=None,
+                 process_table: ProcessTable | None = None, idle_window: float = 30.0,
+                 rules: list[dict] | None = None, affinity_planner: bool = False,
+                 topology: CpuTopology | None = None, journal: PerfJournal | None = None,
+                 throttler=None, throttle_percent: float | None = None):
         self.whitelist = set(x.lower() for x in whitelist)
+        self.rules = RuleEngine(rules, list(self.whitelist))
+        # "throttle" eylemini uygulayan nesne (throttle(proc, yüzde) / release(pid)); yoksa
+        # en düşük CPU ve G/Ç önceliğine düşülür
+        self.throttler = throttler
+        self.throttle_percent = throttle_percent
+        # çökmeye dayanıklı değişiklik günlüğü; bir sonraki açılışta recover() ile geri alınır
+        self.journal = journal
+        # paylaşılan süreç tablosu (MainWindow ile ortak); CPU farkları buradan okunur
+        self.table = process_table if process_table is not None else ProcessTable()
         self.suspend_cpu_threshold = suspend_cpu_threshold
+        self.idle_window = idle_window
         self.session = PerfSession()
+        # (pid, create_time) -> kesintisiz boşta kalmaya başladığı an (table.clock)
+        self._idle_since: dict[tuple, float] = {}
+        # hedef varken SystemMonitor yüksek çözünürlükte örnekler
+        self._mon = system_monitor
+        # çekirdek planlayıcı: hedefe en iyi çekirdek grubu, diğer süreçlere kalanlar
+        self.affinity_planner = affinity_planner
+        self._topology = topology
+        self.plan: AffinityPlan | None = None
+        # günlük fsync'i beklenen partiler (sırayla) ve içlerindeki girişlerin kimlikleri
+        self._deferred: list[_Deferred] = []
+        self._inflight: set[tuple] = set()
+        # hedef (Process, create_time); öncelik/sabitleme henüz günlüğe eklenmediyse _target_todo
+        self._target = None
+        self._target_todo = False
 
     def start_for_process(self, pid: int):
         self.session = PerfSession(target_pid=pid, suspended_pids=set())
-        # hedef önceliği
+        self._idle_since.clear()
+        self._deferred.clear()
+        self._inflight.clear()
+        self.plan = None
+        self._target = None
+        if self._mon:
+            self._mon.request_high_resolution("performance")
         try:
-            p = psutil.Process(pid)
-            if HIGH:
-                p.nice(HIGH)
-            elif ABOVE:
-                p.nice(ABOVE)
+            p = self.table.provider.Process(pid)
+            ct = p.create_time()
         except Exception:
-            pass
+            return
+        self._target = (p, ct)
+        batch = _Deferred()
+        self._stage_target(batch)
+        # günlük bariyeri beklenmez; değişiklik fsync'ten sonra ilk maintain() geçişinde uygulanır
+        # (günlük yoksa hemen)
+        self._submit(batch)
+        self._apply_durable(set())
 
-    def maintain(self):
+    def _stage_target(self, batch: _Deferred):
         """
-        Periyodik çağır: askıya alınacak süreçleri seç.
+        Hedef önceliğini ve çekirdek sabitlemesini hazırlar (özgün değerler günlüğe eklenir,
+        stop() ile geri alınır). Yükseltme reddedilse de (ör. yetki yok) çekirdek planı uygulanır.
         """
-        if not self.session.target_pid:
+        p, ct = self._target
+        pid = self.session.target_pid
+        orig = self.session.originals.setdefault(pid, {"proc": p})
+        self._target_todo = False
+        prio = HIGH or ABOVE
+        if prio:
+            try:
+                self._remember(pid, ct, orig, "nice", p.nice(), batch)
+                batch.target.append((p, "nice", prio))
+            except Exception as e:
+                print(f"Hedef önceliği yükseltilemedi (PID {pid}):", e)
+        if not self.affinity_planner:
+            return
+        if self._topology is None:
+            self._topology = CpuTopology.read()
+        plan = plan_affinity(self._topology)
+        if not plan:
+            print("Çekirdek planı uygulanmadı:", plan.reason)
             return
         try:
-            target = psutil.Process(self.session.target_pid)
-            target_name = target.name().lower()
-        except Exception:
+            self._remember(pid, ct, orig, "affinity", p.cpu_affinity(), batch)
+        except Exception as e:
+            print(f"Hedef çekirdeklere sabitlenemedi (PID {pid}):", e)
             return
-        for p in psutil.process_iter(["pid", "name", "cpu_percent", "status"]):
+        batch.target.append((p, "affinity", plan.game))
+        # arka plan süreçleri planla hazırlanır; hedef sabitlenemezse plan geri çekilir
+        self.plan = plan
+
+    def set_rules(self, rules: list[dict], whitelist: list[str] | None = None):
+        """Kuralları yeniden derler; uygulanmış eylemler geri alınır ve yeni kurallarla yeniden uygulanır."""
+        if whitelist is not None:
+            self.whitelist = set(x.lower() for x in whitelist)
+        self.rules.compile(rules or [], list(self.whitelist))
+        # eski kurallarla hazırlanıp fsync bekleyen değişiklikler uygulanmaz (hedefinkiler kalır)
+        for batch in self._deferred:
+            batch.staged.clear()
+            batch.throttle.clear()
+            batch.suspend.clear()
+        self._inflight.clear()
+        self._restore_applied(keep=self.session.target_pid)
+
+    def _stage(self, e, d, batch: _Deferred) -> list[tuple]:
+        """
+        Kararın öncelik/affinity/G/Ç/throttle eylemlerini hazırlar: özgün değerleri okur, saklar ve
+        günlüğe ekler (beklemeden). Uygulanacak (eylem, değer) listesini döndürür; _act() bunları
+        günlük diske yazıldıktan sonra uygular.
+        """
+        affinity = d.affinity
+        from_plan = affinity is None and self.plan and self._plan_eligible(e, d)
+        if from_plan:
+            affinity = self.plan.background
+        if d.priority is None and affinity is None and d.io_priority is None and d.throttle is None:
+            return []
+        p = e.proc
+        orig = self.session.originals.setdefault(e.pid, {"proc": p})
+        prio, io = d.priority, d.io_priority
+        acts = []
+        if d.throttle is not None:
+            if self.throttler is not None:
+                if self._stage_throttle(e, orig, batch):
+                    acts.append(("throttle", d.throttle))
+            else:
+                prio = PRIORITIES["idle"] if prio is None else prio
+                io = io or "very_low"
+        if prio is not None:
+            try:
+                self._remember(e.pid, e.create_time, orig, "nice", p.nice(), batch)
+                acts.append(("nice", prio))
+            except Exception:
+                pass
+        if affinity is not None:
             try:
-                if p.info["pid"] in (0, 4, self.session.target_pid):
-                    continue
-                name = (p.info["name"] or "").lower()
-                if name in self.whitelist:
-                    continue
-                if "system" in name or "svchost.exe" in name:
-                    continue
-                # düşük cpu ve arka plan
-                cpu = p.cpu_percent(interval=0.0)
-                if cpu <= self.suspend_cpu_threshold and p.status() == psutil.STATUS_RUNNING:
-                    # askıya al
-                    p.suspend()
-                    self.session.suspended_pids.add(p.pid)
+                cpus = [c for c in affinity if c < (psutil.cpu_count() or 1)] if d.affinity else affinity
+                if cpus:
+                    self._remember(e.pid, e.create_time, orig, "affinity", p.cpu_affinity(), batch)
+                    # plandan gelen sabitleme, hedef sabitlenemezse uygulanmaz
+                    acts.append(("plan" if from_plan else "affinity", cpus))
             except Exception:
+                pass
+        if io is not None and io in IO_PRIORITIES:
+            try:
+                self._remember(e.pid, e.create_time, orig, "ionice", p.ionice(), batch)
+                acts.append(("ionice", IO_PRIORITIES[io]))
+            except Exception:
+                pass
+        return acts
+
+    def _act(self, e, acts: list[tuple]):
+        p = e.proc
+        for kind, val in acts:
+            try:
+                if kind == "nice":
+                    p.nice(val)
+                elif kind == "affinity" or (kind == "plan" and self.plan is not None):
+                    p.cpu_affinity(val)
+                elif kind == "ionice":
+                    p.ionice(*val) if isinstance(val, tuple) else p.ionice(val)
+                elif kind == "throttle":
+                    self._throttle(e, val)
+            except Exception:
+                pass
+
+    def _plan_eligible(self, e, d) -> bool:
+        """
+        Çekirdek planının arka plan çekirdeklerine yalnızca sıradan kullanıcı süreçleri taşınır:
+        kuralla korunanlar ("suspend": "never", beyaz liste dahil) ve sistem hesaplarının
+        süreçleri (servisler) dokunulmadan kalır; tek çekirdeğe sıkıştırılmaları sistemi kilitler.
+        """
+        if d.suspend == "never":
+            return False
+        # sahibi okunamayan süreç (çoğunlukla başka hesabın servisi) de dokunulmadan kalır
+        user = e.username().lower()
+        return bool(user) and user not in SYSTEM_USERS
+
+    def _stage_throttle(self, e, orig: dict, batch: _Deferred) -> bool:
+        """Özgün cgroup yolunu taşımadan önce okur ve günlüğe ekler."""
+        if orig.get("throttle"):
+            return True
+        try:
+            cg = self.throttler.current_cgroup(e.pid)
+        except Exception as ex:
+            print(f"Throttle uygulanamadı (PID {e.pid}):", ex)
+            return False
+        orig["throttle"] = True
+        batch.added.append((e.pid, "throttle"))
+        self._journal("throttle", e.pid, e.create_time, cg)
+        return True
+
+    def _throttle(self, e, percent: float) -> bool:
+        try:
+            self.throttler.throttle(e.proc, percent)
+        except Exception as ex:
+            print(f"Throttle uygulanamadı (PID {e.pid}):", ex)
+            return False
+        return True
+
+    def _journal(self, op: str, pid: int, create_time: float, value=None):
+        if self.journal is not None:
+            self.journal.record(op, pid, create_time, value)
+
+    def _submit(self, batch: _Deferred):
+        """Partiyi günlük bariyeriyle bekletir; günlük yoksa hemen uygulanabilir."""
+        if not batch:
+            return
+        batch.barrier = self.journal.barrier() if self.journal is not None else Barrier(durable=True)
+        self._deferred.append(batch)
+
+    def _apply_durable(self, protected: set[int]):
+        """Günlüğü fsync edilmiş partileri sırayla uygular; yazılamayanları geri alır (yeniden denenir)."""
+        while self._deferred and self._deferred[0].barrier.done.is_set():
+            batch = self._deferred.pop(0)
+            if batch.barrier.ok:
+                self._apply(batch, protected)
+                continue
+            print("Performans günlüğü diske yazılamadı; süreç değişiklikleri uygulanmadı")
+            originals = self.session.originals
+            for pid, key in batch.added:
+                originals.get(pid, {}).pop(key, None)
+            for e, _ in batch.staged:
+                self._inflight.discard(e.key)
+            for e in batch.throttle:
+                self._inflight.discard(e.key)
+            for e, _ in batch.suspend:
+                self._inflight.discard(e.key)
+            if batch.target:
+                self._target_todo = True
+
+    def _apply(self, batch: _Deferred, protected: set[int]):
+        s = self.session
+        table = self.table
+        for p, kind, val in batch.target:
+            try:
+                p.nice(val) if kind == "nice" else p.cpu_affinity(val)
+            except Exception as e:
+                s.originals.get(s.target_pid, {}).pop(kind, None)
+                if kind == "nice":
+                    print(f"Hedef önceliği yükseltilemedi (PID {s.target_pid}):", e)
+                else:
+                    print(f"Hedef çekirdeklere sabitlenemedi (PID {s.target_pid}):", e)
+                    self.plan = None
+        # bekleme sırasında çıkan (ya da pid'i yeniden kullanılan) girişlere dokunulmaz
+        for e, acts in batch.staged:
+            self._inflight.discard(e.key)
+            if table.get(e.pid) is e:
+                self._act(e, acts)
+                s.applied.add(e.key)
+        for e in batch.throttle:
+            self._inflight.discard(e.key)
+            if table.get(e.pid) is not e or e.pid in protected or not self._is_idle(e):
+                continue
+            if self._throttle(e, self.throttle_percent):
+                s.throttled_pids.add(e.pid)
+            self._idle_since.pop(e.key, None)
+        for e, idle in batch.suspend:
+            self._inflight.discard(e.key)
+            if table.get(e.pid) is not e or e.pid in protected:
+                continue
+            # bekleme sırasında uyanan süreç askıya alınmaz; pencere yeniden başlar
+            if not (self._is_idle(e) if idle else e.status == psutil.STATUS_RUNNING):
+                continue
+            try:
+                e.proc.suspend()
+                s.suspended_pids.add(e.pid)
+                self._idle_since.pop(e.key, None)
+            except Exception:
+                continue
+
+    def _remember(self, pid: int, create_time: float, orig: dict, key: str, value, batch: _Deferred):
+        """Özgün değeri ilk değişiklikte saklar ve değişiklikten önce günlüğe yazar."""
+        if key not in orig:
+            orig[key] = value
+            batch.added.append((pid, key))
+            self._journal("priority" if key == "nice" else key, pid, create_time, value)
+
+    def recover(self) -> int:
+        """Önceki oturum temiz kapanmadıysa günlükteki değişiklikleri geri alır."""
+        if self.journal is None:
+            return 0
+        n = self.journal.replay(self.table.provider, self.throttler)
+        if n:
+            print(f"Performans modu: önceki oturumdan {n} süreç geri yüklendi")
+        return n
+
+    def _restore_applied(self, keep: int | None = None):
+        """Uygulanan eylemleri geri alır; `keep` pid'inin (hedef) sabitlemesine dokunulmaz."""
+        originals = self.session.originals
+        kept = originals.pop(keep, None) if keep else None
+        for pid, orig in originals.items():
+            p = orig["proc"]
+            try:
+                if "nice" in orig:
+                    p.nice(orig["nice"])
+                if "affinity" in orig:
+                    p.cpu_affinity(orig["affinity"])
+                if "ionice" in orig:
+                    io = orig["ionice"]
+                    p.ionice(*io) if isinstance(io, tuple) else p.ionice(io)
+            except Exception:
+                pass
+            if orig.get("throttle") and self.throttler is not None:
+                try:
+                    self.throttler.release(pid)
+                except Exception:
+                    pass
+        originals.clear()
+        if kept is not None:
+            originals[keep] = kept
+        self.session.applied.clear()
+        self.session.throttled_pids.clear()
+
+    def _protected(self, target: int) -> set[int]:
+        """Askıya alınmaması gereken pid'ler: sistem, hedef, hedefin alt ve üst süreçleri."""
+        keep = {0, 1, 4, target}
+        keep |= self.table.children_of(target)
+        keep.update(self.table.ancestors_of(target))
+        return keep
+
+    def _net_active_pids(self) -> set[int]:
+        """Kurulu TCP ya da açık UDP soketi olan pid'ler; okunamazsa boş küme."""
+        try:
+            conns = self.table.provider.net_connections(kind="inet")
+        except Exception:
+            return set()
+        out = set()
+        for c in conns:
+            if c.pid and (c.type == socket.SOCK_DGRAM or c.status == psutil.CONN_ESTABLISHED):
+                out.add(c.pid)
+        return out
+
+    def _is_idle(self, e) -> bool:
+        cpu = e.cpu_percent
+        if cpu is None or cpu > self.suspend_cpu_threshold:
+            return False
+        if e.io_rate:
+            return False
+        return e.status == psutil.STATUS_RUNNING
+
+    @PROFILER.profiled("PerformanceMode.maintain")
+    def maintain(self):
+        """
+        Periyodik çağır: yeterince uzun süre boşta kalan süreçleri askıya al.
+        """
+        target = self.session.target_pid
+        if not target:
+            return
+        self.table.refresh(max_age=1.0)
+        # hedefin kimliği doğrulanır; diğer süreçlere uygulanan psutil çağrıları (nice,
+        # cpu_affinity, suspend) yeniden kullanılan pid'i kendileri reddeder
+        if self.table.verify(target) is None:
+            return
+        now = self.table.clock()
+        suspended = self.session.suspended_pids
+        throttled = self.session.throttled_pids
+        applied = self.session.applied
+        protected = self._protected(target)
+        # önceki geçişlerde günlüğe eklenen ve fsync'i tamamlanan değişiklikler
+        self._apply_durable(protected)
+        inflight = self._inflight
+        idle_since = self._idle_since
+        rules = self.rules
+        seen = set()
+        candidates = []
+        batch = _Deferred()
+        if self._target_todo:
+            self._stage_target(batch)
+        for e in self.table.entries():
+            if e.pid in protected or e.pid in suspended or e.pid in throttled:
+                continue
+            key = e.key
+            seen.add(key)
+            parent = self.table.get(e.ppid) if e.ppid else None
+            d = rules.decide(e, parent.name if parent else "")
+            # uygulanmış sayılması için değişikliğin gerçekten uygulanması gerekir (bkz. _apply)
+            if key not in applied and key not in inflight:
+                acts = self._stage(e, d, batch)
+                if acts:
+                    batch.staged.append((e, acts))
+                    inflight.add(key)
+                else:
+                    applied.add(key)
+            if d.suspend == "never":
+                continue
+            if d.suspend == "always":
+                if e.status == psutil.STATUS_RUNNING:
+                    candidates.append((e, False))
                 continue
+            # boşta değilse pencere sıfırlanır; ilk görülen süreçte henüz fark yok (None)
+            if not self._is_idle(e):
+                idle_since.pop(key, None)
+                continue
+            since = idle_since.setdefault(key, now)
+            if now - since >= self.idle_window:
+                candidates.append((e, True))
+        # çıkmış ya da korunan hale gelmiş süreçlerin kayıtlarını at
+        for key in idle_since.keys() - seen:
+            del idle_since[key]
+        rules.prune(seen)
+        applied &= seen
+        originals = self.session.originals
+        for pid in [pid for pid in originals if self.table.get(pid) is None]:
+            if originals.pop(pid).get("throttle") and self.throttler is not None:
+                self.throttler.release(pid)
+            throttled.discard(pid)
+        # kural eylemleri fsync bekleyen süreç, onlar uygulanana kadar askıya alınmaz/kısılmaz
+        candidates = [(e, idle) for e, idle in candidates if e.key not in inflight]
+        # ağ sorgusu pahalı; yalnızca boşta aday varken yapılır
+        net = self._net_active_pids() if any(idle for _, idle in candidates) else set()
+        soft = self.throttler is not None and self.throttle_percent
+        for e, idle in candidates:
+            if idle and e.pid in net:
+                idle_since.pop(e.key, None)
+                continue
+            if idle and soft:
+                # yumuşak tavan: süreç çalışmaya devam eder, yalnızca CPU payı sınırlanır
+                orig = originals.setdefault(e.pid, {"proc": e.proc})
+                if self._stage_throttle(e, orig, batch):
+                    batch.throttle.append(e)
+                    inflight.add(e.key)
+                continue
+            self._journal("suspend", e.pid, e.create_time)
+            batch.suspend.append((e, idle))
+            inflight.add(e.key)
+        # tüm değişiklikler önce günlüğe: fsync tamamlanınca uygulanır, böylece çökmede geri
+        # alınamayacak bir değişiklik kalmaz. Günlük yoksa bariyer tamamdır, hemen uygulanır
+        self._submit(batch)
+        self._apply_durable(protected)
 
     def stop(self):
+        # fsync bekleyen değişiklikler artık uygulanmaz
+        self._deferred.clear()
+        self._inflight.clear()
+        self._target = None
+        self._target_todo = False
         # askıya alınanları geri devam ettir
         for pid in list(self.session.suspended_pids):
             try:
-                p = psutil.Process(pid)
+                p = self.table.provider.Process(pid)
                 p.resume()
             except Exception:
                 pass
-        self.session.suspended_pids.clear()
\ No newline at end of file
+        self.session.suspended_pids.clear()
+        self._restore_applied()
+        if self.throttler is not None:
+            try:
+                self.throttler.release_all()
+            except Exception as e:
+                print("cgroup grupları geri alınamadı:", e)
+        if self.journal is not None:
+            self.journal.end()
+        self.session.target_pid = None
+        self.plan = None
+        self._idle_since.clear()
+        if self._mon:
+            self._mon.release_high_resolution("performance")
@@ -0,0 +1,201 @@
+import fnmatch
+import re
+import threading
+
+import psutil
+
+# Kural eylemlerinde kullanılan öncelik adları -> psutil değeri (Windows: öncelik sınıfı, POSIX: nice)
+if hasattr(psutil, "HIGH_PRIORITY_CLASS"):
+    PRIORITIES = {
+        "idle": psutil.IDLE_PRIORITY_CLASS,
+        "below_normal": psutil.BELOW_NORMAL_PRIORITY_CLASS,
+        "normal": psutil.NORMAL_PRIORITY_CLASS,
+        "above_normal": psutil.ABOVE_NORMAL_PRIORITY_CLASS,
+        "high": psutil.HIGH_PRIORITY_CLASS,
+    }
+else:
+    PRIORITIES = {"idle": 19, "below_normal": 10, "normal": 0, "above_normal": -5, "high": -10}
+
+IO_PRIORITIES = ("very_low", "low", "normal", "high")
+SUSPEND_MODES = ("idle", "never", "always")
+MATCH_FIELDS = ("name", "path", "parent", "user")
+
+class RuleError(ValueError):
+    pass
+
+class Decision:
+    """Bir sürece uygulanacak eylemler; None = dokunma. suspend: idle | never | always."""
+    __slots__ = ("rule", "priority", "affinity", "io_priority", "throttle", "suspend")
+
+    def __init__(self, rule: str = "", priority=None, affinity=None, io_priority=None,
+                 throttle=None, suspend: str = "idle"):
+        self.rule = rule
+        self.priority = priority
+        self.affinity = affinity
+        self.io_priority = io_priority
+        self.throttle = throttle
+        self.suspend = suspend
+
+    def __repr__(self):
+        return (f"Decision(rule={self.rule!r}, priority={self.priority!r}, affinity={self.affinity!r}, "
+                f"io_priority={self.io_priority!r}, throttle={self.throttle!r}, suspend={self.suspend!r})")
+
+# Hiçbir kural eşleşmezse: eski davranış (boşta kalan süreç askıya alınabilir)
+DEFAULT_DECISION = Decision()
+
+def _compile_pattern(pat: str):
+    """"re:" önekli desen düzenli ifade, diğerleri glob (büyük/küçük harf duyarsız)."""
+    if pat.startswith("re:"):
+        return re.compile(pat[3:], re.IGNORECASE)
+    return re.compile(fnmatch.translate(pat.lower()), re.IGNORECASE)
+
+def _is_literal(pat: str) -> bool:
+    return not pat.startswith("re:") and not any(c in pat for c in "*?[")
+
+class _Rule:
+    __slots__ = ("index", "decision", "name_literal", "name_re", "path_re", "parent_re", "user_re")
+
+    def __init__(self, index: int, spec: dict):
+        self.index = index
+        if not isinstance(spec, dict):
+            raise RuleError("kural bir JSON nesnesi olmalı")
+        when = spec.get("when") or {}
+        unknown = set(when) - set(MATCH_FIELDS)
+        if unknown:
+            raise RuleError(f"bilinmeyen eşleşme alanı: {', '.join(sorted(unknown))}")
+        name = when.get("name")
+        self.name_literal = name.lower() if name and _is_literal(name) else None
+        self.name_re = _compile_pattern(name) if name and self.name_literal is None else None
+        self.path_re = _compile_pattern(when["path"]) if when.get("path") else None
+        self.parent_re = _compile_pattern(when["parent"]) if when.get("parent") else None
+        self.user_re = _compile_pattern(when["user"]) if when.get("user") else None
+        self.decision = self._compile_actions(spec, str(spec.get("name") or f"kural {index + 1}"))
+
+    @staticmethod
+    def _compile_actions(spec: dict, label: str) -> Decision:
+        prio = spec.get("priority")
+        if prio is not None and prio not in PRIORITIES:
+            raise RuleError(f"geçersiz öncelik: {prio}")
+        aff = spec.get("affinity")
+        if aff is not None:
+            if not isinstance(aff, list) or not aff or not all(isinstance(c, int) and c >= 0 for c in aff):
+                raise RuleError(f"geçersiz affinity: {aff}")
+            aff = tuple(sorted(set(aff)))
+        io = spec.get("io_priority")
+        if io is not None and io not in IO_PRIORITIES:
+            raise RuleError(f"geçersiz io_priority: {io}")
+        thr = spec.get("throttle")
+        if thr is not None:
+            thr = float(thr)
+            if not 0 < thr <= 100:
+                raise RuleError(f"throttle 0-100 arası bir yüzde olmalı: {thr}")
+        susp = spec.get("suspend", "idle")
+        if susp is True:
+            susp = "always"
+        elif susp is False:
+            susp = "never"
+        if susp not in SUSPEND_MODES:
+            raise RuleError(f"geçersiz suspend: {susp}")
+        return Decision(label, PRIORITIES[prio] if prio else None, aff, io, thr, susp)
+
+    def matches_rest(self, entry, parent_name: str) -> bool:
+        # ad zaten kontrol edildi; yol/kullanıcı pahalı olabilir, yalnızca gerekiyorsa okunur
+        if self.parent_re is not None and not self.parent_re.fullmatch(parent_name):
+            return False
+        if self.path_re is not None and not self.path_re.fullmatch(entry.exe()):
+            return False
+        if self.user_re is not None and not self.user_re.fullmatch(entry.username()):
+            return False
+        return True
+
+def _compile_specs(specs) -> tuple[list[_Rule], list[str]]:
+    compiled, errors = [], []
+    for i, spec in specs:
+        try:
+            compiled.append(_Rule(i, spec))
+        except (RuleError, re.error, TypeError, ValueError, AttributeError) as e:
+            name = spec.get("name") if isinstance(spec, dict) else None
+            errors.append(f"{name or f'kural {i + 1}'}: {e}")
+    return compiled, errors
+
+def validate_rules(rules) -> list[str]:
+    """Kural listesinin hatalarını döndürür (ayar düzenleyicisi için); boş liste = geçerli."""
+    if not isinstance(rules, list):
+        return ["kurallar bir JSON listesi olmalı"]
+    return _compile_specs(enumerate(rules))[1]
+
+class RuleEngine:
+    """
+    Ayarlardaki (Settings.performance.rules) süreç kurallarını bir kez derler. Kurallar sırayla
+    değerlendirilir, ilk eşleşen kazanır. Kural örneği:
+        {"name": "tarayıcılar", "when": {"name": "chrome*.exe", "user": "re:.*\\\\me$"},
+         "priority": "below_normal", "affinity": [0, 1], "io_priority": "low",
+         "throttle": 50, "suspend": "never"}
+    when alanları: name, path, parent (üst sürecin adı), user; hepsi sağlanmalıdır.
+    Desenler glob'dur, "re:" önekiyle düzenli ifade verilebilir. Beyaz liste "suspend": "never"
+    kurallarına dönüştürülür ve kullanıcı kurallarından önce değerlendirilir. Kararlar
+    (pid, create_time) başına önbelleğe alınır.
+    """
+    def __init__(self, rules: list[dict] | None = None, whitelist: list[str] | None = None):
+        self._lock = threading.Lock()
+        self._cache: dict[tuple, Decision] = {}
+        self.errors: list[str] = []
+        self.generation = 0
+        self.compile(rules or [], whitelist or [])
+
+    def compile(self, rules: list[dict], whitelist: list[str] | None = None):
+        # beyaz liste kullanıcı kurallarından önce gelir (negatif sıra): listedeki bir süreç
+        # hiçbir kuralla askıya alınamaz ya da kısılamaz
+        wl = [{"name": f"beyaz liste: {n}", "when": {"name": n}, "suspend": "never"} for n in (whitelist or [])]
+        compiled, errors = _compile_specs([(i - len(wl), spec) for i, spec in enumerate(wl)]
+                                          + list(enumerate(rules)))
+        for err in errors:
+            print("Süreç kuralı yok sayıldı:", err)
+        # tam ad -> kurallar (sözlük araması); joker/regex ad ve adsız kurallar sırayla denenir
+        by_name: dict[str, list[_Rule]] = {}
+        scan: list[_Rule] = []
+        for r in compiled:
+            if r.name_literal is not None:
+                by_name.setdefault(r.name_literal, []).append(r)
+            else:
+                scan.append(r)
+        with self._lock:
+            self._by_name = by_name
+            self._scan = scan
+            self.rule_count = len(compiled)
+            self.errors = errors
+            self._cache.clear()
+            self.generation += 1
+
+    def _evaluate(self, entry, parent_name: str) -> Decision:
+        name = entry.name.lower()
+        best = None
+        for r in self._by_name.get(name, ()):
+            if r.matches_rest(entry, parent_name):
+                best = r
+                break
+        for r in self._scan:
+            if best is not None and r.index > best.index:
+                break
+            if r.name_re is not None and not r.name_re.fullmatch(name):
+                continue
+            if r.matches_rest(entry, parent_name):
+                best = r
+                break
+        return best.decision if best is not None else DEFAULT_DECISION
+
+    def decide(self, entry, parent_name: str = "") -> Decision:
+        """ProcEntry için kararı döndürür; aynı süreç için ikinci çağrı önbellekten gelir."""
+        key = entry.key
+        d = self._cache.get(key)
+        if d is None:
+            d = self._evaluate(entry, parent_name.lower())
+            self._cache[key] = d
+        return d
+
+    def prune(self, live_keys: set):
+        """Artık tabloda olmayan süreçlerin kararlarını at."""
+        cache = self._cache
+        if len(cache) > len(live_keys):
+            for k in cache.keys() - live_keys:
+                del cache[k]
@@ -0,0 +1,241 @@
+import heapq
+import threading
+import time
+
+import psutil
+
+class ProcEntry:
+    """
+    Tek bir sürecin önbelleğe alınmış durumu. Kimlik (pid, create_time) çiftidir.
+    cpu_percent/io_rate son iki detaylı yenileme arasındaki farktan hesaplanır;
+    süreç ilk kez görüldüğünde None'dır (henüz fark yok).
+    """
+    __slots__ = (
+        "pid", "create_time", "proc", "name", "ppid", "status",
+        "cpu_time", "cpu_percent", "rss", "io_bytes", "io_rate", "first_seen",
+        "_exe", "_username",
+    )
+
+    def __init__(self, pid: int, create_time: float, proc, name: str, ppid: int | None, now: float):
+        self.pid = pid
+        self.create_time = create_time
+        self.proc = proc
+        self.name = name
+        self.ppid = ppid
+        self.status = None
+        self.cpu_time = None
+        self.cpu_percent = None
+        self.rss = 0
+        self.io_bytes = None
+        self.io_rate = None
+        self.first_seen = now
+        self._exe = None
+        self._username = None
+
+    @property
+    def key(self) -> tuple:
+        return (self.pid, self.create_time)
+
+    def exe(self) -> str:
+        """Yol ilk istendiğinde okunur ve önbelleğe alınır (erişim reddi -> "")."""
+        if self._exe is None:
+            try:
+                self._exe = self.proc.exe() or ""
+            except Exception:
+                self._exe = ""
+        return self._exe
+
+    def username(self) -> str:
+        if self._username is None:
+            try:
+                self._username = self.proc.username() or ""
+            except Exception:
+                self._username = ""
+        return self._username
+
+class ProcessTable:
+    """
+    Paylaşılan artımlı süreç tablosu. Her yenilemede yalnızca yeni ve çıkmış pid'ler tam olarak
+    işlenir; mevcut girişlerin Process nesneleri ve adları yeniden kullanılır (süreç başına sistem
+    çağrısı yapılmaz). Detaylı yenileme CPU/RAM/IO farklarını günceller ve top_n sorgularını ucuzlatır.
+    Yeniden kullanılan pid'ler toptan denetlenmez: detaylı yenileme CPU süresi geriye giden girişi
+    (aynı süreçte olamaz) "çıkan" sayar, bir girişe dayanarak iş yapacak olan verify(pid) ile
+    kimliği (pid, create_time) tek sistem çağrısıyla doğrular. psutil'in değiştiren çağrıları
+    (nice, cpu_affinity, suspend) kimliği zaten kendileri denetler.
+    `provider` psutil ile aynı arayüzü (pids, Process, NoSuchProcess, AccessDenied) sağlamalıdır;
+    testlerde ve benchmark'larda sahte bir sağlayıcı (benchmarks.process_sim) ve saat verilebilir.
+    """
+    def __init__(self, provider=psutil, clock=time.monotonic):
+        self.provider = provider
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._entries: dict[int, ProcEntry] = {}
+        self._last_sync = 0.0
+        self._last_detail = 0.0
+        self.generation = 0
+        self._watchers: list = []
+
+    def watch(self, callback):
+        """Her yenilemede (yeni girişler, çıkan girişler) ile çağrılır; tabloyu kim yenilerse yenilesin."""
+        self._watchers.append(callback)
+
+    def unwatch(self, callback):
+        try:
+            self._watchers.remove(callback)
+        except ValueError:
+            pass
+
+    def refresh(self, detail: bool = True, max_age: float = 0.0) -> tuple[list[ProcEntry], list[ProcEntry]]:
+        """
+        Tabloyu günceller; (yeni girişler, çıkan girişler) döndürür.
+        max_age > 0 ise son yenilemeden bu yana daha az süre geçtiyse hiçbir şey yapmaz.
+        """
+        now = self.clock()
+        with self._lock:
+            last = self._last_detail if detail else self._last_sync
+            if max_age and now - last < max_age:
+                return [], []
+            added, removed = self._sync(now)
+            if detail:
+                removed += self._update_details(now)
+            self.generation += 1
+        if added or removed:
+            self._notify(added, removed)
+        return added, removed
+
+    def _notify(self, added, removed):
+        for cb in tuple(self._watchers):
+            try:
+                cb(added, removed)
+            except Exception as e:
+                print("ProcessTable watcher error:", e)
+
+    def verify(self, pid: int) -> ProcEntry | None:
+        """
+        pid'in girişini, kimliği hâlâ geçerliyse döndürür. Süreç çıkmış ya da pid yeniden
+        kullanılmışsa giriş tablodan düşer, izleyicilere "çıkan" olarak bildirilir ve None döner;
+        yeni süreç bir sonraki yenilemede "yeni" olarak görülür.
+        """
+        e = self._entries.get(pid)
+        if e is None:
+            return None
+        try:
+            same = e.proc.is_running()
+        except Exception:
+            same = True
+        if same:
+            return e
+        with self._lock:
+            if self._entries.get(pid) is not e:
+                return self._entries.get(pid)
+            del self._entries[pid]
+            self.generation += 1
+        self._notify([], [e])
+        return None
+
+    def _sync(self, now: float):
+        ps = self.provider
+        pids = set(ps.pids())
+        entries = self._entries
+        removed = [entries.pop(pid) for pid in entries.keys() - pids]
+        added = []
+        for pid in pids - entries.keys():
+            try:
+                p = ps.Process(pid)
+                ctime = p.create_time()
+                name = p.name() or ""
+                try:
+                    ppid = p.ppid()
+                except Exception:
+                    ppid = None
+            except Exception:
+                # süreç arada çıktı ya da erişim yok; bir sonraki yenilemede yeniden denenir
+                continue
+            e = ProcEntry(pid, ctime, p, name, ppid, now)
+            entries[pid] = e
+            added.append(e)
+        self._last_sync = now
+        return added, removed
+
+    def _update_details(self, now: float) -> list[ProcEntry]:
+        ps = self.provider
+        dt = now - self._last_detail if self._last_detail else 0.0
+        dead = []
+        for pid, e in self._entries.items():
+            p = e.proc
+            try:
+                with p.oneshot():
+                    ct = p.cpu_times()
+                    total = ct.user + ct.system
+                    e.rss = p.memory_info().rss
+                    e.status = p.status()
+                    try:
+                        io = p.io_counters()
+                        iob = io.read_bytes + io.write_bytes
+                    except Exception:
+                        iob = None
+            except ps.NoSuchProcess:
+                dead.append(pid)
+                continue
+            except Exception:
+                continue
+            if e.cpu_time is not None and total < e.cpu_time - 0.01:
+                # CPU süresi geriye gitti: pid yeni bir sürece geçmiş; eski giriş "çıkan" olur
+                dead.append(pid)
+                continue
+            if e.cpu_time is not None and dt > 0:
+                e.cpu_percent = max(0.0, (total - e.cpu_time) / dt * 100.0)
+            if iob is not None and e.io_bytes is not None and dt > 0:
+                e.io_rate = max(0.0, (iob - e.io_bytes) / dt)
+            e.cpu_time = total
+            e.io_bytes = iob
+        self._last_detail = now
+        # ölçüm sırasında çıkan süreçler de "çıkan" olarak raporlanır
+        return [self._entries.pop(pid) for pid in dead]
+
+    def entries(self) -> list[ProcEntry]:
+        with self._lock:
+            return list(self._entries.values())
+
+    def get(self, pid: int) -> ProcEntry | None:
+        return self._entries.get(pid)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def children_of(self, pid: int) -> set[int]:
+        """pid'in tüm alt süreçleri (ppid zinciri üzerinden, tablodan)."""
+        with self._lock:
+            kids: dict[int, list[int]] = {}
+            for e in self._entries.values():
+                if e.ppid is not None:
+                    kids.setdefault(e.ppid, []).append(e.pid)
+        out, stack = set(), [pid]
+        while stack:
+            for c in kids.get(stack.pop(), ()):
+                if c not in out and c != pid:
+                    out.add(c)
+                    stack.append(c)
+        return out
+
+    def ancestors_of(self, pid: int) -> list[int]:
+        """pid'in üst süreçleri (yakından uzağa), tablodaki ppid zinciri üzerinden."""
+        out, seen = [], {pid}
+        e = self._entries.get(pid)
+        while e is not None and e.ppid and e.ppid not in seen:
+            out.append(e.ppid)
+            seen.add(e.ppid)
+            e = self._entries.get(e.ppid)
+        return out
+
+    def top_n(self, n: int, by: str = "cpu") -> list[ProcEntry]:
+        """by: "cpu" | "ram" | "io". Değeri bilinmeyen girişler sona düşer."""
+        attr = {"cpu": "cpu_percent", "ram": "rss", "io": "io_rate"}[by]
+        with self._lock:
+            return heapq.nlargest(n, self._entries.values(), key=lambda e: getattr(e, attr) or 0)
+
+def process_choices(table: ProcessTable) -> list[tuple[str, int]]:
+    """Süreç seçim listesi için (etiket, pid) çiftleri, ada göre sıralı."""
+    data = [(f"{e.name} (PID {e.pid})", e.pid) for e in table.entries() if e.name]
+    data.sort(key=lambda x: x[0].lower())
+    return data
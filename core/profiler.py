@@ -0,0 +1,144 @@
+import json
+import time
+import threading
+from array import array
+from contextlib import contextmanager
+
+# log2 kovaları (mikrosaniye): kova i = [2^i, 2^(i+1)) us, 1 us .. ~35 dk
+BUCKETS = 32
+BUDGET_WINDOW_S = 10.0
+
+class Histogram:
+    """Sabit boyutlu log2 histogram; kayıt O(1), bellek sabit."""
+    __slots__ = ("counts", "count", "total", "max")
+
+    def __init__(self):
+        self.counts = array("Q", bytes(8 * BUCKETS))
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float):
+        us = int(seconds * 1e6)
+        i = min(BUCKETS - 1, us.bit_length() - 1) if us > 0 else 0
+        self.counts[i] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, q: float) -> float:
+        """Yaklaşık yüzdelik (kova üst sınırı, saniye)."""
+        if not self.count:
+            return 0.0
+        rank = q / 100.0 * self.count
+        acc = 0
+        for i, c in enumerate(self.counts):
+            acc += c
+            if acc >= rank and c:
+                return min((1 << (i + 1)) / 1e6, self.max)
+        return self.max
+
+    def as_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "avg_ms": self.total / self.count * 1000.0 if self.count else 0.0,
+            "p50_ms": self.percentile(50) * 1000.0,
+            "p99_ms": self.percentile(99) * 1000.0,
+            "max_ms": self.max * 1000.0,
+            "buckets_us": {str(1 << i): c for i, c in enumerate(self.counts) if c},
+        }
+
+class _Component:
+    __slots__ = ("wall", "cpu", "window_start", "window_cpu", "share", "over_budget")
+
+    def __init__(self):
+        self.wall = Histogram()
+        self.cpu = Histogram()
+        self.window_start = time.monotonic()
+        self.window_cpu = 0.0
+        self.share = 0.0          # son pencerede tek çekirdeğin yüzdesi
+        self.over_budget = 0      # bütçe aşılan pencere sayısı
+
+class Profiler:
+    """
+    Sıcak yol çağrıları için duvar saati ve CPU süresi (thread_time) histogramları.
+    Bütçe: bileşenin bir çekirdekten alabileceği pay (%); BUDGET_WINDOW_S penceresinde aşılırsa loglanır.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._components: dict[str, _Component] = {}
+        self.budgets: dict[str, float] = {}
+        self.enabled = True
+
+    def set_budgets(self, budgets: dict):
+        self.budgets = {k: float(v) for k, v in (budgets or {}).items()}
+
+    def record(self, name: str, wall_s: float, cpu_s: float):
+        if not self.enabled:
+            return
+        now = time.monotonic()
+        warn = None
+        with self._lock:
+            c = self._components.get(name)
+            if c is None:
+                c = self._components[name] = _Component()
+            c.wall.record(wall_s)
+            c.cpu.record(cpu_s)
+            c.window_cpu += cpu_s
+            span = now - c.window_start
+            if span >= BUDGET_WINDOW_S:
+                c.share = c.window_cpu / span * 100.0
+                c.window_start, c.window_cpu = now, 0.0
+                budget = self.budgets.get(name)
+                if budget is not None and c.share > budget:
+                    c.over_budget += 1
+                    warn = (c.share, budget)
+        if warn:
+            print(f"Profiler: '{name}' CPU payı %{warn[0]:.2f} > bütçe %{warn[1]:.2f}")
+
+    @contextmanager
+    def measure(self, name: str):
+        if not self.enabled:
+            yield
+            return
+        w0, c0 = time.perf_counter(), time.thread_time()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - w0, time.thread_time() - c0)
+
+    def profiled(self, name: str):
+        """Dekoratör: fonksiyonun her çağrısını `name` altında ölçer."""
+        def deco(fn):
+            def wrapper(*args, **kwargs):
+                with self.measure(name):
+                    return fn(*args, **kwargs)
+            wrapper.__name__ = fn.__name__
+            wrapper.__doc__ = fn.__doc__
+            return wrapper
+        return deco
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            out = {}
+            for name, c in self._components.items():
+                out[name] = {
+                    "wall": c.wall.as_dict(),
+                    "cpu": c.cpu.as_dict(),
+                    "cpu_share_percent": c.share,
+                    "budget_percent": self.budgets.get(name),
+                    "over_budget_windows": c.over_budget,
+                }
+            return out
+
+    def reset(self):
+        with self._lock:
+            self._components.clear()
+
+    def dump_json(self, path: str):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"ts": int(time.time()), "components": self.snapshot()}, f, ensure_ascii=False, indent=2)
+
+# Uygulama genelinde tek profil kaydedici
+PROFILER = Profiler()
@@ -0,0 +1,621 @@
+import time
+import shutil
+import threading
+import subprocess
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, asdict
+
+import psutil
+
+from core.profiler import PROFILER
+
+# NVML (NVIDIA)
+try:
+    import pynvml
+    pynvml.nvmlInit()
+    NVML_AVAILABLE = True
+except Exception:
+    NVML_AVAILABLE = False
+
+class SensorProvider:
+    """
+    Tek bir ölçüm kaynağı. poll() SystemSnapshot alan adlarıyla bir sözlük döndürür.
+    Her sağlayıcının kendi örnekleme aralığı vardır (saniye).
+    """
+    name = "base"
+
+    def __init__(self, interval: float = 1.0):
+        self.interval = interval
+        self._last_t = time.monotonic()
+
+    def available(self) -> bool:
+        return True
+
+    def _elapsed(self) -> float:
+        """
+        Önceki çağrıdan bu yana ölçülen süre (time.monotonic). Hız metrikleri nominal aralığa
+        değil buna bölünür; poll gecikse de hızlar doğru kalır.
+        """
+        now = time.monotonic()
+        dt, self._last_t = now - self._last_t, now
+        return max(dt, 1e-6)
+
+    def poll(self) -> dict:
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+class CpuProvider(SensorProvider):
+    name = "cpu"
+
+    def poll(self) -> dict:
+        # Tek geçiş: çekirdek başına kullanım; toplam ve en sıcak çekirdek buradan türetilir
+        cores = psutil.cpu_percent(interval=None, percpu=True) or [0.0]
+        hot = max(range(len(cores)), key=cores.__getitem__)
+        out = {
+            "cpu_percent": sum(cores) / len(cores),
+            "cpu_core_percent": array("f", cores),
+            "cpu_hot_core": hot,
+            "cpu_hot_core_percent": cores[hot],
+        }
+        try:
+            per = psutil.cpu_freq(percpu=True) or []
+            freqs = array("f", (f.current for f in per))
+            out["cpu_core_freq"] = freqs
+            out["cpu_freq"] = sum(freqs) / len(freqs) if freqs else 0.0
+        except Exception:
+            out["cpu_freq"] = 0.0
+        return out
+
+class MemoryProvider(SensorProvider):
+    name = "memory"
+
+    def poll(self) -> dict:
+        # Windows'ta used ~ total - available
+        vm = psutil.virtual_memory()
+        return {"ram_total": vm.total, "ram_used": vm.total - vm.available, "ram_percent": vm.percent}
+
+# gpu_* alanlarının (tek GPU görünümü) geldiği aygıt: NVML tanıtıcı sırası / nvidia-smi -i
+PRIMARY_GPU = 0
+
+def _nvml_field_value(v) -> float | None:
+    # nvmlValueType_t: 0 double, 1 uint, 2 ulong, 3 ulonglong, 4 slonglong, 5 sint; diğerleri bilinmiyor
+    t = v.valueType
+    if t == 0:
+        return float(v.value.dVal)
+    if t == 1:
+        return float(v.value.uiVal)
+    if t == 2:
+        return float(v.value.ulVal)
+    if t == 3:
+        return float(v.value.ullVal)
+    if t == 4:
+        return float(v.value.sllVal)
+    if t == 5:
+        return float(v.value.siVal)
+    return None
+
+class NvmlProvider(SensorProvider):
+    """
+    Tüm NVIDIA GPU'ları izler. Aygıt tanıtıcıları bir kez alınıp önbelleğe konur.
+    Güç, destekleniyorsa tek bir toplu nvmlDeviceGetFieldValues çağrısıyla okunur
+    (POWER_INSTANT ya da enerji sayacı farkı); kullanım, bellek ve sıcaklık için NVML'de alan
+    kimliği olmadığından bunlar ayrı çağrılarla okunur. Desteklenmeyen çağrılar bir kez başarısız
+    olduktan sonra o aygıt için tekrar denenmez.
+    Anlık görüntüde gpu_* alanları PRIMARY_GPU'yu, gpus_* dizileri tüm GPU'ları (NaN = yok) taşır.
+    """
+    name = "nvml"
+
+    def __init__(self, interval: float = 1.0):
+        super().__init__(interval)
+        self._handles = []
+        self._names: tuple = ()
+        self._fi_power = getattr(pynvml, "NVML_FI_DEV_POWER_INSTANT", None) if NVML_AVAILABLE else None
+        self._fi_energy = getattr(pynvml, "NVML_FI_DEV_TOTAL_ENERGY_CONSUMPTION", None) if NVML_AVAILABLE else None
+        self._fields = [f for f in (self._fi_power, self._fi_energy) if f is not None]
+        if NVML_AVAILABLE:
+            self._open()
+
+    def _open(self):
+        try:
+            n = pynvml.nvmlDeviceGetCount()
+            self._handles = [pynvml.nvmlDeviceGetHandleByIndex(i) for i in range(n)]
+        except Exception as e:
+            print("NVML device enumeration error:", e)
+            self._handles = []
+        names = []
+        for h in self._handles:
+            try:
+                nm = pynvml.nvmlDeviceGetName(h)
+                names.append(nm.decode() if isinstance(nm, bytes) else str(nm))
+            except Exception:
+                names.append("GPU")
+        self._names = tuple(names)
+        n = len(self._handles)
+        self._fields_ok = [bool(self._fields)] * n
+        self._temp_ok = [True] * n
+        self._power_ok = [True] * n
+        self._energy = [None] * n
+
+    def available(self) -> bool:
+        return NVML_AVAILABLE and bool(self._handles)
+
+    def _batched_power(self, i: int, h, dt: float) -> float | None:
+        try:
+            vals = pynvml.nvmlDeviceGetFieldValues(h, self._fields)
+        except Exception:
+            self._fields_ok[i] = False
+            return None
+        got = {}
+        for v in vals:
+            if v.nvmlReturn == 0:  # NVML_SUCCESS
+                x = _nvml_field_value(v)
+                if x is not None:
+                    got[v.fieldId] = x
+        if not got:
+            self._fields_ok[i] = False
+            return None
+        if self._fi_power in got:
+            return got[self._fi_power] / 1000.0
+        if self._fi_energy in got:
+            # toplam enerji (mJ) farkı / ölçülen süre = W
+            e, prev = got[self._fi_energy], self._energy[i]
+            self._energy[i] = e
+            if prev is not None and e >= prev:
+                return (e - prev) / 1000.0 / dt
+        return None
+
+    def _power(self, i: int, h, dt: float) -> float | None:
+        if self._fields_ok[i]:
+            p = self._batched_power(i, h, dt)
+            if self._fields_ok[i]:
+                return p  # ilk enerji okumasında None olabilir
+        if not self._power_ok[i]:
+            return None
+        try:
+            return pynvml.nvmlDeviceGetPowerUsage(h) / 1000.0
+        except Exception:
+            self._power_ok[i] = False
+            return None
+
+    def poll(self) -> dict:
+        n = len(self._handles)
+        if not n:
+            return {"gpu_util": None}
+        dt = self._elapsed()
+        nan = float("nan")
+        util = array("d", [nan] * n)
+        mem_used = array("d", [nan] * n)
+        mem_total = array("d", [nan] * n)
+        temp = array("d", [nan] * n)
+        power = array("d", [nan] * n)
+        for i, h in enumerate(self._handles):
+            try:
+                u = pynvml.nvmlDeviceGetUtilizationRates(h)
+                m = pynvml.nvmlDeviceGetMemoryInfo(h)
+                util[i] = u.gpu
+                mem_used[i] = m.used
+                mem_total[i] = m.total
+            except Exception:
+                continue
+            if self._temp_ok[i]:
+                try:
+                    temp[i] = pynvml.nvmlDeviceGetTemperature(h, pynvml.NVML_TEMPERATURE_GPU)
+                except Exception:
+                    self._temp_ok[i] = False
+            p = self._power(i, h, dt)
+            if p is not None:
+                power[i] = p
+
+        def first(arr):
+            x = arr[PRIMARY_GPU] if len(arr) > PRIMARY_GPU else nan
+            return None if x != x else x
+        return {
+            "gpu_util": first(util),
+            "gpu_mem_used": first(mem_used),
+            "gpu_mem_total": first(mem_total),
+            "gpu_temp": first(temp),
+            "gpu_power_w": first(power),
+            "gpu_names": self._names,
+            "gpus_util": util,
+            "gpus_mem_used": mem_used,
+            "gpus_mem_total": mem_total,
+            "gpus_temp": temp,
+            "gpus_power_w": power,
+        }
+
+class NvidiaSmiProvider(SensorProvider):
+    name = "nvidia-smi"
+    QUERY = "utilization.gpu,memory.used,memory.total,temperature.gpu,power.draw"
+
+    def available(self) -> bool:
+        return shutil.which("nvidia-smi") is not None
+
+    def poll(self) -> dict:
+        try:
+            out = subprocess.check_output([
+                "nvidia-smi",
+                f"--query-gpu={self.QUERY}",
+                "--format=csv,noheader,nounits"
+            ], text=True, stderr=subprocess.DEVNULL, timeout=1.5)
+            return parse_nvidia_smi_line(out.strip().splitlines()[0])
+        except Exception:
+            return {"gpu_util": None}
+
+class NvidiaSmiStreamProvider(SensorProvider):
+    """
+    Tek bir uzun ömürlü `nvidia-smi --loop-ms=N` süreci çalıştırır ve stdout'u bir okuyucu
+    thread'inde satır satır ayrıştırır; her örnek için süreç başlatma maliyeti ortadan kalkar.
+    Süreç ölürse artan bekleme ile (1 sn .. 30 sn) yeniden başlatılır.
+    `cmd` verilirse o komut çalıştırılır (ör. GPU'suz makinede sahte yayıcı: core.nvidia_smi_fake).
+    Yalnızca `gpu_index` aygıtı sorgulanır (`-i`; varsayılan NvmlProvider'ın gpu_* aygıtı).
+    """
+    name = "nvidia-smi"
+    BACKOFF_MAX = 30.0
+
+    def __init__(self, interval: float = 1.0, cmd: list[str] | None = None, gpu_index: int = PRIMARY_GPU):
+        super().__init__(interval)
+        self._cmd = cmd
+        self.gpu_index = gpu_index
+        self._proc: subprocess.Popen | None = None
+        self._thread = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._loop_ms = 0
+        self._restart_now = False
+        self._latest: dict | None = None
+        self._latest_at = 0.0
+        self.restarts = 0
+
+    def available(self) -> bool:
+        return self._cmd is not None or shutil.which("nvidia-smi") is not None
+
+    def _command(self) -> list[str]:
+        gpu = ["-i", str(self.gpu_index)]
+        if self._cmd is not None:
+            return list(self._cmd) + gpu
+        return [
+            "nvidia-smi",
+            f"--query-gpu=index,{NvidiaSmiProvider.QUERY}",
+            "--format=csv,noheader,nounits",
+            f"--loop-ms={self._loop_ms}",
+        ] + gpu
+
+    def _ensure_running(self):
+        loop_ms = max(100, int(self.interval * 1000))
+        with self._lock:
+            if self._thread and self._thread.is_alive() and loop_ms == self._loop_ms:
+                return
+            self._loop_ms = loop_ms
+            if self._thread and self._thread.is_alive():
+                # aralık değişti: mevcut süreci kapat, okuyucu yenisini beklemeden başlatır
+                self._restart_now = True
+                self._kill_child()
+            else:
+                self._stop.clear()
+                self._thread = threading.Thread(target=self._reader, daemon=True)
+                self._thread.start()
+
+    def _kill_child(self):
+        proc = self._proc
+        if proc and proc.poll() is None:
+            try:
+                proc.terminate()
+            except Exception:
+                pass
+
+    def _reader(self):
+        backoff = 1.0
+        while not self._stop.is_set():
+            got_line = False
+            try:
+                proc = subprocess.Popen(self._command(), stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                                        text=True, bufsize=1)
+                with self._lock:
+                    self._proc = proc
+                for line in proc.stdout:
+                    if self._stop.is_set():
+                        break
+                    try:
+                        # -i ile yalnızca seçili GPU'nun satırları gelir
+                        _, rest = line.strip().split(",", 1)
+                        values = parse_nvidia_smi_line(rest)
+                    except Exception:
+                        continue
+                    got_line = True
+                    self._latest = values
+                    self._latest_at = time.monotonic()
+                proc.wait(timeout=2)
+            except Exception as e:
+                print("nvidia-smi stream error:", e)
+            if self._stop.is_set():
+                break
+            if self._restart_now:
+                self._restart_now = False
+                continue
+            if got_line:
+                backoff = 1.0
+            self.restarts += 1
+            self._stop.wait(backoff)
+            backoff = min(backoff * 2, self.BACKOFF_MAX)
+
+    def poll(self) -> dict:
+        self._ensure_running()
+        # Yayın kesildiyse eski değeri gösterme
+        if self._latest is None or time.monotonic() - self._latest_at > max(3 * self.interval, 2.0):
+            return {"gpu_util": None}
+        return dict(self._latest)
+
+    def close(self):
+        self._stop.set()
+        with self._lock:
+            self._kill_child()
+
+def parse_nvidia_smi_line(line: str) -> dict:
+    u, mu, mt, t, p = [x.strip() for x in line.split(",")]
+    return {
+        "gpu_util": float(u),
+        "gpu_mem_used": float(mu) * 1024 * 1024,
+        "gpu_mem_total": float(mt) * 1024 * 1024,
+        "gpu_temp": float(t),
+        "gpu_power_w": float(p),
+    }
+
+def is_loopback(nic: str) -> bool:
+    return nic == "lo" or "loopback" in nic.lower()
+
+class NetProvider(SensorProvider):
+    """
+    Arayüz başına gönderme/alma hızları. `interfaces` boşsa loopback dışındaki tüm arayüzler
+    toplama girer; doluysa yalnızca listedekiler (ör. VPN/sanal adaptörleri dışarıda bırakmak için).
+    """
+    name = "net"
+
+    def __init__(self, interval: float = 1.0, interfaces: list[str] | None = None):
+        super().__init__(interval)
+        self.interfaces = frozenset(interfaces or ())
+        self._last_net = psutil.net_io_counters(pernic=True)
+        self._last_t = time.monotonic()
+
+    def _counts(self, nic: str) -> bool:
+        if self.interfaces:
+            return nic in self.interfaces
+        return not is_loopback(nic)
+
+    def poll(self) -> dict:
+        now_net = psutil.net_io_counters(pernic=True)
+        dt = self._elapsed()
+        names = tuple(sorted(now_net))
+        up = array("d", bytes(8 * len(names)))
+        down = array("d", bytes(8 * len(names)))
+        total_up = total_down = 0.0
+        for i, nic in enumerate(names):
+            prev = self._last_net.get(nic)
+            if prev is None:
+                continue
+            cur = now_net[nic]
+            # sayaç sıfırlanırsa (adaptör yeniden başladı) negatif hız yazma
+            up[i] = max(0, cur.bytes_sent - prev.bytes_sent) / dt
+            down[i] = max(0, cur.bytes_recv - prev.bytes_recv) / dt
+            if self._counts(nic):
+                total_up += up[i]
+                total_down += down[i]
+        self._last_net = now_net
+        return {
+            "net_up": total_up,
+            "net_down": total_down,
+            "net_nics": names,
+            "net_nic_up": up,
+            "net_nic_down": down,
+        }
+
+def _is_partition(name: str, names) -> bool:
+    # sda1 / nvme0n1p2 gibi bölümler, üst disk de listedeyse toplamı iki kez saymasın
+    base = name.rstrip("0123456789")
+    if base != name:
+        if base in names:
+            return True
+        if base.endswith("p") and base[:-1] in names:
+            return True
+    return False
+
+class DiskProvider(SensorProvider):
+    """
+    Disk başına okuma/yazma hızı, IOPS, ortalama gecikme ve meşguliyet yüzdesi;
+    psutil.disk_io_counters(perdisk=True) farklarından ölçülen süreye bölünerek hesaplanır.
+    busy_time olmayan platformlarda (Windows) meşguliyet okuma+yazma süresinden tahmin edilir.
+    Loop/ram aygıtları ve üst diski listelenen bölümler atlanır.
+    """
+    name = "disk"
+
+    def __init__(self, interval: float = 1.0):
+        super().__init__(interval)
+        self._last = self._read()
+        self._last_t = time.monotonic()
+
+    @staticmethod
+    def _read() -> dict:
+        try:
+            raw = psutil.disk_io_counters(perdisk=True) or {}
+        except Exception:
+            return {}
+        return {n: c for n, c in raw.items()
+                if not n.startswith(("loop", "ram", "zram")) and not _is_partition(n, raw)}
+
+    def poll(self) -> dict:
+        now = self._read()
+        dt = self._elapsed()
+        names = tuple(sorted(now))
+        n = len(names)
+        rbps = array("d", bytes(8 * n))
+        wbps = array("d", bytes(8 * n))
+        iops = array("d", bytes(8 * n))
+        lat = array("d", bytes(8 * n))
+        busy = array("d", bytes(8 * n))
+        tot_ops = tot_time = 0
+        for i, name in enumerate(names):
+            prev = self._last.get(name)
+            if prev is None:
+                continue
+            cur = now[name]
+            ops = max(0, (cur.read_count - prev.read_count) + (cur.write_count - prev.write_count))
+            io_ms = max(0, (cur.read_time - prev.read_time) + (cur.write_time - prev.write_time))
+            rbps[i] = max(0, cur.read_bytes - prev.read_bytes) / dt
+            wbps[i] = max(0, cur.write_bytes - prev.write_bytes) / dt
+            iops[i] = ops / dt
+            lat[i] = io_ms / ops if ops else 0.0
+            busy_ms = (cur.busy_time - prev.busy_time) if hasattr(cur, "busy_time") else io_ms
+            busy[i] = min(100.0, max(0.0, busy_ms / (dt * 10.0)))
+            tot_ops += ops
+            tot_time += io_ms
+        self._last = now
+        return {
+            "disk_read_bps": sum(rbps),
+            "disk_write_bps": sum(wbps),
+            "disk_iops": sum(iops),
+            "disk_latency_ms": tot_time / tot_ops if tot_ops else 0.0,
+            "disk_busy_percent": max(busy) if n else 0.0,
+            "disk_names": names,
+            "disks_read_bps": rbps,
+            "disks_write_bps": wbps,
+            "disks_iops": iops,
+            "disks_latency_ms": lat,
+            "disks_busy_percent": busy,
+        }
+
+@dataclass
+class ProviderStats:
+    polls: int = 0
+    errors: int = 0
+    skipped: int = 0        # önceki poll hâlâ sürerken gelen zaman dilimleri
+    missed: int = 0         # zamanında çalıştırılamayan son tarihler (geç uyanma + skipped)
+    max_late_ms: float = 0.0
+    last_ms: float = 0.0
+    max_ms: float = 0.0
+    total_ms: float = 0.0
+    last_ok: float = 0.0    # time.monotonic()
+
+    @property
+    def avg_ms(self) -> float:
+        return self.total_ms / self.polls if self.polls else 0.0
+
+    def as_dict(self) -> dict:
+        d = asdict(self)
+        d["avg_ms"] = self.avg_ms
+        return d
+
+class SensorScheduler:
+    """
+    time.monotonic tabanlı mutlak son-tarih (deadline) zamanlayıcısı.
+    Zamanı gelen sağlayıcılar bir iş parçacığı havuzunda çalışır; her sağlayıcının en fazla bir
+    bekleyen poll'u olur, böylece yavaş/takılan bir sağlayıcı diğerlerini geciktirmez.
+    """
+    def __init__(self, providers: list[SensorProvider], on_result):
+        self.providers = {p.name: p for p in providers}
+        self._on_result = on_result
+        self._stats = {name: ProviderStats() for name in self.providers}
+        self._deadlines: dict[str, float] = {}
+        self._inflight: dict[str, object] = {}
+        self.missed_total = 0
+        self._cond = threading.Condition()
+        self._running = False
+        self._thread = None
+        self._pool = None
+
+    def start(self):
+        if self._running:
+            return
+        self._running = True
+        self._pool = ThreadPoolExecutor(max_workers=max(1, len(self.providers)), thread_name_prefix="sensor")
+        now = time.monotonic()
+        self._deadlines = {name: now for name in self.providers}
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        if self._thread:
+            self._thread.join(timeout=2)
+        if self._pool:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+        for p in self.providers.values():
+            try:
+                p.close()
+            except Exception:
+                pass
+
+    def set_interval(self, name: str, interval: float):
+        """Sağlayıcının örnekleme aralığını değiştirir; yeni aralık hemen uygulanır."""
+        p = self.providers.get(name)
+        if not p or interval <= 0:
+            return
+        with self._cond:
+            p.interval = interval
+            if name in self._deadlines:
+                self._deadlines[name] = min(self._deadlines[name], time.monotonic() + interval)
+            self._cond.notify_all()
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {name: st.as_dict() for name, st in self._stats.items()}
+
+    def _run(self):
+        with self._cond:
+            while self._running:
+                now = time.monotonic()
+                for name, deadline in self._deadlines.items():
+                    if deadline > now:
+                        continue
+                    p = self.providers[name]
+                    st = self._stats[name]
+                    st.max_late_ms = max(st.max_late_ms, (now - deadline) * 1000.0)
+                    missed = 0
+                    fut = self._inflight.get(name)
+                    if fut is not None and not fut.done():
+                        st.skipped += 1
+                        missed += 1
+                    else:
+                        self._inflight[name] = self._pool.submit(self._poll_one, p)
+                    # Mutlak son tarihler: bir sonraki = önceki + aralık (sürüklenme yok).
+                    # Bir periyottan fazla gecikildiyse kaçırılanlar sayılır ve ızgaraya yeniden hizalanır.
+                    nxt = deadline + p.interval
+                    if nxt <= now:
+                        behind = int((now - deadline) // p.interval)
+                        missed += behind
+                        nxt = deadline + (behind + 1) * p.interval
+                    if missed:
+                        st.missed += missed
+                        self.missed_total += missed
+                    self._deadlines[name] = nxt
+                wait = min(self._deadlines.values()) - time.monotonic()
+                if wait > 0:
+                    self._cond.wait(wait)
+
+    def _poll_one(self, p: SensorProvider):
+        t0 = time.monotonic()
+        values = None
+        try:
+            with PROFILER.measure(f"sensor.{p.name}"):
+                values = p.poll()
+        except Exception as e:
+            print(f"Sensor '{p.name}' error:", e)
+        dt_ms = (time.monotonic() - t0) * 1000.0
+        with self._cond:
+            st = self._stats[p.name]
+            st.polls += 1
+            st.last_ms = dt_ms
+            st.max_ms = max(st.max_ms, dt_ms)
+            st.total_ms += dt_ms
+            if values is None:
+                st.errors += 1
+            else:
+                st.last_ok = time.monotonic()
+        if values:
+            try:
+                self._on_result(p.name, values)
+            except Exception as e:
+                print("SystemMonitor error:", e)
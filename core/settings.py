@@ -18,6 +18,7 @@ class PowerSettings:
     auto_switch: bool = True
     cpu_util_threshold: int = 40
     gpu_util_threshold: int = 30
+    core_util_threshold: int = 90   # tek çekirdek (en sıcak) bu değeri aşarsa da yük sayılır
 
 @dataclass
 class PathsSettings:
@@ -52,6 +53,16 @@ class StartupSettings:
 class ToolsSettings:
     presentmon_path: str = ""
     rtss_hint_path: str = ""
+    # "pipe": CSV PresentMon stdout'undan okunur; "file": geçici dosya (boyut sınırıyla döndürülür)
+    presentmon_mode: str = "pipe"
+    presentmon_max_mb: int = 64
+    # her PresentMon oturumunun kare süreleri .pbcap olarak saklanır (core.frame_analysis ile A/B)
+    frame_capture: bool = True
+    frame_capture_dir: str = os.path.join(CONFIG_DIR, "captures")
+    frame_capture_keep: int = 50
+    # takılma: kare süresi kayan medyanın bu katını ve en az bu kadar ms fazlasını aşarsa (core.stutter_detect)
+    stutter_factor: float = 2.5
+    stutter_min_ms: float = 4.0
 
 @dataclass
 class PerformanceSettings:
@@ -62,6 +73,26 @@ class PerformanceSettings:
         "PulseBoost.exe", "PulseBoost", "python.exe", "powershell.exe", "SearchApp.exe"
     ])
     suspend_cpu_threshold: float = 1.0
+    # yeni süreçler oyun imzalarıyla eşleşince performans modu + PresentMon otomatik başlar
+    auto_detect_games: bool = True
+    # imzası olmayan süreçler için GPU sezgiseli (sistem geneli GPU kullanımı + sürecin CPU/RAM'i);
+    # süreç başına GPU sinyali olmadığından yanlış pozitif verebilir, bu yüzden isteğe bağlı
+    auto_detect_heuristic: bool = False
+    game_exes: list[str] = field(default_factory=list)      # core.game_detect listelerine ek
+    game_dirs: list[str] = field(default_factory=list)      # klasör adı ya da tam yol öneki
+    non_game_exes: list[str] = field(default_factory=list)
+    affinity_planner: bool = True        # oyuna en iyi çekirdek grubu, arka plana kalanlar
+    suspend_idle_seconds: float = 30.0   # bu kadar süre kesintisiz boşta kalan süreç askıya alınır
+    # boşta süreçlere ne yapılır: suspend (dondur) | cgroup (Linux cgroup v2 ile CPU tavanı)
+    idle_action: str = "suspend"
+    throttle_percent: float = 10.0       # cgroup: kısılan grubun toplam CPU kapasitesinden payı
+    cgroup_root: str = "/sys/fs/cgroup"
+    cgroup_io_weight: int = 0            # 0 = io.weight ayarlanmaz
+    # süreç kuralları (core.process_rules.RuleEngine): sırayla, ilk eşleşen kazanır
+    rules: list[dict] = field(default_factory=lambda: [
+        {"name": "sistem süreçleri", "when": {"name": "*system*"}, "suspend": "never"},
+        {"name": "svchost", "when": {"name": "svchost.exe"}, "suspend": "never"},
+    ])
 
 @dataclass
 class OverlaySettings:
@@ -77,10 +108,34 @@ class OverlaySettings:
         "ram": "#00e5ff",
         "gpu": "#ffb74d",
         "net": "#90caf9",
+        "disk": "#ff80ab",
         "temp": "#ff5252",
         "fps": "#e0e0e0",
     })
 
+@dataclass
+class MonitorSettings:
+    nvidia_smi_mode: str = "stream"   # stream (tek uzun ömürlü süreç), spawn (her örnekte yeni süreç)
+    net_interfaces: list[str] = field(default_factory=list)  # boş = loopback dışındaki tüm arayüzler
+
+@dataclass
+class DiagnosticsSettings:
+    profiling: bool = True
+    # bileşen -> tek çekirdeğin en fazla yüzde kaçını kullanabilir (10 sn pencerede aşılırsa loglanır)
+    budgets: dict = field(default_factory=lambda: {
+        "SystemMonitor.publish": 0.5,
+        "sensor.cpu": 0.5,
+        "sensor.memory": 0.2,
+        "sensor.nvml": 1.0,
+        "sensor.nvidia-smi": 1.0,
+        "sensor.net": 0.2,
+        "sensor.disk": 0.5,
+        "PresentMon.tail": 1.0,
+        "Overlay.render": 1.0,
+        "PerformanceMode.maintain": 2.0,
+        "GameWatcher.poll": 0.5,
+    })
+
 @dataclass
 class SpeedtestSettings:
     preferred_server_id: int | None = None
@@ -105,6 +160,8 @@ class Settings:
     speedtest: SpeedtestSettings = field(default_factory=SpeedtestSettings)
     benchmark: BenchmarkSettings = field(default_factory=BenchmarkSettings)
     hotkeys: HotkeySettings = field(default_factory=HotkeySettings)
+    monitor: MonitorSettings = field(default_factory=MonitorSettings)
+    diagnostics: DiagnosticsSettings = field(default_factory=DiagnosticsSettings)
 
     @staticmethod
     def load() -> "Settings":
@@ -113,7 +170,7 @@ class Settings:
                 with open(CONFIG_PATH, "r", encoding="utf-8") as f:
                     data = json.load(f)
                 s = Settings()
-                for key in ("ui","power","paths","recording","startup","tools","performance","overlay","speedtest","benchmark","hotkeys"):
+                for key in ("ui","power","paths","recording","startup","tools","performance","overlay","speedtest","benchmark","hotkeys","monitor","diagnostics"):
                     if key in data:
                         getattr(s, key).__dict__.update(data[key])
                 # overlay colors merge
@@ -142,4 +199,6 @@ class Settings:
                 "speedtest": asdict(self.speedtest),
                 "benchmark": asdict(self.benchmark),
                 "hotkeys": asdict(self.hotkeys),
+                "monitor": asdict(self.monitor),
+                "diagnostics": asdict(self.diagnostics),
             }, f, ensure_ascii=False, indent=2)
\ No newline at end of file
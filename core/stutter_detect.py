@@ -0,0 +1,302 @@
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+
+import numpy as np
+
+# takılma: kare süresi kayan medyanın STUTTER_FACTOR katını ve en az STUTTER_MIN_MS fazlasını aşarsa
+STUTTER_FACTOR = 2.5
+STUTTER_MIN_MS = 4.0
+MEDIAN_WINDOW = 64
+# medyan histogramı: MEDIAN_BIN_MS genişliğinde kutular, MEDIAN_MAX_MS üstü son kutuda
+MEDIAN_BIN_MS = 0.25
+MEDIAN_MAX_MS = 250.0
+# ritim salınımı (ör. 8/25/8/25 ms): son PACING_WINDOW karenin en az PACING_MIN_FLIPS'inde fark
+# yön değiştiriyor ve |fark| medyanın PACING_RATIO katından ve PACING_MIN_MS'den büyükse.
+# Bağımsız gürültüde fark yönü karelerin ~2/3'ünde değişir; eşik bunun belirgin üstünde olmalı.
+PACING_WINDOW = 16
+PACING_MIN_FLIPS = 14
+PACING_RATIO = 0.5
+PACING_MIN_MS = 2.0
+# sistem durumu ipuçları
+CAUSE_DISK_BUSY = 60.0
+CAUSE_DISK_READ_BPS = 50e6
+CAUSE_CPU_CORE = 95.0
+CAUSE_GPU_UTIL = 97.0
+SYSTEM_FIELDS = ("cpu_percent", "cpu_hot_core", "cpu_hot_core_percent", "ram_percent", "gpu_util",
+                 "disk_read_bps", "disk_write_bps", "disk_busy_percent", "disk_latency_ms")
+MAX_EVENTS = 256
+# detect_array: kayan medyan pencereleri bu kadar satırlık parçalarla hesaplanır (bellek sınırı)
+DETECT_CHUNK = 1 << 16
+# detect_array kayan medyanı: MEDIAN_BLOCK karelik bloklarda, bloğun kaba medyanının ±MEDIAN_SPAN
+# kutusu sayarak bulunur; dışına düşenler (nadir) tam sıralamayla
+MEDIAN_BLOCK = 512
+MEDIAN_SPAN = 1
+
+class RollingMedian:
+    """
+    Son `window` değerin medyanı, MEDIAN_BIN_MS çözünürlüğünde. Değerler kutu sayaçlarında tutulur
+    ve medyan kutusu işaretçisi her ekle/çıkarda yalnızca gerektiği kadar kaydırılır: dağılım
+    sabitken değer başına O(1), kutu genişliği kadar hata.
+    """
+    __slots__ = ("window", "bin_ms", "counts", "ring", "head", "n", "m", "below", "top")
+
+    def __init__(self, window: int = MEDIAN_WINDOW, bin_ms: float = MEDIAN_BIN_MS, max_ms: float = MEDIAN_MAX_MS):
+        self.window = window
+        self.bin_ms = bin_ms
+        self.top = int(max_ms / bin_ms)
+        self.counts = [0] * (self.top + 1)
+        self.ring = [0] * window
+        self.head = 0
+        self.n = 0
+        self.m = 0          # medyan kutusu
+        self.below = 0      # m'den küçük kutulardaki değer sayısı
+
+    def add(self, x: float):
+        b = int(x / self.bin_ms)
+        if b > self.top:
+            b = self.top
+        counts = self.counts
+        if self.n == self.window:
+            old = self.ring[self.head]
+            counts[old] -= 1
+            if old < self.m:
+                self.below -= 1
+        else:
+            self.n += 1
+        self.ring[self.head] = b
+        self.head = (self.head + 1) % self.window
+        counts[b] += 1
+        if b < self.m:
+            self.below += 1
+        rank = (self.n + 1) // 2
+        while self.below + counts[self.m] < rank:
+            self.below += counts[self.m]
+            self.m += 1
+        while self.below >= rank:
+            self.m -= 1
+            self.below -= counts[self.m]
+
+    def value(self) -> float:
+        return (self.m + 0.5) * self.bin_ms if self.n else 0.0
+
+@dataclass
+class StutterEvent:
+    kind: str                   # "stutter" / "pacing"
+    t: float                    # PresentMon zamanı (sn)
+    wall: float                 # time.time()
+    ms: float                   # takılan kare (pacing: son kare)
+    median_ms: float
+    pid: int | None = None
+    swapchain: str = ""
+    cause: str = ""             # "io" / "cpu" / "gpu" / "" (sistem durumundan ipucu)
+    system: dict = field(default_factory=dict)
+
+    def as_dict(self) -> dict:
+        return {"kind": self.kind, "t": self.t, "wall": self.wall, "ms": self.ms, "median_ms": self.median_ms,
+                "pid": self.pid, "swapchain": self.swapchain, "cause": self.cause, "system": self.system}
+
+def guess_cause(system: dict) -> str:
+    """Takılma anındaki SystemMonitor durumundan kaba neden: disk G/Ç (ör. shader derleme), CPU, GPU."""
+    if (system.get("disk_busy_percent") or 0) >= CAUSE_DISK_BUSY or (system.get("disk_read_bps") or 0) >= CAUSE_DISK_READ_BPS:
+        return "io"
+    if (system.get("cpu_hot_core_percent") or 0) >= CAUSE_CPU_CORE:
+        return "cpu"
+    if (system.get("gpu_util") or 0) >= CAUSE_GPU_UTIL:
+        return "gpu"
+    return ""
+
+class StutterDetector:
+    """
+    Baskın akışın kare süreleri üzerinde akış hâlinde takılma ve ritim salınımı tespiti.
+    add() kare başına O(1): kayan medyan (RollingMedian), salınım için son PACING_WINDOW karenin
+    bayrakları bir ring'de ve toplamı sayaçta tutulur. Olay bulunursa SystemMonitor'un o anki
+    durumu eklenir, son MAX_EVENTS olay `events` içinde tutulur ve aboneler çağrılır (okuyucu iş
+    parçacığında; Qt tarafı kuyruklu sinyal kullanmalı).
+    Ritim olayı salınım başlayınca bir kez yayınlanır; salınım bitene kadar tekrarlanmaz.
+    """
+    def __init__(self, system_monitor=None, factor: float = STUTTER_FACTOR, min_ms: float = STUTTER_MIN_MS,
+                 window: int = MEDIAN_WINDOW):
+        self._mon = system_monitor
+        self.factor = factor
+        self.min_ms = min_ms
+        self.window = window
+        self.events: deque[StutterEvent] = deque(maxlen=MAX_EVENTS)
+        self._lock = threading.Lock()
+        self._subscribers: dict[int, object] = {}
+        self._next_token = 0
+        self.reset()
+
+    def reset(self, pid: int | None = None, swapchain: str = ""):
+        self.pid = pid
+        self.swapchain = swapchain
+        self._median = RollingMedian(self.window)
+        self._prev = None
+        self._prev_diff = 0.0
+        self._flips = [False] * PACING_WINDOW
+        self._flip_i = 0
+        self._flip_n = 0
+        self._pacing = False
+        self.frames = 0
+        self.stutters = 0
+        self.pacing_events = 0
+
+    def subscribe(self, callback) -> int:
+        """Her olayda callback(StutterEvent); dönen belirteç unsubscribe içindir."""
+        with self._lock:
+            self._next_token += 1
+            self._subscribers[self._next_token] = callback
+            return self._next_token
+
+    def unsubscribe(self, token: int):
+        with self._lock:
+            self._subscribers.pop(token, None)
+
+    def add(self, ms: float, t: float):
+        med = self._median.value()
+        warm = self.frames >= self.window // 2
+        self.frames += 1
+        # salınım sürerken uzun kareler ayrı takılma sayılmaz (ritim olayı zaten yayınlandı)
+        if warm and not self._pacing and ms > med * self.factor and ms - med >= self.min_ms:
+            self.stutters += 1
+            self._emit("stutter", ms, med, t)
+        self._median.add(ms)
+
+        # ritim: farkın yönü her karede değişiyor ve fark medyana göre büyükse salınım bayrağı
+        flip = False
+        if self._prev is not None:
+            diff = ms - self._prev
+            flip = diff * self._prev_diff < 0 and abs(diff) > max(PACING_RATIO * med, PACING_MIN_MS)
+            self._prev_diff = diff
+        self._prev = ms
+        i = self._flip_i
+        self._flip_n += flip - self._flips[i]
+        self._flips[i] = flip
+        self._flip_i = (i + 1) % PACING_WINDOW
+        if self._flip_n >= PACING_MIN_FLIPS:
+            if not self._pacing and warm:
+                self._pacing = True
+                self.pacing_events += 1
+                self._emit("pacing", ms, med, t)
+        elif self._flip_n <= PACING_MIN_FLIPS // 2:
+            self._pacing = False
+
+    def extend(self, frames):
+        """(ms, t) kareleri."""
+        add = self.add
+        for ms, t in frames:
+            add(ms, t)
+
+    def _system_state(self) -> dict:
+        snap = self._mon.get() if self._mon else None
+        if snap is None:
+            return {}
+        return {k: getattr(snap, k, None) for k in SYSTEM_FIELDS}
+
+    def _emit(self, kind: str, ms: float, med: float, t: float):
+        system = self._system_state()
+        ev = StutterEvent(kind, t, time.time(), ms, med, self.pid, self.swapchain, guess_cause(system), system)
+        self.events.append(ev)
+        with self._lock:
+            subs = tuple(self._subscribers.values())
+        for cb in subs:
+            try:
+                cb(ev)
+            except Exception as e:
+                print("StutterDetector subscriber error:", e)
+
+def _rolling_median(ms: np.ndarray, window: int, bin_ms: float, max_ms: float) -> np.ndarray:
+    """
+    Her karenin *öncesindeki* `window` karenin medyanı; RollingMedian ile aynı tanım (MEDIAN_BIN_MS
+    kutuları, alt medyan, kutu ortası). İlk `window` kare kısmi pencereyle RollingMedian'dan.
+    Kalanlar MEDIAN_BLOCK karelik bloklarda sayarak bulunur: bloğun kaba medyan kutusu c etrafındaki
+    her t eşiği için pencerede <= t kutu sayısı birikimli toplamla hesaplanır; medyan, sayısı
+    sıraya (alt medyan) ulaşan ilk t'dir. Medyanı bu aralığın dışına düşen kareler (ör. ritim
+    salınımında iki tepe arasında) np.partition ile tam hesaplanır.
+    """
+    n = len(ms)
+    med = np.zeros(n, dtype=np.float64)
+    rm = RollingMedian(window, bin_ms, max_ms)
+    head = min(n, window)
+    for i in range(head):
+        med[i] = rm.value()
+        rm.add(float(ms[i]))
+    if n <= window:
+        return med
+    top = int(max_ms / bin_ms)
+    bins = np.minimum((ms / bin_ms).astype(np.int64), top).astype(np.int16)
+    rank = (window + 1) // 2
+    size = MEDIAN_BLOCK
+    m = n - window
+    nb = -(-m // size)
+    # blok j'nin q. karesi (a = window + j*size + q) için pencere padded[j*size + q:][:window];
+    # son blok doldurulur, dolgu sonuçları atılır
+    padded = np.concatenate((bins, np.full(nb * size - m, bins[-1], dtype=np.int16)))
+    segs = np.lib.stride_tricks.sliding_window_view(padded, size + window)[::size]
+    out = np.empty(nb * size, dtype=np.int16)
+    rows = max(1, DETECT_CHUNK // size * 16)
+    mid = (size + window) // 2
+    for r in range(0, nb, rows):
+        seg = segs[r:r + rows]
+        lo = (np.partition(seg, mid, axis=1)[:, mid] - (MEDIAN_SPAN + 1))[:, None]
+        below = np.zeros((len(seg), size), dtype=np.int16)
+        for d in range(2 * MEDIAN_SPAN + 2):
+            c = np.cumsum(seg <= lo + d, axis=1, dtype=np.int16)
+            cnt = c[:, window - 1:window - 1 + size].copy()
+            cnt[:, 1:] -= c[:, :size - 1]
+            below += cnt < rank
+        res = lo + below
+        # sıra ilk eşikte zaten doluysa ya da son eşikte hâlâ dolmadıysa medyan aralık dışında
+        res[(below == 0) | (below == 2 * MEDIAN_SPAN + 2)] = -1
+        out[r * size:(r + len(seg)) * size] = res.ravel()
+    out = out[:m]
+    miss = np.flatnonzero(out < 0)
+    if len(miss):
+        windows = np.lib.stride_tricks.sliding_window_view(bins, window)
+        for a in range(0, len(miss), DETECT_CHUNK):
+            sel = miss[a:a + DETECT_CHUNK]
+            out[sel] = np.partition(windows[sel], rank - 1, axis=1)[:, rank - 1]
+    med[window:] = (out + 0.5) * bin_ms
+    return med
+
+def detect_array(ms, factor: float = STUTTER_FACTOR, min_ms: float = STUTTER_MIN_MS,
+                 window: int = MEDIAN_WINDOW) -> tuple[np.ndarray, np.ndarray]:
+    """
+    StutterDetector'ın kare dizisi üzerindeki toplu (çevrimdışı) karşılığı: aynı kayan medyan,
+    ısınma, ritim salınımı histerezisi ve salınım sırasında takılma bastırma. Milyonlarca karede
+    NumPy ile çalışır. (takılma kare indisleri, ritim olayı kare indisleri) döndürür.
+    """
+    ms = np.asarray(ms, dtype=np.float64)
+    n = len(ms)
+    empty = np.empty(0, dtype=np.int64)
+    if n == 0:
+        return empty, empty
+    med = _rolling_median(ms, window, MEDIAN_BIN_MS, MEDIAN_MAX_MS)
+    warm = window // 2
+
+    # ritim: kare i'nin farkı bir öncekiyle ters yönde ve |fark| medyana göre büyük
+    flip = np.zeros(n, dtype=bool)
+    if n > 2:
+        d = np.diff(ms)
+        flip[2:] = (d[1:] * d[:-1] < 0) & (np.abs(d[1:]) > np.maximum(PACING_RATIO * med[2:], PACING_MIN_MS))
+    # son PACING_WINDOW karedeki bayrak sayısı
+    count = np.cumsum(flip, dtype=np.int32)
+    count[PACING_WINDOW:] -= count[:-PACING_WINDOW].copy()
+    # histerezis: salınım açılır (>= PACING_MIN_FLIPS, ısınmış), kapanır (<= yarısı), arada sürer.
+    # Açılma kareleri seyrek; kapanmalar birikimli sayaçla aralık sorgusuna dönüşür
+    on = np.flatnonzero(count[warm:] >= PACING_MIN_FLIPS) + warm
+    offs = np.cumsum(count <= PACING_MIN_FLIPS // 2, dtype=np.int32)
+    # önceki açılmadan bu yana kapanma olduysa (ya da ilk açılmaysa) yeni ritim olayı
+    prev = np.concatenate(([-1], on[:-1]))
+    onset = (prev < 0) | (offs[on - 1] > offs[np.maximum(prev, 0)])
+
+    cand = np.flatnonzero((ms[warm:] > med[warm:] * factor) & (ms[warm:] - med[warm:] >= min_ms)) + warm
+    # bir önceki karenin ardından salınım sürüyorsa takılma sayılmaz: o kareye kadarki son açılmadan
+    # sonra kapanma yok
+    if len(on) == 0:
+        return cand, on
+    before = np.maximum(cand - 1, 0)
+    k = np.searchsorted(on, before, side="right") - 1
+    pacing = (k >= 0) & (cand > 0) & (offs[before] == offs[on[np.maximum(k, 0)]])
+    return cand[~pacing], on[onset]
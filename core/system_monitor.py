@@ -1,128 +1,280 @@
 import time
 import threading
-import psutil
-import shutil
-import subprocess
-
-# NVML (NVIDIA)
-try:
-    import pynvml
-    pynvml.nvmlInit()
-    NVML_AVAILABLE = True
-except Exception:
-    NVML_AVAILABLE = False
+
+from core.profiler import PROFILER
+from core.metric_history import MetricHistory, DEFAULT_CAPACITY
+from core.sensors import (
+    SensorProvider, SensorScheduler, CpuProvider, MemoryProvider, NvmlProvider,
+    NvidiaSmiProvider, NvidiaSmiStreamProvider, NetProvider, DiskProvider,
+)
 
 GiB = 1024 ** 3
 
+# Geçmişte tutulan metrikler (SystemSnapshot alan adlarıyla aynı)
+HISTORY_METRICS = (
+    "cpu_percent", "cpu_freq", "cpu_hot_core_percent", "ram_used", "ram_percent",
+    "gpu_util", "gpu_mem_used", "gpu_temp", "gpu_power_w",
+    "net_up", "net_down",
+    "disk_read_bps", "disk_write_bps", "disk_busy_percent",
+)
+
+# Alan adı -> varsayılan değer
+SNAPSHOT_DEFAULTS = {
+    "cpu_percent": 0.0,
+    "cpu_freq": 0.0,
+    "cpu_temp": None,
+    "cpu_power_w": None,
+    # çekirdek başına (array('f')); en sıcak çekirdek = en yüksek kullanımlı çekirdek
+    "cpu_core_percent": (),
+    "cpu_core_freq": (),
+    "cpu_hot_core": 0,
+    "cpu_hot_core_percent": 0.0,
+
+    "ram_used": 0,
+    "ram_total": 0,
+    "ram_percent": 0.0,
+
+    "gpu_util": None,
+    "gpu_mem_used": None,
+    "gpu_mem_total": None,
+    "gpu_temp": None,
+    "gpu_power_w": None,
+    # GPU başına (NVML; gpu_names ile aynı sırada, array('d'), NaN = okunamadı)
+    "gpu_names": (),
+    "gpus_util": (),
+    "gpus_mem_used": (),
+    "gpus_mem_total": (),
+    "gpus_temp": (),
+    "gpus_power_w": (),
+
+    "net_up": 0,
+    "net_down": 0,
+    # arayüz başına (net_nics ile aynı sırada, array('d'))
+    "net_nics": (),
+    "net_nic_up": (),
+    "net_nic_down": (),
+
+    # disk G/Ç: toplamlar (busy = en meşgul disk) ve disk_names sırasıyla disk başına diziler
+    "disk_read_bps": 0.0,
+    "disk_write_bps": 0.0,
+    "disk_iops": 0.0,
+    "disk_latency_ms": 0.0,
+    "disk_busy_percent": 0.0,
+    "disk_names": (),
+    "disks_read_bps": (),
+    "disks_write_bps": (),
+    "disks_iops": (),
+    "disks_latency_ms": (),
+    "disks_busy_percent": (),
+
+    # zamanlayıcının kaçırdığı toplam son tarih sayısı (tüm sağlayıcılar)
+    "missed_deadlines": 0,
+}
+
 class SystemSnapshot:
-    def __init__(self):
-        self.cpu_percent = 0.0
-        self.cpu_freq = 0.0
-        self.cpu_temp = None
-        self.cpu_power_w = None
+    """
+    Değişmez anlık görüntü. SystemMonitor her yayında yeni bir nesne oluşturur ve referansı
+    atomik olarak değiştirir; okuyucular hiçbir zaman yarım güncellenmiş bir görüntü görmez.
+    seq: monoton artan yayın numarası, captured_at: ölçüm zamanı (time.monotonic).
+    """
+    __slots__ = tuple(SNAPSHOT_DEFAULTS) + ("seq", "captured_at")
 
-        self.ram_used = 0
-        self.ram_total = 0
-        self.ram_percent = 0.0
+    def __init__(self, seq: int = 0, captured_at: float = 0.0, values: dict | None = None):
+        values = values or {}
+        for k, v in SNAPSHOT_DEFAULTS.items():
+            object.__setattr__(self, k, values.get(k, v))
+        object.__setattr__(self, "seq", seq)
+        object.__setattr__(self, "captured_at", captured_at)
 
-        self.gpu_util = None
-        self.gpu_mem_used = None
-        self.gpu_mem_total = None
-        self.gpu_temp = None
-        self.gpu_power_w = None
+    def __setattr__(self, name, value):
+        raise AttributeError("SystemSnapshot değiştirilemez")
 
-        self.net_up = 0
-        self.net_down = 0
+    def as_dict(self) -> dict:
+        return {k: getattr(self, k) for k in self.__slots__}
+
+# Uyarlamalı örnekleme: tüketici yoksa aralıklar bu katsayıyla uzar
+IDLE_FACTOR = 5.0
+# Yüksek çözünürlük (oyun/PresentMon oturumu) aralıkları (saniye); listede olmayanlar normal hızda kalır
+HIGH_RES_RATES = {"cpu": 0.5, "nvml": 0.25, "nvidia-smi": 0.25, "net": 0.5, "disk": 0.5}
+
+class _Subscriber:
+    __slots__ = ("callback", "min_interval", "last")
+
+    def __init__(self, callback, min_interval: float):
+        self.callback = callback
+        self.min_interval = min_interval
+        self.last = 0.0
 
 class SystemMonitor:
-    def __init__(self, interval=1.0):
+    """
+    Sağlayıcıları (cpu, memory, nvml/nvidia-smi, net, disk) kendi hızlarında örnekler ve
+    sonuçları tek bir SystemSnapshot'ta birleştirir. Geçmiş `interval` aralığıyla kaydedilir.
+
+    Örnekleme hızı tüketicilere uyar: abone yoksa "idle" (aralıklar x IDLE_FACTOR), abonelerin
+    en sık istediği aralığa göre "normal", request_high_resolution() tutan biri varsa "high".
+    """
+    # Varsayılan sağlayıcı aralıkları (saniye); None -> `interval`
+    DEFAULT_RATES = {"cpu": None, "memory": 2.0, "nvml": None, "nvidia-smi": None, "net": None, "disk": None}
+
+    def __init__(self, interval=1.0, history_capacity: int = DEFAULT_CAPACITY, rates: dict | None = None,
+                 nvidia_smi_mode: str = "stream", net_interfaces: list[str] | None = None):
         self.interval = interval
-        self.snapshot = SystemSnapshot()
+        self.nvidia_smi_mode = nvidia_smi_mode
+        self.net_interfaces = list(net_interfaces or [])
+        self._values = dict(SNAPSHOT_DEFAULTS)
+        self._seq = 0
+        self._snapshot = SystemSnapshot()
+        self.history = MetricHistory(HISTORY_METRICS, history_capacity)
+        self._lock = threading.Lock()
+        self._last_history = 0.0
+        self._scheduler = SensorScheduler(self._make_providers(rates or {}), self._on_result)
         self._running = False
-        self._thread = None
-        self._last_net = psutil.net_io_counters()
-        self._have_nvidia_smi = shutil.which("nvidia-smi") is not None
+        self._subscribers: dict[int, _Subscriber] = {}
+        self._next_token = 0
+        self._base_rates = {name: p.interval for name, p in self._scheduler.providers.items()}
+        self._high_res: set[str] = set()
+        self._policy = None
+        self._policy_lock = threading.Lock()
+
+    def _make_providers(self, rates: dict) -> list[SensorProvider]:
+        def rate(name):
+            r = rates.get(name, self.DEFAULT_RATES.get(name))
+            return r if r else self.interval
+        providers = [CpuProvider(rate("cpu")), MemoryProvider(rate("memory"))]
+        # GPU: NVML varsa onu, yoksa nvidia-smi (stream: kalıcı süreç, spawn: her örnekte yeni süreç)
+        smi_cls = NvidiaSmiStreamProvider if self.nvidia_smi_mode == "stream" else NvidiaSmiProvider
+        for gpu in (NvmlProvider(rate("nvml")), smi_cls(rate("nvidia-smi"))):
+            if gpu.available():
+                providers.append(gpu)
+                break
+        providers.append(NetProvider(rate("net"), self.net_interfaces))
+        providers.append(DiskProvider(rate("disk")))
+        return providers
 
     def start(self):
         if self._running:
             return
         self._running = True
-        self._thread = threading.Thread(target=self._run, daemon=True)
-        self._thread.start()
+        self._apply_policy()
+        self._scheduler.start()
 
     def stop(self):
         self._running = False
-        if self._thread:
-            self._thread.join(timeout=2)
+        self._scheduler.stop()
+
+    def set_rate(self, provider: str, interval: float):
+        """Sağlayıcının temel aralığını değiştirir (ör. set_rate("memory", 5.0)); politika çarpanı üstüne uygulanır."""
+        if provider in self._base_rates and interval > 0:
+            self._base_rates[provider] = interval
+            self._apply_policy(force=True)
 
-    def _run(self):
-        while self._running:
+    @property
+    def mode(self) -> str:
+        return self._policy[0] if self._policy else "normal"
+
+    def request_high_resolution(self, owner: str):
+        """Oyun/PresentMon oturumu gibi bir sahip için yüksek çözünürlüklü örneklemeyi açar."""
+        with self._lock:
+            self._high_res.add(owner)
+        self._apply_policy()
+
+    def release_high_resolution(self, owner: str):
+        with self._lock:
+            self._high_res.discard(owner)
+        self._apply_policy()
+
+    def _apply_policy(self, force: bool = False):
+        with self._policy_lock:
+            with self._lock:
+                demands = [sub.min_interval or self.interval for sub in self._subscribers.values()]
+                high = bool(self._high_res)
+            if high:
+                policy = ("high", 1.0)
+            elif not demands:
+                policy = ("idle", IDLE_FACTOR)
+            else:
+                # en sık isteyen tüketici kadar hızlı, ama temel aralıktan hızlı değil
+                policy = ("normal", max(1.0, min(demands) / self.interval))
+            if policy == self._policy and not force:
+                return
+            self._policy = policy
+            mode, factor = policy
+            for name, base in self._base_rates.items():
+                if mode == "high":
+                    rate = min(base, HIGH_RES_RATES.get(name, base))
+                else:
+                    rate = base * factor
+                self._scheduler.set_interval(name, rate)
+
+    def set_net_interfaces(self, interfaces: list[str]):
+        """Ağ toplamlarına girecek arayüzler; boş liste = loopback dışındaki tümü."""
+        self.net_interfaces = list(interfaces or [])
+        net = self._scheduler.providers.get("net")
+        if net:
+            net.interfaces = frozenset(self.net_interfaces)
+
+    def provider_stats(self) -> dict:
+        """Sağlayıcı başına zamanlama istatistikleri (poll sayısı, hata, atlanan, ms)."""
+        return self._scheduler.stats()
+
+    def _on_result(self, provider: str, values: dict):
+        with PROFILER.measure("SystemMonitor.publish"):
+            self._publish(values)
+
+    def _publish(self, values: dict):
+        now = time.monotonic()
+        with self._lock:
+            cur = self._values
+            for k, v in values.items():
+                if k in cur:
+                    cur[k] = v
+            cur["missed_deadlines"] = self._scheduler.missed_total
+            self._seq += 1
+            # referans ataması atomiktir: okuyucular eski ya da yeni nesneyi bütün olarak görür
+            self._snapshot = SystemSnapshot(self._seq, now, cur)
+            snap = self._snapshot
+            if now - self._last_history >= self.interval * 0.95:
+                self._last_history = now
+                self.history.append(now, {m: cur[m] for m in HISTORY_METRICS})
+            subs = tuple(self._subscribers.values())
+        self._deliver(subs, snap, now)
+
+    def _deliver(self, subs, snap: SystemSnapshot, now: float):
+        for sub in subs:
+            if sub.min_interval and now - sub.last < sub.min_interval:
+                continue
+            sub.last = now
             try:
-                self._collect()
+                sub.callback(snap)
             except Exception as e:
-                print("SystemMonitor error:", e)
-            time.sleep(self.interval)
-
-    def _collect(self):
-        s = self.snapshot
-        # CPU
-        s.cpu_percent = psutil.cpu_percent(interval=None)
-        try:
-            cf = psutil.cpu_freq()
-            s.cpu_freq = cf.current if cf else 0.0
-        except Exception:
-            s.cpu_freq = 0.0
-
-        # RAM (Windows'ta used ~ total - available)
-        vm = psutil.virtual_memory()
-        s.ram_total = vm.total
-        s.ram_used = vm.total - vm.available
-        s.ram_percent = vm.percent
-
-        # GPU
-        if NVML_AVAILABLE:
-            try:
-                h = pynvml.nvmlDeviceGetHandleByIndex(0)
-                util = pynvml.nvmlDeviceGetUtilizationRates(h)
-                mem = pynvml.nvmlDeviceGetMemoryInfo(h)
-                s.gpu_util = util.gpu
-                s.gpu_mem_used = mem.used
-                s.gpu_mem_total = mem.total
-                try:
-                    s.gpu_temp = pynvml.nvmlDeviceGetTemperature(h, pynvml.NVML_TEMPERATURE_GPU)
-                except Exception:
-                    s.gpu_temp = None
-                try:
-                    s.gpu_power_w = pynvml.nvmlDeviceGetPowerUsage(h) / 1000.0
-                except Exception:
-                    s.gpu_power_w = None
-            except Exception:
-                s.gpu_util = None
-        elif self._have_nvidia_smi:
-            try:
-                out = subprocess.check_output([
-                    "nvidia-smi",
-                    "--query-gpu=utilization.gpu,memory.used,memory.total,temperature.gpu,power.draw",
-                    "--format=csv,noheader,nounits"
-                ], text=True, stderr=subprocess.DEVNULL, timeout=1.5)
-                line = out.strip().splitlines()[0]
-                u, mu, mt, t, p = [x.strip() for x in line.split(",")]
-                s.gpu_util = float(u)
-                s.gpu_mem_used = float(mu) * 1024 * 1024
-                s.gpu_mem_total = float(mt) * 1024 * 1024
-                s.gpu_temp = float(t)
-                s.gpu_power_w = float(p)
-            except Exception:
-                s.gpu_util = None
-        else:
-            s.gpu_util = None
-
-        # Network throughput
-        now_net = psutil.net_io_counters()
-        dt = max(self.interval, 1e-6)
-        s.net_up = (now_net.bytes_sent - self._last_net.bytes_sent) / dt
-        s.net_down = (now_net.bytes_recv - self._last_net.bytes_recv) / dt
-        self._last_net = now_net
+                print("SystemMonitor subscriber error:", e)
+
+    def subscribe(self, callback, min_interval: float = 0.0) -> int:
+        """
+        Her yayında callback(snapshot) çağrılır (sensör iş parçacığında; kısa tutulmalı).
+        min_interval > 0 ise teslimatlar en az o kadar saniye aralıklı olur.
+        Qt tarafı için ui.snapshot_relay.SnapshotRelay kullanılır. Dönen belirteç unsubscribe içindir.
+        """
+        with self._lock:
+            self._next_token += 1
+            token = self._next_token
+            self._subscribers[token] = _Subscriber(callback, float(min_interval or 0.0))
+        self._apply_policy()
+        return token
+
+    def unsubscribe(self, token: int):
+        with self._lock:
+            self._subscribers.pop(token, None)
+        self._apply_policy()
+
+    @property
+    def snapshot(self) -> SystemSnapshot:
+        return self._snapshot
 
     def get(self) -> SystemSnapshot:
-        return self.snapshot
\ No newline at end of file
+        return self._snapshot
+
+    def get_if_newer(self, seq: int) -> SystemSnapshot | None:
+        """`seq`'ten yeni bir yayın varsa onu, yoksa None döndürür."""
+        s = self._snapshot
+        return s if s.seq > seq else None
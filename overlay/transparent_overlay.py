@@ -2,6 +2,9 @@ from PySide6.QtWidgets import QWidget, QLabel, QVBoxLayout
 from PySide6.QtCore import Qt, QTimer, QRect
 from PySide6.QtGui import QGuiApplication
 
+from ui.snapshot_relay import SnapshotRelay
+from core.profiler import PROFILER
+
 # Bu overlay artık skin/renk/konum ayarlarını Settings.overlay içinden okur.
 
 class SimpleOverlay(QWidget):
@@ -12,14 +15,18 @@ class SimpleOverlay(QWidget):
         self._mon = system_monitor
         self._pm = presentmon
         self._settings = settings
+        self._last_seq = -1
+        self._last_fps = None
 
         self.label = QLabel("", self)
         layout = QVBoxLayout(self)
         layout.setContentsMargins(8, 8, 8, 8)
         layout.addWidget(self.label)
+        # Sistem metrikleri yayınla gelir; zamanlayıcı yalnızca PresentMon çalışırken FPS için
+        self._relay = SnapshotRelay(system_monitor, 0.5, self)
+        self._relay.snapshot.connect(self._on_snapshot, Qt.QueuedConnection)
         self._timer = QTimer(self)
         self._timer.timeout.connect(self._tick)
-        self._timer.start(500)
 
         self.apply_config()
 
@@ -55,7 +62,10 @@ class SimpleOverlay(QWidget):
         # Skin’e göre satırları oluştur
         o = self._settings.overlay
         colors = o.colors
-        cpu = f"<span style='color:{colors.get('cpu','#7cff6b')}'>CPU {s.cpu_percent:.0f}% @ {float(s.cpu_freq or 0):.0f}MHz</span>"
+        hot = ""
+        if len(getattr(s, 'cpu_core_percent', ())) > 1:
+            hot = f" • C{s.cpu_hot_core} {s.cpu_hot_core_percent:.0f}%"
+        cpu = f"<span style='color:{colors.get('cpu','#7cff6b')}'>CPU {s.cpu_percent:.0f}%{hot} @ {float(s.cpu_freq or 0):.0f}MHz</span>"
         ram = f"<span style='color:{colors.get('ram','#00bcd4')}'>RAM {(s.ram_used or 0)/1_073_741_824:.1f}/{(s.ram_total or 0)/1_073_741_824:.1f}GiB ({getattr(s,'ram_percent',0):.0f}%)</span>"
         gpu_parts = []
         if s.gpu_util is not None:
@@ -65,25 +75,32 @@ class SimpleOverlay(QWidget):
         if getattr(s, 'gpu_power_w', None) is not None:
             gpu_parts.append(f"{s.gpu_power_w:.0f}W")
         gpu_txt = " ".join(gpu_parts) if gpu_parts else "—"
+        # Birden fazla GPU varsa diğerlerinin kullanımını ekle
+        others = list(getattr(s, 'gpus_util', ()))[1:]
+        if others:
+            gpu_txt += "".join(f" • G{i} {u:.0f}%" for i, u in enumerate(others, 1) if u == u)
         gpu = f"<span style='color:{colors.get('gpu','#ffb74d')}'>GPU {gpu_txt}</span>"
         net = f"<span style='color:{colors.get('net','#90caf9')}'>↑ {getattr(s,'net_up',0)/1e6:.2f}MB/s ↓ {getattr(s,'net_down',0)/1e6:.2f}MB/s</span>"
+        disk = f"<span style='color:{colors.get('disk','#ff80ab')}'>DISK R {getattr(s,'disk_read_bps',0)/1e6:.1f} W {getattr(s,'disk_write_bps',0)/1e6:.1f}MB/s {getattr(s,'disk_busy_percent',0):.0f}%</span>"
         fps = ""
         try:
-            if self._pm and self._pm.sample.fps > 0:
-                fps = f"<span style='color:{colors.get('fps','#e0e0e0')}'>FPS {self._pm.sample.fps:.0f}</span>"
+            st = self._pm.stats.snapshot() if self._pm else None
+            if st is not None and st.avg_fps > 0:
+                fps = (f"<span style='color:{colors.get('fps','#e0e0e0')}'>FPS {st.avg_fps:.0f} • "
+                       f"1% {st.low_1:.0f} • 0.1% {st.low_01:.0f}</span>")
         except Exception:
             pass
 
         skin = o.skin
         cols = o.grid_columns
         if skin in ("minimal","mono"):
-            return "<br>".join([cpu, ram, gpu, net, fps])
+            return "<br>".join([cpu, ram, gpu, net, disk, fps])
         elif skin in ("stacked","neon"):
-            parts = [cpu, gpu, ram, net, fps]
+            parts = [cpu, gpu, ram, net, disk, fps]
             return "<br>".join([p for p in parts if p])
         elif skin in ("grid2","grid3","cards","bars","compact-corners","afterburner-like"):
             # basit grid: cols kadar yan yana, <table> ile
-            items = [cpu, gpu, ram, net]
+            items = [cpu, gpu, ram, net, disk]
             if fps: items.append(fps)
             rows = []
             for i in range(0, len(items), cols):
@@ -92,13 +109,41 @@ class SimpleOverlay(QWidget):
                 rows.append(f"<tr>{tds}</tr>")
             return f"<table style='border-spacing:0px 2px'>{''.join(rows)}</table>"
         else:
-            return "<br>".join([cpu, ram, gpu, net, fps])
+            return "<br>".join([cpu, ram, gpu, net, disk, fps])
+
+    def _on_snapshot(self, s):
+        if s.seq <= self._last_seq:
+            return
+        pm_running = bool(self._pm and getattr(self._pm, "_running", False))
+        if pm_running and not self._timer.isActive():
+            self._timer.start(500)
+        elif not pm_running and self._timer.isActive():
+            self._timer.stop()
+        self._render(s)
+
+    def _fps_key(self):
+        if not self._pm:
+            return None
+        st = self._pm.stats.snapshot()
+        return round(st.avg_fps), round(st.low_1), round(st.low_01)
 
     def _tick(self):
+        # Yalnızca FPS / low değerleri değiştiyse yeniden çiz
+        if self._fps_key() != self._last_fps:
+            self._render(self._mon.get())
+
+    def _render(self, s):
         try:
-            s = self._mon.get()
-            html = self._format_lines(s)
-            self.label.setText(f"<div>{html}</div>")
-            self._reposition()
+            with PROFILER.measure("Overlay.render"):
+                self._last_seq = s.seq
+                self._last_fps = self._fps_key()
+                html = self._format_lines(s)
+                self.label.setText(f"<div>{html}</div>")
+                self._reposition()
         except Exception:
-            pass
\ No newline at end of file
+            pass
+
+    def closeEvent(self, event):
+        self._relay.close()
+        self._timer.stop()
+        super().closeEvent(event)
\ No newline at end of file
@@ -0,0 +1,94 @@
+"""
+Windows topolojisi (GetLogicalProcessorInformationEx tamponu) ve topolojinin okunamadığı yol:
+bilinmeyen topolojide çekirdek planı yapılmaz ve PerformanceMode hiçbir süreci sabitlemez.
+
+    python -m pytest tests
+"""
+import struct
+
+import core.cpu_topology as cpu_topology
+from benchmarks.process_sim import SimProcessProvider
+from core.cpu_topology import (
+    CpuTopology, RELATION_CACHE, RELATION_PROCESSOR_CORE, RELATION_PROCESSOR_PACKAGE,
+    parse_processor_info, plan_affinity,
+)
+from core.process_manager import PerformanceMode
+from core.process_table import ProcessTable
+
+def masks(cpus, group=0) -> bytes:
+    mask = sum(1 << c for c in cpus)
+    return struct.pack("<QH6x", mask, group)
+
+def processor(rel: int, cpus, eff: int = 0) -> bytes:
+    body = bytes([1 if len(cpus) > 1 else 0, eff]) + bytes(20) + struct.pack("<H", 1) + masks(cpus)
+    return struct.pack("<II", rel, 8 + len(body)) + body
+
+def cache(level: int, cpus, group_count: int = 1) -> bytes:
+    body = struct.pack("<BBHII", level, 8, 64, 1 << 20, 0) + bytes(18) + struct.pack("<H", group_count) + masks(cpus)
+    return struct.pack("<II", RELATION_CACHE, 8 + len(body)) + body
+
+def hybrid_buffer(group_count: int = 1) -> bytes:
+    """2 P çekirdeği (SMT: 0-1, 2-3, EfficiencyClass 1) + 4 E çekirdeği (4..7), ortak L3."""
+    buf = processor(RELATION_PROCESSOR_CORE, (0, 1), eff=1) + processor(RELATION_PROCESSOR_CORE, (2, 3), eff=1)
+    for c in range(4, 8):
+        buf += processor(RELATION_PROCESSOR_CORE, (c,), eff=0)
+    buf += cache(2, (0, 1), group_count) + cache(2, (2, 3), group_count) + cache(2, range(4, 8), group_count)
+    buf += cache(3, range(8), group_count)
+    return buf + processor(RELATION_PROCESSOR_PACKAGE, range(8))
+
+def test_windows_buffer_hybrid_plan():
+    topo = CpuTopology(parse_processor_info(hybrid_buffer()), "windows")
+    assert topo.known
+    assert len(topo.physical_cores()) == 6
+    assert [c.siblings for c in topo.cpus[:4]] == [(0, 1), (0, 1), (2, 3), (2, 3)]
+    assert {c.llc for c in topo.cpus} == {0}
+    assert [c.fast for c in topo.cpus] == [True] * 4 + [False] * 4
+    plan = plan_affinity(topo)
+    assert (plan.game, plan.background) == ([0, 1, 2, 3], [4, 5, 6, 7])
+
+def test_windows_buffer_old_cache_records():
+    # Windows 11 öncesi CACHE_RELATIONSHIP'te GroupCount yok (0): tek GroupMask okunur
+    topo = CpuTopology(parse_processor_info(hybrid_buffer(group_count=0)), "windows")
+    assert plan_affinity(topo).game == [0, 1, 2, 3]
+
+def test_truncated_buffer_is_ignored():
+    buf = hybrid_buffer()
+    # iki tam çekirdek kaydı (SMT: 4 mantıksal işlemci), üçüncüsü yarım
+    assert [c.cpu for c in parse_processor_info(buf[:120])] == [0, 1, 2, 3]
+    # GroupCount kaydın boyutunu aşıyorsa sonraki kayıt maske diye okunmaz
+    bad = bytearray(buf)
+    bad[30:32] = struct.pack("<H", 5)
+    assert [c.cpu for c in parse_processor_info(bytes(bad))[:2]] == [0, 1]
+    assert parse_processor_info(b"") == []
+
+def test_unknown_topology_has_no_plan(tmp_path, monkeypatch):
+    monkeypatch.setattr(cpu_topology, "_query_processor_info", lambda: b"")
+    topo = CpuTopology.read(root=str(tmp_path / "yok"))
+    assert topo.source == "unknown" and not topo.known
+    plan = plan_affinity(topo)
+    assert not plan and plan.game == [] and plan.background == []
+
+def run_session(topology: CpuTopology) -> tuple[SimProcessProvider, int, PerformanceMode]:
+    sim = SimProcessProvider(cpu_count=8)
+    target = sim.add("game.exe", load=95.0).pid
+    for i in range(6):
+        sim.add(f"svc{i}.exe", load=2.0)
+    table = ProcessTable(provider=sim, clock=sim.clock)
+    pm = PerformanceMode([], 1.0, process_table=table, affinity_planner=True, topology=topology)
+    pm.start_for_process(target)
+    for _ in range(3):
+        sim.clock.advance(2.0)
+        pm.maintain()
+    return sim, target, pm
+
+def test_unknown_topology_pins_nothing():
+    sim, target, pm = run_session(CpuTopology.fallback())
+    assert pm.plan is None
+    assert all(p.affinity == list(range(8)) for p in sim.procs.values())
+    pm.stop()
+
+def test_known_topology_pins_target():
+    sim, target, pm = run_session(CpuTopology(parse_processor_info(hybrid_buffer()), "windows"))
+    assert sim.procs[target].affinity == [0, 1, 2, 3]
+    pm.stop()
+    assert sim.procs[target].affinity == list(range(8))
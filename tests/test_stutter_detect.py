@@ -0,0 +1,60 @@
+"""
+Canlı StutterDetector ile çevrimdışı detect_array aynı takılma/ritim tanımını kullanmalı:
+aynı kare dizisinde aynı takılma indisleri, sayıları ve ritim olayı başlangıçları.
+
+    python -m pytest tests
+"""
+import numpy as np
+import pytest
+
+from core.stutter_detect import MEDIAN_BLOCK, MEDIAN_MAX_MS, StutterDetector, detect_array
+
+def synthetic(n: int, seed: int) -> np.ndarray:
+    """~120 FPS gürültülü kareler, seyrek takılmalar, 8/25 ms ritim salınımları ve MEDIAN_MAX_MS üstü kareler."""
+    rng = np.random.default_rng(seed)
+    ms = rng.normal(8.3, 0.6, n).clip(1.0, None)
+    hits = rng.integers(0, n, n // 300)
+    ms[hits] *= rng.uniform(2.0, 8.0, len(hits))
+    ms[rng.integers(0, n, 3)] = MEDIAN_MAX_MS * 1.5
+    for start in rng.integers(0, n - 200, max(2, n // 4000)):
+        length = int(rng.integers(20, 160))
+        ms[start:start + length] = np.where(np.arange(length) % 2 == 0, 8.0, 25.0) + rng.normal(0, 0.3, length)
+    # medyanın blok aralığı dışına düştüğü (tam sıralamaya dönülen) bölge: kare süresi sıçrar
+    ms[n // 2:n // 2 + 3 * MEDIAN_BLOCK] += 12.0
+    return ms
+
+def live(ms: np.ndarray, **kw) -> tuple[list[int], list[int], StutterDetector]:
+    det = StutterDetector(**kw)
+    events = {"stutter": [], "pacing": []}
+    # t olarak kare indisi verilir; olay hangi karede yayınlandıysa onu taşır
+    det.subscribe(lambda ev: events[ev.kind].append(int(ev.t)))
+    det.extend(zip(ms.tolist(), range(len(ms))))
+    return events["stutter"], events["pacing"], det
+
+@pytest.mark.parametrize("seed", [1, 2, 3])
+def test_live_and_array_agree(seed):
+    ms = synthetic(30_000, seed)
+    stutters, pacing, det = live(ms)
+    st, onsets = detect_array(ms)
+    assert len(pacing) > 0 and len(stutters) > 0
+    assert st.tolist() == stutters
+    assert onsets.tolist() == pacing
+    assert det.stutters == len(st)
+    assert det.pacing_events == len(onsets)
+
+def test_custom_thresholds_agree():
+    ms = synthetic(12_000, 7)
+    kw = {"factor": 1.8, "min_ms": 2.0, "window": 32}
+    stutters, pacing, det = live(ms, **kw)
+    st, onsets = detect_array(ms, **kw)
+    assert st.tolist() == stutters
+    assert onsets.tolist() == pacing
+    assert (det.stutters, det.pacing_events) == (len(st), len(onsets))
+
+@pytest.mark.parametrize("n", [0, 1, 2, 31, 64, 65, MEDIAN_BLOCK + 64, MEDIAN_BLOCK + 65])
+def test_short_series_agree(n):
+    ms = synthetic(4_000, n)[:n]
+    stutters, pacing, _ = live(ms)
+    st, onsets = detect_array(ms)
+    assert st.tolist() == stutters
+    assert onsets.tolist() == pacing
@@ -7,7 +7,6 @@ import json
 import time
 from typing import Optional, Callable
 
-import psutil
 from PySide6.QtCore import Qt, QTimer, Signal
 from PySide6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QLabel, QPushButton, QHBoxLayout, QTabWidget,
@@ -26,6 +25,10 @@ from recording.screenshot import take_screenshot
 from core.benchmark import cpu_stress, gpu_nvenc_stress
 from core.fps_presentmon import PresentMonMonitor
 from core.process_manager import PerformanceMode
+from core.perf_journal import PerfJournal
+from core.cgroup_throttle import CgroupThrottler
+from core.game_detect import GameWatcher, GameSignatures
+from core.process_table import ProcessTable, process_choices
 from core.services import list_services, stop_service, get_service_description
 from overlay.transparent_overlay import SimpleOverlay
 from overlay.rtss_osd import RTSSOSDClient
@@ -33,6 +36,10 @@ from ui.widgets import DashboardWidget, icon
 from ui.settings_dialog import SettingsDialog
 from core.hotkeys import HotkeyManager
 from ui.speedtest_widget import SpeedtestWidget
+from core.profiler import PROFILER
+
+# oyun başlayınca ilk maintain() turu (ms): günlüğe yazılan hedef önceliği bu turda uygulanır
+PERF_FIRST_PASS_MS = 300
 
 
 class MainWindow(QMainWindow):
@@ -66,11 +73,29 @@ class MainWindow(QMainWindow):
         self.setCentralWidget(self.tabs)
 
         # FPS için PresentMon ve Performans modu kontrolcüsü
-        self._pm = PresentMonMonitor(self.settings.tools.presentmon_path or "")
+        tools = self.settings.tools
+        self._pm = PresentMonMonitor(tools.presentmon_path or "", self.system_monitor,
+                                     mode=tools.presentmon_mode, max_file_mb=tools.presentmon_max_mb,
+                                     capture_dir=tools.frame_capture_dir if tools.frame_capture else None,
+                                     capture_keep=tools.frame_capture_keep,
+                                     stutter_factor=tools.stutter_factor, stutter_min_ms=tools.stutter_min_ms)
+        # Paylaşılan süreç tablosu: süreç listesi ve performans modu aynı önbelleği kullanır
+        self._proc_table = ProcessTable()
         self._perf_mode = PerformanceMode(
             self.settings.performance.whitelist_processes,
-            self.settings.performance.suspend_cpu_threshold
+            self.settings.performance.suspend_cpu_threshold,
+            system_monitor=self.system_monitor,
+            process_table=self._proc_table,
+            idle_window=self.settings.performance.suspend_idle_seconds,
+            rules=self.settings.performance.rules,
+            affinity_planner=self.settings.performance.affinity_planner,
+            journal=PerfJournal(),
+            throttler=self._make_throttler(),
+            throttle_percent=(self.settings.performance.throttle_percent
+                              if self.settings.performance.idle_action == "cgroup" else None),
         )
+        # önceki oturum çöktüyse askıda/önceliği değişmiş kalan süreçleri geri yükle
+        self._perf_mode.recover()
 
         # Leaderboard dosyası (her zaman geçerli bir yol)
         self.leaderboard_file = self.settings.benchmark.leaderboard_path or os.path.join(
@@ -86,6 +111,7 @@ class MainWindow(QMainWindow):
         self._build_speedtest_tab()
         self._build_game_mode_tab()
         self._build_services_tab()
+        self._build_diagnostics_tab()
 
         # Kayıt ve Anında Tekrar
         self._recorder = ScreenRecorder(self.settings)
@@ -99,14 +125,22 @@ class MainWindow(QMainWindow):
         if self.settings.ui.show_overlay:
             self._init_overlay()
 
-        # Zamanlayıcılar
-        self._metrics_timer = QTimer(self)
-        self._metrics_timer.timeout.connect(self._update_metrics)
-        self._metrics_timer.start(1000)
-
+        # Zamanlayıcılar (metrikler SystemMonitor aboneliğiyle gelir; performans zamanlayıcısı yalnızca oturumda)
         self._perf_timer = QTimer(self)
         self._perf_timer.timeout.connect(self._maintain_perf_mode)
-        self._perf_timer.start(2000)
+
+        # Otomatik oyun algılama: paylaşılan süreç tablosunun pid farkları imzalarla eşleştirilir
+        self._auto_game = None
+        self._game_watcher = GameWatcher(
+            self._proc_table, self._game_signatures(),
+            on_start=self._on_game_started, on_stop=self._on_game_exited,
+            system_monitor=self.system_monitor, heuristic=self.settings.performance.auto_detect_heuristic,
+        )
+        self._game_timer = QTimer(self)
+        self._game_timer.timeout.connect(self._poll_game_watcher)
+        if self.settings.performance.auto_detect_games:
+            self._game_timer.start(int(self._game_watcher.interval * 1000))
+            QTimer.singleShot(0, self._game_watcher.scan_running)
 
         # Global Hotkeys
         self._hk = HotkeyManager()
@@ -122,11 +156,32 @@ class MainWindow(QMainWindow):
         self.sig_call.emit(fn)
 
     # =================== Ayarlar (Modal) ===================
+    def _make_throttler(self):
+        """Linux'ta cgroup v2 yazılabiliyorsa kural/boşta kısma için CgroupThrottler, yoksa None."""
+        perf = self.settings.performance
+        t = CgroupThrottler(perf.cgroup_root, io_weight=perf.cgroup_io_weight or None)
+        if t.available():
+            return t
+        if perf.idle_action == "cgroup":
+            print(f"cgroup v2 kullanılamıyor ({perf.cgroup_root}); boşta süreçler askıya alınacak")
+        return None
+
     def _open_settings(self):
         dlg = SettingsDialog(self.settings, self)
         if dlg.exec():
             dlg.apply_to_settings()
             self.settings.save()
+            self.system_monitor.set_net_interfaces(self.settings.monitor.net_interfaces)
+            self._perf_mode.set_rules(self.settings.performance.rules, self.settings.performance.whitelist_processes)
+            # bir sonraki oturumda geçerli olur
+            self._perf_mode.affinity_planner = self.settings.performance.affinity_planner
+            self._game_watcher.signatures = self._game_signatures()
+            self._game_watcher.heuristic = self.settings.performance.auto_detect_heuristic
+            if self.settings.performance.auto_detect_games:
+                if not self._game_timer.isActive():
+                    self._game_timer.start(int(self._game_watcher.interval * 1000))
+            else:
+                self._game_timer.stop()
             # Tepsi ikonu canlı yenile (app.py MainWindow._tray atıyor)
             if hasattr(self, "_tray") and self._tray:
                 try:
@@ -210,7 +265,7 @@ class MainWindow(QMainWindow):
         w = QWidget()
         v = QVBoxLayout(w)
 
-        self.dashboard = DashboardWidget(self.system_monitor)
+        self.dashboard = DashboardWidget(self.system_monitor, self._pm)
         v.addWidget(self.dashboard)
 
         row = QHBoxLayout()
@@ -630,7 +685,8 @@ class MainWindow(QMainWindow):
             self.edit_pm_path.setText(p)
             self.settings.tools.presentmon_path = p
             self.settings.save()
-            self._pm = PresentMonMonitor(p)
+            # overlay ve gösterge paneli aynı izleyiciyi tuttuğu için nesne değiştirilmez
+            self._pm.presentmon_path = p
             self._status("PresentMon yolu güncellendi", 3000)
 
     def _browse_game_exe(self):
@@ -659,21 +715,18 @@ class MainWindow(QMainWindow):
                 print("PresentMon başlatılamadı:", e)
             # Performans modu
             self._perf_mode.start_for_process(pid)
+            self._perf_timer.start(2000)
+            # hedefin önceliği günlük fsync'inden sonra uygulanır; 2 sn'lik ilk turu beklemeden
+            QTimer.singleShot(PERF_FIRST_PASS_MS, self._maintain_perf_mode)
             self._status(f"Oyun başlatıldı (PID {pid}) ve performans modu etkin", 5000)
         except Exception as e:
             QMessageBox.critical(self, "Oyun", f"Başlatılamadı:\n{e}")
 
     def _refresh_proc_list(self):
         self.combo_procs.clear()
-        data = []
-        for p in psutil.process_iter(["pid", "name"]):
-            try:
-                name = p.info.get("name") or ""
-                if name:
-                    data.append((f"{name} (PID {p.info['pid']})", p.info["pid"]))
-            except Exception:
-                continue
-        for label, pid in sorted(data, key=lambda x: x[0].lower()):
+        # yalnızca pid farkları işlenir; ad/Process nesneleri önbellekten gelir
+        self._proc_table.refresh(detail=False)
+        for label, pid in process_choices(self._proc_table):
             self.combo_procs.addItem(label, pid)
 
     def _attach_presentmon_to_selected(self):
@@ -692,9 +745,53 @@ class MainWindow(QMainWindow):
         except Exception as e:
             QMessageBox.warning(self, "PresentMon", f"Başlatılamadı:\n{e}")
 
+    # =================== Otomatik oyun oturumu ===================
+    def _game_signatures(self) -> GameSignatures:
+        perf = self.settings.performance
+        return GameSignatures(perf.game_exes, perf.game_dirs, perf.non_game_exes)
+
+    def _poll_game_watcher(self):
+        try:
+            self._game_watcher.poll()
+        except Exception as e:
+            print("Oyun algılama hatası:", e)
+
+    def _on_game_started(self, entry, source: str):
+        # elle başlatılmış bir oturum varsa ona dokunma
+        if self._perf_mode.session.target_pid:
+            return
+        self._auto_game = entry
+        try:
+            if self._pm and self._pm.available():
+                self._pm.stop()
+                self._pm.start(pid=entry.pid)
+        except Exception as e:
+            print("PresentMon başlatılamadı:", e)
+        # telemetri oturumu: oyun süresince yüksek çözünürlüklü örnekleme
+        self.system_monitor.request_high_resolution("game-session")
+        self._perf_mode.start_for_process(entry.pid)
+        self._perf_timer.start(2000)
+        # hedefin önceliği günlük fsync'inden sonra uygulanır; 2 sn'lik ilk turu beklemeden
+        QTimer.singleShot(PERF_FIRST_PASS_MS, self._maintain_perf_mode)
+        self._status(f"Oyun algılandı: {entry.name} (PID {entry.pid}, {source}); performans modu etkin", 5000)
+
+    def _on_game_exited(self, entry):
+        if self._auto_game is None or self._auto_game.key != entry.key:
+            return
+        self._auto_game = None
+        try:
+            if self._pm:
+                self._pm.stop()
+        except Exception:
+            pass
+        self._perf_mode.stop()
+        self._perf_timer.stop()
+        self.system_monitor.release_high_resolution("game-session")
+        self._status(f"Oyun kapandı: {entry.name}; performans modu kapatıldı", 4000)
+
     def _maintain_perf_mode(self):
         try:
-            if self.settings.performance.enable_performance_mode:
+            if self.settings.performance.enable_performance_mode or self._auto_game is not None:
                 self._perf_mode.maintain()
         except Exception as e:
             print("Perf mode maintain hatası:", e)
@@ -709,6 +806,10 @@ class MainWindow(QMainWindow):
             except Exception:
                 pass
             self._perf_mode.stop()
+            self._perf_timer.stop()
+            if self._auto_game is not None:
+                self._auto_game = None
+                self.system_monitor.release_high_resolution("game-session")
             self._status("Performans modu kapatıldı", 4000)
         except Exception as e:
             QMessageBox.warning(self, "Performans Modu", f"Kapatılamadı:\n{e}")
@@ -764,6 +865,120 @@ class MainWindow(QMainWindow):
         self._status(("Durduruldu" if ok else "Durdurulamadı") + f": {svc.name}", 5000)
         self._refresh_services()
 
+    # =================== Tanılama ===================
+    def _build_diagnostics_tab(self):
+        w = QWidget()
+        v = QVBoxLayout(w)
+
+        v.addWidget(QLabel("Tanılama — PulseBoost'un kendi sıcak yollarının maliyeti (duvar saati ve CPU süresi)."))
+
+        self.tbl_diag = QTableWidget(0, 8)
+        self.tbl_diag.setHorizontalHeaderLabels([
+            "Bileşen", "Çağrı", "Duvar p50 (ms)", "Duvar p99 (ms)", "Duvar maks (ms)",
+            "CPU ort. (ms)", "CPU payı (%)", "Bütçe (%)"
+        ])
+        self.tbl_diag.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.tbl_diag.horizontalHeader().setStretchLastSection(True)
+        v.addWidget(self.tbl_diag)
+
+        v.addWidget(QLabel("PresentMon akışları — (süreç, takas zinciri) başına sunum hızı; FPS baskın akıştan hesaplanır."))
+        self.tbl_streams = QTableWidget(0, 7)
+        self.tbl_streams.setHorizontalHeaderLabels([
+            "PID", "Süreç", "SwapChain", "FPS", "Kare", "Boşta (sn)", "Baskın"
+        ])
+        self.tbl_streams.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.tbl_streams.horizontalHeader().setStretchLastSection(True)
+        v.addWidget(self.tbl_streams)
+
+        v.addWidget(QLabel("Takılma olayları — takılma anındaki sistem durumuyla (neden: io / cpu / gpu ipucu)."))
+        self.tbl_stutter = QTableWidget(0, 8)
+        self.tbl_stutter.setHorizontalHeaderLabels([
+            "Saat", "Tür", "Kare (ms)", "Medyan (ms)", "Neden", "CPU sıcak çekirdek (%)", "Disk (%) / okuma MB/s", "GPU (%)"
+        ])
+        self.tbl_stutter.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.tbl_stutter.horizontalHeader().setStretchLastSection(True)
+        v.addWidget(self.tbl_stutter)
+
+        row = QHBoxLayout()
+        btn_refresh = QPushButton("Yenile")
+        btn_refresh.clicked.connect(self._refresh_diagnostics)
+        btn_export = QPushButton("JSON'a Aktar")
+        btn_export.clicked.connect(self._export_diagnostics)
+        btn_reset = QPushButton("Sıfırla")
+        btn_reset.clicked.connect(lambda: (PROFILER.reset(), self._refresh_diagnostics()))
+        row.addStretch(1)
+        row.addWidget(btn_refresh)
+        row.addWidget(btn_reset)
+        row.addWidget(btn_export)
+        v.addLayout(row)
+
+        self._diag_index = self.tabs.addTab(w, "Tanılama")
+        # Yalnızca sekme açıkken periyodik yenile
+        self._diag_timer = QTimer(self)
+        self._diag_timer.timeout.connect(self._refresh_diagnostics)
+        self.tabs.currentChanged.connect(self._on_tab_changed)
+
+    def _on_tab_changed(self, idx: int):
+        if idx == self._diag_index:
+            self._refresh_diagnostics()
+            self._diag_timer.start(2000)
+        else:
+            self._diag_timer.stop()
+
+    def _refresh_diagnostics(self):
+        data = PROFILER.snapshot()
+        self.tbl_diag.setRowCount(0)
+        for name in sorted(data):
+            d = data[name]
+            budget = d["budget_percent"]
+            cells = [
+                name, str(d["wall"]["count"]),
+                f"{d['wall']['p50_ms']:.3f}", f"{d['wall']['p99_ms']:.3f}", f"{d['wall']['max_ms']:.3f}",
+                f"{d['cpu']['avg_ms']:.3f}", f"{d['cpu_share_percent']:.2f}",
+                "-" if budget is None else f"{budget:.2f}",
+            ]
+            r = self.tbl_diag.rowCount()
+            self.tbl_diag.insertRow(r)
+            for c, text in enumerate(cells):
+                self.tbl_diag.setItem(r, c, QTableWidgetItem(text))
+
+        self.tbl_streams.setRowCount(0)
+        for st in self._pm.streams.snapshot():
+            entry = self._proc_table.get(st["pid"])
+            cells = [
+                str(st["pid"]), entry.name if entry else "?", st["swapchain"], f"{st['fps']:.1f}",
+                str(st["frames"]), f"{st['idle_s']:.1f}", "✓" if st["dominant"] else "",
+            ]
+            r = self.tbl_streams.rowCount()
+            self.tbl_streams.insertRow(r)
+            for c, text in enumerate(cells):
+                self.tbl_streams.setItem(r, c, QTableWidgetItem(text))
+
+        self.tbl_stutter.setRowCount(0)
+        for ev in reversed(list(self._pm.stutter.events)[-50:]):
+            sysd = ev.system
+            gpu = sysd.get("gpu_util")
+            cells = [
+                time.strftime("%H:%M:%S", time.localtime(ev.wall)), ev.kind, f"{ev.ms:.1f}", f"{ev.median_ms:.1f}",
+                ev.cause or "-", f"{sysd.get('cpu_hot_core_percent') or 0:.0f}",
+                f"{sysd.get('disk_busy_percent') or 0:.0f} / {(sysd.get('disk_read_bps') or 0) / 1e6:.1f}",
+                "-" if gpu is None else f"{gpu:.0f}",
+            ]
+            r = self.tbl_stutter.rowCount()
+            self.tbl_stutter.insertRow(r)
+            for c, text in enumerate(cells):
+                self.tbl_stutter.setItem(r, c, QTableWidgetItem(text))
+
+    def _export_diagnostics(self):
+        p = QFileDialog.getSaveFileName(self, "Tanılama verisini kaydet", "pulseboost_profile.json", "JSON (*.json)")[0]
+        if not p:
+            return
+        try:
+            PROFILER.dump_json(p)
+            self._status(f"Tanılama kaydedildi: {p}", 4000)
+        except Exception as e:
+            QMessageBox.warning(self, "Tanılama", f"Kaydedilemedi:\n{e}")
+
     # =================== Döngüler / Kapanış ===================
     def _safe_start_replay(self):
         try:
@@ -771,13 +986,6 @@ class MainWindow(QMainWindow):
         except Exception as e:
             print("Instant Replay başlatılamadı:", e)
 
-    def _update_metrics(self):
-        try:
-            # Dashboard kendi timer'ı ile yenileniyor; tetikleyici fonksiyon kalabilir
-            self.dashboard.update_from_snapshot(self.system_monitor.get())
-        except Exception as e:
-            print("Metrik güncelleme hatası:", e)
-
     def closeEvent(self, event):
         # Kaynakları güvenle kapat
         try:
@@ -801,6 +1009,8 @@ class MainWindow(QMainWindow):
         except Exception:
             pass
         try:
+            self._game_timer.stop()
+            self._game_watcher.close()
             self._perf_mode.stop()
         except Exception:
             pass
@@ -1,7 +1,11 @@
+import json
 import os
-from PySide6.QtWidgets import QDialog, QVBoxLayout, QLabel, QHBoxLayout, QPushButton, QFileDialog, QComboBox, QSpinBox, QLineEdit
+import psutil
+from PySide6.QtWidgets import QDialog, QVBoxLayout, QLabel, QHBoxLayout, QPushButton, QFileDialog, QComboBox, QSpinBox, QLineEdit, QPlainTextEdit, QMessageBox, QCheckBox
 from PySide6.QtCore import Qt
 from core.settings import Settings
+from core.cpu_topology import CpuTopology
+from core.process_rules import validate_rules
 from ui.controls import ToggleSwitch
 
 QUALITY_TO_BITRATE = {
@@ -140,6 +144,42 @@ class SettingsDialog(QDialog):
         rowhk4.addWidget(self.sw_global)
         root.addLayout(rowhk4)
 
+        # İzleme
+        root.addWidget(QLabel("İzleme"))
+        rownet = QHBoxLayout()
+        rownet.addWidget(QLabel("Ağ arayüzleri (virgülle, boş = tümü):"))
+        self.edit_net_ifaces = QLineEdit(", ".join(settings.monitor.net_interfaces))
+        try:
+            self.edit_net_ifaces.setPlaceholderText(", ".join(sorted(psutil.net_if_stats())))
+        except Exception:
+            pass
+        rownet.addWidget(self.edit_net_ifaces)
+        root.addLayout(rownet)
+
+        # Çekirdek planı yalnızca topoloji okunabildiğinde (sysfs / Windows) uygulanır; okunamıyorsa
+        # seçenek kapalı görünür ve değiştirilemez (kayıtlı ayar korunur)
+        self._topology_known = CpuTopology.read().known
+        self.chk_affinity = QCheckBox("Oyunu en iyi çekirdek grubuna sabitle, arka planı kalanlara taşı")
+        self.chk_affinity.setChecked(settings.performance.affinity_planner and self._topology_known)
+        if not self._topology_known:
+            self.chk_affinity.setEnabled(False)
+            self.chk_affinity.setToolTip("İşlemci topolojisi okunamadı; bu sistemde çekirdek planı uygulanmaz.")
+        root.addWidget(self.chk_affinity)
+
+        # Performans modu süreç kuralları (core.process_rules): JSON listesi, ilk eşleşen kazanır;
+        # beyaz listedeki süreçler kurallardan önce korunur
+        root.addWidget(QLabel("Süreç Kuralları (JSON, sırayla; ilk eşleşen kazanır)"))
+        rowwl = QHBoxLayout()
+        rowwl.addWidget(QLabel("Beyaz liste (virgülle):"))
+        self.edit_whitelist = QLineEdit(", ".join(settings.performance.whitelist_processes))
+        rowwl.addWidget(self.edit_whitelist)
+        root.addLayout(rowwl)
+        self.edit_rules = QPlainTextEdit(json.dumps(settings.performance.rules, ensure_ascii=False, indent=2))
+        self.edit_rules.setPlaceholderText('[{"name": "tarayıcı", "when": {"name": "chrome*.exe"}, '
+                                           '"priority": "below_normal", "suspend": "never"}]')
+        self.edit_rules.setMinimumHeight(140)
+        root.addWidget(self.edit_rules)
+
         # Kaydet & Kapat
         rowb = QHBoxLayout()
         rowb.addStretch(1)
@@ -151,6 +191,23 @@ class SettingsDialog(QDialog):
         rowb.addWidget(btn_ok)
         root.addLayout(rowb)
 
+    def _parse_rules(self):
+        """(kurallar, hatalar); metin geçersiz JSON ise kurallar None."""
+        text = self.edit_rules.toPlainText().strip()
+        try:
+            rules = json.loads(text) if text else []
+        except ValueError as e:
+            return None, [f"JSON okunamadı: {e}"]
+        return rules, validate_rules(rules)
+
+    def accept(self):
+        # hatalı kural sessizce yok sayılmasın: düzeltilene kadar pencere kapanmaz
+        _, errors = self._parse_rules()
+        if errors:
+            QMessageBox.warning(self, "Süreç Kuralları", "Kurallar kaydedilemedi:\n" + "\n".join(errors))
+            return
+        super().accept()
+
     def apply_to_settings(self):
         s = self.settings
         # tray icon
@@ -164,4 +221,13 @@ class SettingsDialog(QDialog):
         s.hotkeys.start_stop_record = self.edit_hk_rec.text().strip()
         s.hotkeys.screenshot = self.edit_hk_ss.text().strip()
         s.hotkeys.save_replay = self.edit_hk_rep.text().strip()
-        s.hotkeys.enable_global = self.sw_global.isChecked()
\ No newline at end of file
+        s.hotkeys.enable_global = self.sw_global.isChecked()
+        # monitor
+        s.monitor.net_interfaces = [x.strip() for x in self.edit_net_ifaces.text().split(",") if x.strip()]
+        # performance
+        if self._topology_known:
+            s.performance.affinity_planner = self.chk_affinity.isChecked()
+        s.performance.whitelist_processes = [x.strip() for x in self.edit_whitelist.text().split(",") if x.strip()]
+        rules, errors = self._parse_rules()
+        if rules is not None and not errors:
+            s.performance.rules = rules
@@ -0,0 +1,29 @@
+from PySide6.QtCore import QObject, Signal
+
+class SnapshotRelay(QObject):
+    """
+    SystemMonitor yayınlarını Qt sinyaline çevirir. Sinyal sensör iş parçacığından yayıldığı için
+    GUI tarafındaki bağlantılar kuyruklu (queued) çalışır ve slotlar ana thread'de çağrılır.
+    """
+    snapshot = Signal(object)
+
+    def __init__(self, system_monitor, min_interval: float = 0.0, parent=None, active: bool = True):
+        super().__init__(parent)
+        self._mon = system_monitor
+        self._min_interval = min_interval
+        self._state = {"token": None}
+        # C++ nesnesi silinirse aboneliği de bırak
+        mon, state = system_monitor, self._state
+        self.destroyed.connect(lambda *_: state["token"] is not None and mon.unsubscribe(state["token"]))
+        if active:
+            self.open()
+
+    def open(self):
+        """Aboneliği (yeniden) başlatır; görünür olan tüketiciler için."""
+        if self._state["token"] is None:
+            self._state["token"] = self._mon.subscribe(self.snapshot.emit, self._min_interval)
+
+    def close(self):
+        token, self._state["token"] = self._state["token"], None
+        if token is not None:
+            self._mon.unsubscribe(token)
@@ -1,8 +1,10 @@
 from PySide6.QtWidgets import QWidget, QHBoxLayout, QVBoxLayout, QLabel, QProgressBar, QPushButton, QListWidget, QListWidgetItem, QFrame
 from PySide6.QtGui import QIcon, QPainter, QColor, QBrush, QPen, QLinearGradient, QFont
-from PySide6.QtCore import Qt, QTimer, QRectF
+from PySide6.QtCore import Qt, QRectF
 import os
 
+from ui.snapshot_relay import SnapshotRelay
+
 ICON_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "assets", "icons")
 
 def icon(name: str) -> QIcon:
@@ -70,7 +72,7 @@ class MSIAfterburnerCard(QWidget):
         painter.drawRoundedRect(progress_rect, 4, 4)
         
         # Progress bar fill
-        if percent is not None:
+        if self.percent is not None:
             fill_width = (progress_rect.width() * self.percent) / 100.0
             fill_rect = QRectF(progress_rect.x(), progress_rect.y(), fill_width, progress_rect.height())
             
@@ -96,9 +98,11 @@ class MSIAfterburnerCard(QWidget):
         painter.drawEllipse(icon_rect)
 
 class DashboardWidget(QWidget):
-    def __init__(self, system_monitor):
+    def __init__(self, system_monitor, presentmon=None):
         super().__init__()
         self._mon = system_monitor
+        self._pm = presentmon
+        self._last_seq = -1
         
         # Main layout
         main_layout = QVBoxLayout(self)
@@ -147,24 +151,38 @@ class DashboardWidget(QWidget):
         self.card_disk = MSIAfterburnerCard("Disk", "disk", "#ff0080")
         self.card_net = MSIAfterburnerCard("Ağ", "net", "#8800ff")
         row2.addWidget(self.card_disk)
+        self.card_fps = MSIAfterburnerCard("FPS", "gauge", "#ffd400")
         row2.addWidget(self.card_net)
-        row2.addStretch(1)  # Add stretch to center the two cards
+        row2.addWidget(self.card_fps)
+        row2.addStretch(1)
         grid.addLayout(row2)
         
         main_layout.addWidget(cards_widget)
         main_layout.addStretch(1)
 
-        self._timer = QTimer(self)
-        self._timer.timeout.connect(self._tick)
-        self._timer.start(1000)
-
-    def update_from_snapshot(self, s):
-        # dış tetik gerekirse
-        pass
+        # Zamanlayıcı yerine SystemMonitor yayınlarına abone ol (en fazla 1 Hz); yalnızca görünürken
+        self._relay = SnapshotRelay(system_monitor, 1.0, self, active=False)
+        self._relay.snapshot.connect(self.update_from_snapshot, Qt.QueuedConnection)
 
-    def _tick(self):
+    def showEvent(self, event):
+        self._relay.open()
         s = self._mon.get()
+        if s.seq:
+            self.update_from_snapshot(s)
+        super().showEvent(event)
+
+    def hideEvent(self, event):
+        # Pencere tepsiye küçültüldüğünde veya sekme değiştiğinde tüketici sayılmasın
+        self._relay.close()
+        super().hideEvent(event)
+
+    def update_from_snapshot(self, s):
+        if s.seq <= self._last_seq:
+            return
+        self._last_seq = s.seq
         cpu_txt = f"{s.cpu_percent:.0f}% • {float(s.cpu_freq or 0):.0f} MHz"
+        if len(s.cpu_core_percent) > 1:
+            cpu_txt += f" • C{s.cpu_hot_core} {s.cpu_hot_core_percent:.0f}%"
         self.card_cpu.set_value(cpu_txt, s.cpu_percent or 0)
 
         if s.gpu_util is not None:
@@ -182,8 +200,21 @@ class DashboardWidget(QWidget):
         ram_txt = f"{(s.ram_used or 0)/1_073_741_824:.1f}GB • {ram_pc:.0f}%"
         self.card_ram.set_value(ram_txt, ram_pc or 0)
 
-        self.card_disk.set_value("—", 0)
+        if s.disk_names:
+            disk_txt = (f"R {s.disk_read_bps/1e6:.1f} • W {s.disk_write_bps/1e6:.1f} MB/s • "
+                        f"{s.disk_iops:.0f} IOPS • {s.disk_latency_ms:.1f} ms")
+            self.card_disk.set_value(disk_txt, s.disk_busy_percent)
+        else:
+            self.card_disk.set_value("—", 0)
         net_up = getattr(s, 'net_up', 0) / 1e6
         net_down = getattr(s, 'net_down', 0) / 1e6
         net_txt = f"↑ {net_up:.1f} • ↓ {net_down:.1f} MB/s"
-        self.card_net.set_value(net_txt)
\ No newline at end of file
+        self.card_net.set_value(net_txt)
+
+        # Çubuk: 1% low / ortalama oranı (kare tutarlılığı)
+        st = self._pm.stats.snapshot() if self._pm and getattr(self._pm, "_running", False) else None
+        if st is not None and st.avg_fps > 0:
+            fps_txt = f"{st.avg_fps:.0f} • 1% {st.low_1:.0f} • 0.1% {st.low_01:.0f}"
+            self.card_fps.set_value(fps_txt, st.low_1 / st.avg_fps * 100.0)
+        else:
+            self.card_fps.set_value("—", 0)
\ No newline at end of file